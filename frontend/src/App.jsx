@@ -32,7 +32,7 @@ function LoadingScreen() {
 export default function App() {
   const [currentPage, setCurrentPage] = useState("dashboard");
   const auth = useAuth();
-  const { uiData, loading: loadingData, error: dataError, reload } = useUiData(auth.token);
+  const { uiData, loading: loadingData, error: dataError, reload, openAnalysis } = useUiData(auth.token);
   const [uiSettings, setUiSettings] = useState({});
   const [reports, setReports] = useState([]);
   const [reportSchedules, setReportSchedules] = useState([]);
@@ -163,6 +163,7 @@ export default function App() {
         uiSettings={uiSettings}
         user={auth.user}
         onSyncBank={handleSyncBank}
+        onOpenAnalysis={openAnalysis}
         onExportCsv={handleExportCsv}
         onLoadFilteredTransactions={handleLoadFilteredTransactions}
         onSaveSettings={handleSaveSettings}
@@ -1,13 +1,27 @@
 import { useCallback, useEffect, useMemo, useState } from "react";
 
-import { getAnalysisHistory, getBankingAnalysisHistory } from "../services/api";
+import { getAnalysis, getAnalysisHistory, getBankingAnalysisHistory } from "../services/api";
 import { buildUiData } from "../utils/selectors";
 
 export function useUiData(token) {
   const [analyses, setAnalyses] = useState([]);
+  const [openedAnalysis, setOpenedAnalysis] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
 
+  // The history only carries summary columns; the full report is fetched for one analysis at a time.
+  const openAnalysis = useCallback(
+    async (analysisId) => {
+      if (!token || analysisId == null) return;
+      try {
+        setOpenedAnalysis(await getAnalysis(token, analysisId));
+      } catch (err) {
+        setError(err.message || "Erro ao carregar a analise.");
+      }
+    },
+    [token]
+  );
+
   const reload = useCallback(async () => {
     if (!token) return;
     setLoading(true);
@@ -24,6 +38,11 @@ export function useUiData(token) {
         (a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime()
       );
       setAnalyses(merged);
+      if (merged.length > 0) {
+        setOpenedAnalysis(await getAnalysis(token, merged[0].id));
+      } else {
+        setOpenedAnalysis(null);
+      }
     } catch (err) {
       setError(err.message || "Erro ao carregar dados da plataforma.");
     } finally {
@@ -35,12 +54,13 @@ export function useUiData(token) {
     reload();
   }, [reload]);
 
-  const uiData = useMemo(() => buildUiData(analyses), [analyses]);
+  const uiData = useMemo(() => buildUiData(analyses, openedAnalysis), [analyses, openedAnalysis]);
 
   return {
     uiData,
     loading,
     error,
-    reload
+    reload,
+    openAnalysis
   };
 }
@@ -42,6 +42,7 @@ export default function Layout({
   uiSettings,
   user,
   onSyncBank,
+  onOpenAnalysis,
   onExportCsv,
   onLoadFilteredTransactions,
   onSaveSettings,
@@ -216,7 +217,7 @@ export default function Layout({
             {currentPage === "twins" && <DigitalTwins uiData={uiData} />}
             {currentPage === "carbon" && <CarbonFootprint uiData={uiData} />}
             {currentPage === "blockchain" && <BlockchainAudit uiData={uiData} onVerifyAudit={onVerifyAudit} />}
-            {currentPage === "openbanking" && <OpenBanking uiData={uiData} onSyncBank={onSyncBank} />}
+            {currentPage === "openbanking" && <OpenBanking uiData={uiData} onSyncBank={onSyncBank} onOpenAnalysis={onOpenAnalysis} />}
             {currentPage === "performance" && <Performance uiData={uiData} />}
             {currentPage === "reports" && (
               <Reports
@@ -57,6 +57,10 @@ export function getBankingAnalysisHistory(token) {
   return request("/banking/analysis/history", { token });
 }
 
+export function getAnalysis(token, analysisId) {
+  return request(`/analysis/${analysisId}`, { token });
+}
+
 export function connectBankAccount(token, idBanco) {
   return request("/banking/account", {
     method: "POST",
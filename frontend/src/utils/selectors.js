@@ -3,27 +3,29 @@ function safeNumber(value) {
   return Number.isFinite(parsed) ? parsed : 0;
 }
 
-function deriveTransactions(analyses) {
+// History rows carry only the summary columns; the full report (riskiest transactions, carbon
+// breakdown) is only loaded for the analysis the user opened.
+function deriveTransactions(analyses, openedAnalysis) {
   const rows = [];
 
   analyses.forEach((analysis) => {
-    const results = analysis.analysis_results || {};
+    const results =
+      openedAnalysis && openedAnalysis.id === analysis.id ? openedAnalysis.analysis_results || {} : {};
     const riskiest = results.fraud_analysis?.riskiest_transactions || [];
     const carbonBreakdown = results.carbon_analysis?.breakdown_by_category || {};
-    const defaultCarbon = Object.values(carbonBreakdown).reduce((acc, val) => acc + safeNumber(val), 0);
 
     if (riskiest.length === 0) {
       rows.push({
         id: `ANL-${analysis.id}`,
-        amount: safeNumber(results.summary?.total_amount),
+        amount: safeNumber(analysis.total_amount),
         description: `Analise ${analysis.id}`,
         category: "analise",
         merchant: "motor-analitico",
-        riskScore: Math.round(safeNumber(results.fraud_analysis?.highest_risk_score) * 100),
-        carbonKg: defaultCarbon,
-        status: results.fraud_analysis?.fraud_detected ? "reviewing" : "approved",
+        riskScore: Math.round(safeNumber(analysis.highest_risk_score) * 100),
+        carbonKg: safeNumber(analysis.total_carbon_kg),
+        status: analysis.fraud_detected ? "reviewing" : "approved",
         timestamp: analysis.created_at,
-        fraudScore: safeNumber(results.fraud_analysis?.highest_risk_score),
+        fraudScore: safeNumber(analysis.highest_risk_score),
         auditHash: `analysis-${analysis.id}`,
         bank: analysis.sourceType || "N/A"
       });
@@ -57,25 +59,17 @@ function deriveVolumeChart(analyses) {
     const date = new Date(analysis.created_at);
     const key = `${date.getHours().toString().padStart(2, "0")}:00`;
     const entry = buckets.get(key) || { time: key, aprovadas: 0, sinalizadas: 0 };
-    entry.aprovadas += safeNumber(analysis.analysis_results?.summary?.total_transactions);
-    entry.sinalizadas += safeNumber(
-      analysis.analysis_results?.fraud_analysis?.transactions_above_threshold
-    );
+    entry.aprovadas += safeNumber(analysis.total_transactions);
+    entry.sinalizadas += safeNumber(analysis.transactions_above_threshold);
     buckets.set(key, entry);
   });
   return [...buckets.values()].sort((a, b) => a.time.localeCompare(b.time));
 }
 
-function derivePieCategory(analyses) {
-  const categoryTotals = new Map();
-  analyses.forEach((analysis) => {
-    const breakdown = analysis.analysis_results?.carbon_analysis?.breakdown_by_category || {};
-    Object.entries(breakdown).forEach(([category, value]) => {
-      categoryTotals.set(category, (categoryTotals.get(category) || 0) + safeNumber(value));
-    });
-  });
-  return [...categoryTotals.entries()]
-    .map(([name, value]) => ({ name, value }))
+function derivePieCategory(openedAnalysis) {
+  const breakdown = openedAnalysis?.analysis_results?.carbon_analysis?.breakdown_by_category || {};
+  return Object.entries(breakdown)
+    .map(([name, value]) => ({ name, value: safeNumber(value) }))
     .sort((a, b) => b.value - a.value)
     .slice(0, 5);
 }
@@ -126,7 +120,7 @@ function deriveProjection(analyses) {
   );
   let running = 0;
   return sorted.slice(0, 12).map((analysis, index) => {
-    running += safeNumber(analysis.analysis_results?.summary?.total_amount);
+    running += safeNumber(analysis.total_amount);
     const base = Math.round((running / 1000000) * 10) / 10;
     return {
       month: `M${index + 1}`,
@@ -139,8 +133,8 @@ function deriveProjection(analyses) {
 
 function deriveLogs(analyses) {
   return analyses.slice(0, 20).map((analysis) => {
-    const total = safeNumber(analysis.analysis_results?.summary?.total_transactions);
-    const highRisk = safeNumber(analysis.analysis_results?.fraud_analysis?.transactions_above_threshold);
+    const total = safeNumber(analysis.total_transactions);
+    const highRisk = safeNumber(analysis.transactions_above_threshold);
     const level = highRisk > 0 ? "WARN" : "INFO";
     return {
       time: new Date(analysis.created_at).toISOString().split("T")[1].split(".")[0],
@@ -150,30 +144,31 @@ function deriveLogs(analyses) {
   });
 }
 
-export function buildUiData(analyses) {
-  const transactions = deriveTransactions(analyses);
+export function buildUiData(analyses, openedAnalysis = null) {
+  const transactions = deriveTransactions(analyses, openedAnalysis);
   const totalTransactions = analyses.reduce(
-    (acc, item) => acc + safeNumber(item.analysis_results?.summary?.total_transactions),
+    (acc, item) => acc + safeNumber(item.total_transactions),
     0
   );
   const totalAmount = analyses.reduce(
-    (acc, item) => acc + safeNumber(item.analysis_results?.summary?.total_amount),
+    (acc, item) => acc + safeNumber(item.total_amount),
     0
   );
   const highestRisk = analyses.reduce(
-    (acc, item) => Math.max(acc, safeNumber(item.analysis_results?.fraud_analysis?.highest_risk_score)),
+    (acc, item) => Math.max(acc, safeNumber(item.highest_risk_score)),
     0
   );
   const totalCarbon = analyses.reduce(
-    (acc, item) => acc + safeNumber(item.analysis_results?.carbon_analysis?.total_carbon_kg),
+    (acc, item) => acc + safeNumber(item.total_carbon_kg),
     0
   );
 
   return {
     analyses,
+    openedAnalysis,
     transactions,
     chartVol: deriveVolumeChart(analyses),
-    pieCategory: derivePieCategory(analyses),
+    pieCategory: derivePieCategory(openedAnalysis),
     fraudAlerts: deriveFraudAlerts(transactions),
     scatterFraud: deriveScatter(transactions),
     radarFeatures: deriveRadar(transactions),
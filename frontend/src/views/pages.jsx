@@ -439,7 +439,7 @@ export function BlockchainAudit({ uiData, onVerifyAudit }) {
   );
 }
 
-export function OpenBanking({ uiData, onSyncBank }) {
+export function OpenBanking({ uiData, onSyncBank, onOpenAnalysis }) {
   const bankingRows = uiData.analyses.filter((item) => item.sourceType === "banking");
   return (
     <div className="space-y-6">
@@ -464,10 +464,14 @@ export function OpenBanking({ uiData, onSyncBank }) {
             </thead>
             <tbody className="divide-y divide-gray-100">
               {bankingRows.map((row) => (
-                <tr key={row.id} className="hover:bg-gray-50">
+                <tr
+                  key={row.id}
+                  onClick={() => onOpenAnalysis(row.id)}
+                  className={`cursor-pointer hover:bg-gray-50 ${uiData.openedAnalysis?.id === row.id ? "bg-gray-50" : ""}`}
+                >
                   <td className="py-2.5 px-4 font-medium text-gray-900">banking</td>
                   <td className="py-2.5 px-4 font-mono text-[10px] text-gray-500">#{row.id}</td>
-                  <td className="py-2.5 px-4 font-mono text-right">{formatBRL(row.analysis_results?.summary?.total_amount)}</td>
+                  <td className="py-2.5 px-4 font-mono text-right">{formatBRL(row.total_amount)}</td>
                   <td className="py-2.5 px-4 text-right text-[10px] text-gray-400">{formatShortDate(row.created_at)}</td>
                 </tr>
               ))}
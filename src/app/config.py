@@ -13,6 +13,15 @@ class Settings(BaseSettings):
     DATABASE_URL: Optional[str] = None
     DATABASE_SSL_MODE: str = "require"
 
+    # Connection pool (QueuePool) and statement instrumentation, shared by the sync and async engines.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_metrics_enabled: bool = True
+    db_slow_query_ms: float = 500.0
+
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     access_token_expire_minutes: int = 30
@@ -25,6 +34,8 @@ class Settings(BaseSettings):
 
     GATEWAY_API_URL: str = "http://localhost:8081"
     OPEN_BANKING_MOCK_URL: str = "http://open_banking_mock_server:8080"
+    RECONCILIATION_MIDDLEWARE_URL: str = "http://reconciliation_middleware:18080"
+    CRYPTO_MIDDLEWARE_URL: str = "http://crypto_middleware:18081"
     BLOCKCHAIN_NODE_URL: str = "http://blockchain_node:8545"
     AUDIT_CONTRACT_ADDRESS: str = "0x0000000000000000000000000000000000000000"
     GEMINI_API_KEY: str = ""
@@ -32,18 +43,70 @@ class Settings(BaseSettings):
     cpp_gateway_host: str = "localhost"
     cpp_gateway_port: int = 8081
     cpp_gateway_timeout: int = 30
+    reconciliation_middleware_timeout: float = 30.0
+    crypto_middleware_timeout: float = 10.0
+    open_banking_timeout: float = 10.0
+    open_banking_sync_concurrency: int = 4
+    open_banking_page_size: int = 500
+    open_banking_rate_limit_per_second: float = 0.0
+    sync_scheduler_concurrency: int = 8
+    open_banking_fetch_retries: int = 3
+    open_banking_retry_base_delay: float = 0.2
+    open_banking_retry_max_delay: float = 2.0
     pipe_communication_enabled: bool = True
     ml_model_path: str = "src/domains/risk/models"
+    ml_model_mmap_mode: str = "r"
+    fraud_model_version: str = "v1"
+    fraud_model_warmup_on_startup: bool = False
     fraud_detection_algorithm: str = "isolation_forest"
+    fraud_autoencoder_backend: str = "numpy"
     fraud_detection_threshold: float = 0.7
+    fraud_inference_executor: str = "thread"
+    fraud_inference_workers: int = 2
+    fraud_inference_max_pending: int = 32
+    fraud_inference_queue_timeout: float = 5.0
+    risk_microbatch_max_size: int = 256
+    risk_microbatch_max_wait_ms: float = 2.0
+    risk_baseline_cache_ttl_seconds: int = 60
+    risk_baseline_cache_entries: int = 10000
     carbon_calculation_enabled: bool = True
     audit_hash_algorithm: str = "sha256"
     audit_trail_enabled: bool = True
     blockchain_simulation_mode: bool = True
     monte_carlo_engine: str = "numpy"
     monte_carlo_simulations: int = 10000
+    monte_carlo_max_simulations: int = 1000000
+    monte_carlo_chunk_size: int = 100000
+    monte_carlo_max_workers: int = 4
+    monte_carlo_band_interval_months: int = 1
+    monte_carlo_cache_enabled: bool = True
+    monte_carlo_cache_ttl_seconds: int = 86400
+    monte_carlo_cache_memory_entries: int = 128
+    monte_carlo_cache_db_entries: int = 5000
+    twin_job_worker: str = "process"
+    twin_job_poll_interval_seconds: float = 1.0
     digital_twins_enabled: bool = True
 
+    # Shared outbound HTTP clients.
+    http_client_http2: bool = True
+    http_client_connect_timeout: float = 5.0
+    http_client_max_connections: int = 100
+    http_client_max_keepalive_connections: int = 20
+    http_client_keepalive_expiry: float = 30.0
+
+    # Streaming CSV ingestion.
+    csv_ingestion_chunk_size: int = 1024 * 1024
+    csv_ingestion_batch_size: int = 5000
+    analysis_riskiest_transactions_limit: int = 100
+
+    # Bulk writes to the transactions table.
+    transactions_bulk_batch_size: int = 5000
+    transactions_bulk_use_copy: bool = True
+
+    # Streaming transaction exports.
+    transactions_export_batch_size: int = 2000
+    transactions_export_gzip_level: int = 6
+
     POSTGRES_SERVER: str = "db"
     POSTGRES_USER: str = "begriff"
     POSTGRES_PASSWORD: str = "begriff_secret_password"
@@ -1,12 +1,10 @@
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status
-from sqlalchemy.orm import Session
-import csv
-import io
+from fastapi import APIRouter, Depends, File, Query, UploadFile, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from src.infra.persistence.database import apply_user_rls_context, get_db
-from src.domains.identity.dependencies import get_current_user
-from src.domains.transactions.services import analysis_service
+from src.infra.persistence.database import apply_user_rls_context_async, get_async_db
+from src.domains.identity.dependencies import get_current_user_async
+from src.domains.transactions.services import analysis_service, csv_ingestion
 from src.infra.persistence import models
 from src.infra.shared.schemas import analysis_schema
 from src.infra.persistence.repositories import analysis_repository
@@ -22,18 +20,15 @@ router = APIRouter()
 
 
 @router.post("/analysis/", response_model=analysis_schema.FinancialAnalysis)
-async def create_analysis(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    apply_user_rls_context(db, current_user.id)
+async def create_analysis(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db), current_user: models.User = Depends(get_current_user_async)):
+    await apply_user_rls_context_async(db, current_user.id)
     if file.content_type != 'text/csv':
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload a CSV file.")
 
-    contents = await file.read()
-    decoded_content = contents.decode('utf-8')
-    csv_reader = csv.DictReader(io.StringIO(decoded_content))
-    transactions_data = [dict(row) for row in csv_reader]
+    batches = csv_ingestion.iter_upload_batches(file)
 
     try:
-        return await analysis_service.run_comprehensive_analysis(db=db, transactions_data=transactions_data, user=current_user)
+        return await analysis_service.run_streaming_analysis(db=db, batches=batches, user=current_user)
     except ConnectionError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -41,7 +36,31 @@ async def create_analysis(file: UploadFile = File(...), db: Session = Depends(ge
         )
 
 
-@router.get("/analysis/", response_model=List[analysis_schema.FinancialAnalysis])
-async def get_analysis_history(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
-    apply_user_rls_context(db, current_user.id)
-    return analysis_service.get_user_analysis_history(db=db, user_id=current_user.id)
+@router.get("/analysis/", response_model=List[analysis_schema.FinancialAnalysisSummary])
+async def get_analysis_history(
+    include_results: bool = Query(default=False),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+):
+    """
+    The user's analyses, newest first, with their summary metrics. Set `include_results` to also
+    get each full analysis_results report; to show a single report, use GET /analysis/{id}.
+    """
+    await apply_user_rls_context_async(db, current_user.id)
+    return await analysis_service.get_user_analysis_history(
+        db=db, user_id=current_user.id, include_results=include_results
+    )
+
+
+@router.get("/analysis/{analysis_id}", response_model=analysis_schema.FinancialAnalysis)
+async def get_analysis(
+    analysis_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async),
+):
+    """One of the user's analyses, with its full analysis_results report."""
+    await apply_user_rls_context_async(db, current_user.id)
+    analysis = await analysis_service.get_user_analysis(db=db, user_id=current_user.id, analysis_id=analysis_id)
+    if analysis is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis not found")
+    return analysis
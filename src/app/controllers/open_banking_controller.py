@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from src.infra.persistence.database import apply_user_rls_context, get_db
-from src.domains.identity.dependencies import get_current_user
+from src.infra.persistence.database import apply_user_rls_context_async, get_async_db
+from src.domains.identity.dependencies import get_current_user_async
 from src.domains.open_banking.services import sync_service
 from src.infra.persistence.models import User
+from src.infra.persistence.repositories import sync_cursor_repository
 from src.infra.shared.schemas.open_banking_schema import ConnectAccountRequest
 from src.domains.transactions.services import analysis_service
 from src.infra.shared.schemas import analysis_schema
@@ -14,8 +15,8 @@ router = APIRouter(prefix="/banking")
 @router.post("/account", status_code=status.HTTP_200_OK)
 async def connect_account_and_sync(
     request_data: ConnectAccountRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     """
     Connects a bank account and immediately synchronizes the user's transactions.
@@ -33,7 +34,12 @@ async def connect_account_and_sync(
         bank_id=bank_id
     )
 
-    # Sincroniza as transações
+    # Committed on its own so the nightly sync picks the user up even if this first sync fails.
+    await db.run_sync(sync_cursor_repository.record_connection, current_user.id)
+    await db.commit()
+
+    # Sincroniza as transações; the commit above ended the transaction the RLS context lives in.
+    await apply_user_rls_context_async(db, current_user.id)
     sync_result = await sync_service.synchronize_transactions_for_user(
         db=db,
         user=current_user
@@ -45,12 +51,12 @@ async def connect_account_and_sync(
     }
 
 @router.post("/analysis", response_model=analysis_schema.FinancialAnalysis)
-async def analyze_banking_data(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def analyze_banking_data(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
     """
     Triggers a new financial analysis from the user's already synchronized banking data.
     """
     try:
-        apply_user_rls_context(db, current_user.id)
+        await apply_user_rls_context_async(db, current_user.id)
         return await analysis_service.run_banking_analysis(db=db, user=current_user)
     except ConnectionError as e:
         raise HTTPException(
@@ -58,10 +64,17 @@ async def analyze_banking_data(db: Session = Depends(get_db), current_user: User
             detail=f"Failed to connect to a required service: {e}"
         )
 
-@router.get("/analysis/history", response_model=List[analysis_schema.FinancialAnalysis])
-async def get_banking_analysis_history(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@router.get("/analysis/history", response_model=List[analysis_schema.FinancialAnalysisSummary])
+async def get_banking_analysis_history(
+    include_results: bool = Query(default=False),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
     """
-    Retrieves the history of banking-originated financial analyses for the user.
+    Retrieves the history of banking-originated financial analyses for the user, with their
+    summary metrics. Set `include_results` to also get each full analysis_results report.
     """
-    apply_user_rls_context(db, current_user.id)
-    return analysis_service.get_user_analysis_history_by_type(db=db, user_id=current_user.id, analysis_type='BANKING')
+    await apply_user_rls_context_async(db, current_user.id)
+    return await analysis_service.get_user_analysis_history_by_type(
+        db=db, user_id=current_user.id, analysis_type='BANKING', include_results=include_results
+    )
@@ -1,20 +1,29 @@
-import csv
-import io
 import random
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import PlainTextResponse, StreamingResponse
-from sqlalchemy import delete
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.domains.identity.dependencies import get_current_user
-from src.infra.persistence.database import apply_user_rls_context, get_db
+from src.domains.identity.dependencies import get_current_user, get_current_user_async
+from src.domains.transactions.services import transaction_export
+from src.infra.persistence.database import (
+    apply_user_rls_context,
+    apply_user_rls_context_async,
+    get_async_db,
+    get_db,
+)
+from src.infra.persistence import transaction_search
+from src.infra.persistence.repositories import analysis_repository, rollup_repository, transaction_repository
 from src.infra.persistence.models import (
     FinancialAnalysis,
+    FraudBaseline,
     GeneratedReport,
+    OpenBankingSyncCursor,
     ReportSchedule,
     Transaction,
     User,
@@ -79,26 +88,81 @@ def update_ui_settings(
     return {"ok": True, "settings": payload.settings}
 
 
-@router.get("/transactions/export.csv")
-def export_transactions_csv(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    apply_user_rls_context(db, current_user.id)
-    txs: List[Transaction] = (
-        db.query(Transaction).filter(Transaction.user_id == current_user.id).order_by(Transaction.transaction_date.desc()).all()
+def _export_response(request: Request, user_id: int, export_format: str) -> StreamingResponse:
+    if export_format == "parquet" and not transaction_export.PARQUET_AVAILABLE:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Parquet export requires pyarrow.")
+    gzip = export_format in transaction_export.GZIP_FORMATS and transaction_export.accepts_gzip(
+        request.headers.get("accept-encoding", "")
     )
+    response = StreamingResponse(
+        transaction_export.stream_user_transactions(user_id, export_format, gzip=gzip),
+        media_type=transaction_export.MEDIA_TYPES[export_format],
+    )
+    response.headers["Content-Disposition"] = f"attachment; filename=transactions_export.{export_format}"
+    response.headers["Vary"] = "Accept-Encoding"
+    if gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
 
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["id", "transaction_date", "description", "amount", "category", "source"])
-    for tx in txs:
-        writer.writerow([tx.id, tx.transaction_date, tx.description, float(tx.amount), tx.category, tx.source])
 
-    response = StreamingResponse(iter([output.getvalue()]), media_type="text/csv")
-    response.headers["Content-Disposition"] = "attachment; filename=transactions_export.csv"
-    return response
+@router.get("/transactions/export.csv")
+def export_transactions_csv(request: Request, current_user: User = Depends(get_current_user)):
+    return _export_response(request, current_user.id, "csv")
+
+
+@router.get("/transactions/export.ndjson")
+def export_transactions_ndjson(request: Request, current_user: User = Depends(get_current_user)):
+    return _export_response(request, current_user.id, "ndjson")
+
+
+@router.get("/transactions/export.parquet")
+def export_transactions_parquet(request: Request, current_user: User = Depends(get_current_user)):
+    return _export_response(request, current_user.id, "parquet")
+
+
+@router.get("/transactions/rollups")
+async def get_transaction_rollups(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    group_by: str = Query(default="day"),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    category: Optional[str] = Query(default=None),
+):
+    """
+    Transaction totals per day or per category for dashboards, served from the daily rollups.
+    Uncategorized transactions are grouped under category "".
+    """
+    if group_by not in rollup_repository.GROUP_BY_COLUMNS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"group_by must be one of: {', '.join(rollup_repository.GROUP_BY_COLUMNS)}.",
+        )
+    await apply_user_rls_context_async(db, current_user.id)
+    rows = await db.run_sync(
+        rollup_repository.get_totals,
+        current_user.id,
+        group_by=group_by,
+        start_date=start_date,
+        end_date=end_date,
+        category=category,
+    )
+    return [
+        {
+            group_by: row["key"],
+            "count": int(row["transaction_count"]),
+            "total": float(row["amount_sum"]),
+            "absolute_total": float(row["amount_abs_sum"]),
+            "min_amount": float(row["amount_min"]) if row["amount_min"] is not None else None,
+            "max_amount": float(row["amount_max"]) if row["amount_max"] is not None else None,
+        }
+        for row in rows
+    ]
 
 
 @router.get("/transactions")
 def list_transactions_filtered(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
     q: Optional[str] = Query(default=None),
@@ -106,41 +170,50 @@ def list_transactions_filtered(
     source: Optional[str] = Query(default=None),
     min_amount: Optional[float] = Query(default=None),
     max_amount: Optional[float] = Query(default=None),
-    sort_by: str = Query(default="transaction_date"),
+    sort_by: Optional[str] = Query(default=None),
     sort_dir: str = Query(default="desc"),
     limit: int = Query(default=200, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None),
 ):
-    apply_user_rls_context(db, current_user.id)
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
+    """
+    Returns one page of transactions. When more rows follow, the `X-Next-Cursor` response header
+    holds the cursor to pass back for the next page with the same filters and sort.
 
-    if q:
-        like_q = f"%{q}%"
-        query = query.filter(
-            (Transaction.description.ilike(like_q)) | (Transaction.category.ilike(like_q)) | (Transaction.source.ilike(like_q))
-        )
-    if category:
-        query = query.filter(Transaction.category.ilike(f"%{category}%"))
-    if source:
-        query = query.filter(Transaction.source.ilike(f"%{source}%"))
-    if min_amount is not None:
-        query = query.filter(Transaction.amount >= min_amount)
-    if max_amount is not None:
-        query = query.filter(Transaction.amount <= max_amount)
-
-    sort_map = {
-        "id": Transaction.id,
-        "transaction_date": Transaction.transaction_date,
-        "amount": Transaction.amount,
-        "category": Transaction.category,
-        "source": Transaction.source,
-    }
-    sort_col = sort_map.get(sort_by, Transaction.transaction_date)
-    if sort_dir.lower() == "asc":
-        query = query.order_by(sort_col.asc())
-    else:
-        query = query.order_by(sort_col.desc())
-
-    rows = query.limit(limit).all()
+    `q` uses the database's search index when it has one; results are then ranked by relevance
+    unless another `sort_by` is given.
+    """
+    apply_user_rls_context(db, current_user.id)
+    search_backend = transaction_search.search_backend(db) if q else None
+    ranked = transaction_repository.ranked_search_available(q, search_backend)
+    if sort_by is None and ranked:
+        sort_by = transaction_repository.RELEVANCE
+    elif sort_by not in transaction_repository.LISTING_SORT_COLUMNS and not (
+        sort_by == transaction_repository.RELEVANCE and ranked
+    ):
+        sort_by = "transaction_date"
+    sort_dir = "asc" if sort_dir.lower() == "asc" else "desc"
+    try:
+        after = transaction_repository.decode_listing_cursor(cursor, sort_by, sort_dir) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    statements = transaction_repository.listing_queries(
+        current_user.id,
+        db.get_bind().dialect.name,
+        q=q,
+        category=category,
+        source=source,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        after=after,
+        search_backend=search_backend,
+    )
+    rows = transaction_repository.fetch_listing_page(db, statements, limit + 1)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = transaction_repository.encode_listing_cursor(rows[-1], sort_by, sort_dir)
     return [
         {
             "id": f"TX-{tx.id}",
@@ -153,50 +226,51 @@ def list_transactions_filtered(
             "auditHash": "",
             "source": tx.source,
         }
-        for tx in rows
+        for tx, _ in rows
     ]
 
 
 @router.get("/reports", response_model=List[ReportItem])
-def list_reports(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    apply_user_rls_context(db, current_user.id)
-    return (
-        db.query(GeneratedReport)
-        .filter(GeneratedReport.user_id == current_user.id)
+async def list_reports(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)):
+    await apply_user_rls_context_async(db, current_user.id)
+    result = await db.scalars(
+        select(GeneratedReport)
+        .where(GeneratedReport.user_id == current_user.id)
         .order_by(GeneratedReport.created_at.desc())
-        .all()
     )
+    return result.all()
 
 
 @router.post("/reports/generate", response_model=ReportItem)
-def generate_report(
+async def generate_report(
     payload: ReportGeneratePayload,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    apply_user_rls_context(db, current_user.id)
+    await apply_user_rls_context_async(db, current_user.id)
 
-    analysis_query = db.query(FinancialAnalysis).filter(FinancialAnalysis.user_id == current_user.id)
+    # Only the promoted summary columns; the analysis_results JSON is not loaded.
+    analysis_query = select(*analysis_repository.SUMMARY_COLUMNS).where(FinancialAnalysis.user_id == current_user.id)
     if payload.analysis_id:
-        analysis_query = analysis_query.filter(FinancialAnalysis.id == payload.analysis_id)
-    analysis = analysis_query.order_by(FinancialAnalysis.created_at.desc()).first()
+        analysis_query = analysis_query.where(FinancialAnalysis.id == payload.analysis_id)
+    analysis = (
+        await db.execute(
+            analysis_query.order_by(FinancialAnalysis.created_at.desc(), FinancialAnalysis.id.desc()).limit(1)
+        )
+    ).first()
     if not analysis:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No analysis found for report generation.")
 
-    summary = analysis.analysis_results.get("summary", {})
-    fraud = analysis.analysis_results.get("fraud_analysis", {})
-    carbon = analysis.analysis_results.get("carbon_analysis", {})
-
     lines = [
         f"Report Type: {payload.report_type}",
         f"Analysis ID: {analysis.id}",
         f"Generated At: {datetime.utcnow().isoformat()}Z",
         "",
-        f"Total Transactions: {summary.get('total_transactions', 0)}",
-        f"Total Amount: {summary.get('total_amount', 0)}",
-        f"Fraud Detected: {fraud.get('fraud_detected', False)}",
-        f"Highest Risk Score: {fraud.get('highest_risk_score', 0)}",
-        f"Total Carbon Kg: {carbon.get('total_carbon_kg', 0)}",
+        f"Total Transactions: {analysis.total_transactions or 0}",
+        f"Total Amount: {float(analysis.total_amount or 0)}",
+        f"Fraud Detected: {bool(analysis.fraud_detected)}",
+        f"Highest Risk Score: {analysis.highest_risk_score or 0}",
+        f"Total Carbon Kg: {analysis.total_carbon_kg or 0}",
     ]
 
     report = GeneratedReport(
@@ -206,18 +280,18 @@ def generate_report(
         content="\n".join(lines),
     )
     db.add(report)
-    db.commit()
-    db.refresh(report)
+    await db.commit()
+    await db.refresh(report)
     return report
 
 
 @router.get("/reports/{report_id}/download")
-def download_report(report_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    apply_user_rls_context(db, current_user.id)
-    report = (
-        db.query(GeneratedReport)
-        .filter(GeneratedReport.id == report_id, GeneratedReport.user_id == current_user.id)
-        .first()
+async def download_report(
+    report_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)
+):
+    await apply_user_rls_context_async(db, current_user.id)
+    report = await db.scalar(
+        select(GeneratedReport).where(GeneratedReport.id == report_id, GeneratedReport.user_id == current_user.id)
     )
     if not report:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found.")
@@ -228,43 +302,47 @@ def download_report(report_id: int, db: Session = Depends(get_db), current_user:
 
 
 @router.post("/audit/verify")
-def verify_audit_hash(
-    payload: AuditVerifyPayload, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+async def verify_audit_hash(
+    payload: AuditVerifyPayload,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    apply_user_rls_context(db, current_user.id)
-    found = (
-        db.query(FinancialAnalysis)
-        .filter(
+    await apply_user_rls_context_async(db, current_user.id)
+    analysis_id = await db.scalar(
+        select(FinancialAnalysis.id)
+        .where(
             FinancialAnalysis.user_id == current_user.id,
             FinancialAnalysis.blockchain_tx_hash == payload.hash,
         )
-        .first()
+        .limit(1)
     )
     return {
-        "verified": bool(found),
+        "verified": analysis_id is not None,
         "hash": payload.hash,
-        "analysis_id": found.id if found else None,
+        "analysis_id": analysis_id,
     }
 
 
 @router.get("/reports/schedules", response_model=List[ReportScheduleItem])
-def list_report_schedules(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    apply_user_rls_context(db, current_user.id)
-    return (
-        db.query(ReportSchedule)
-        .filter(ReportSchedule.user_id == current_user.id, ReportSchedule.active == True)
+async def list_report_schedules(
+    db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async)
+):
+    await apply_user_rls_context_async(db, current_user.id)
+    result = await db.scalars(
+        select(ReportSchedule)
+        .where(ReportSchedule.user_id == current_user.id, ReportSchedule.active == True)
         .order_by(ReportSchedule.created_at.desc())
-        .all()
     )
+    return result.all()
 
 
 @router.post("/reports/schedules", response_model=ReportScheduleItem)
-def create_report_schedule(
+async def create_report_schedule(
     payload: ReportScheduleCreatePayload,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    apply_user_rls_context(db, current_user.id)
+    await apply_user_rls_context_async(db, current_user.id)
     schedule = ReportSchedule(
         user_id=current_user.id,
         report_type=payload.report_type,
@@ -273,8 +351,8 @@ def create_report_schedule(
         active=True,
     )
     db.add(schedule)
-    db.commit()
-    db.refresh(schedule)
+    await db.commit()
+    await db.refresh(schedule)
     return schedule
 
 
@@ -319,19 +397,21 @@ def simulate_backend_data(
             category = random.choice(categories)
             base_amount = random.uniform(20.0, 250000.0)
             signed_amount = base_amount if random.random() > 0.35 else -base_amount
-            tx = Transaction(
-                description=f"Movimentacao {random.choice(merchants)}",
-                amount=round(signed_amount, 2),
-                category=category,
-                transaction_date=tx_date,
-                user_id=current_user.id,
-                source=f"{random.choice(banks)}_SYNC",
+            all_generated.append(
+                {
+                    "description": f"Movimentacao {random.choice(merchants)}",
+                    "amount": round(signed_amount, 2),
+                    "category": category,
+                    "transaction_date": tx_date,
+                    "user_id": current_user.id,
+                    "source": f"{random.choice(banks)}_SYNC",
+                }
             )
-            db.add(tx)
-            all_generated.append(tx)
             created_transactions += 1
 
-    db.flush()
+    generated_ids = transaction_repository.bulk_insert_transactions_returning_ids(db, all_generated)
+    for tx, tx_id in zip(all_generated, generated_ids):
+        tx["id"] = tx_id
     diagnostics["db_write"] = True
 
     window = max(1, days // 12)
@@ -340,7 +420,7 @@ def simulate_backend_data(
         if not chunk:
             continue
 
-        total_amount = float(sum(float(t.amount) for t in chunk))
+        total_amount = float(sum(float(t["amount"]) for t in chunk))
         total_transactions = len(chunk)
 
         highest_risk_score = 0.0
@@ -349,21 +429,21 @@ def simulate_backend_data(
         breakdown: Dict[str, float] = {}
         riskiest = []
         for t in chunk:
-            factor = CATEGORY_FACTORS.get(t.category, 0.03)
-            risk = min(0.99, abs(float(t.amount)) / 1_000_000 + factor + random.uniform(0.0, 0.2))
-            carbon = abs(float(t.amount)) * (factor / 10.0)
+            factor = CATEGORY_FACTORS.get(t["category"], 0.03)
+            risk = min(0.99, abs(float(t["amount"])) / 1_000_000 + factor + random.uniform(0.0, 0.2))
+            carbon = abs(float(t["amount"])) * (factor / 10.0)
             carbon_total += carbon
-            breakdown[t.category] = breakdown.get(t.category, 0.0) + carbon
+            breakdown[t["category"]] = breakdown.get(t["category"], 0.0) + carbon
             if risk > highest_risk_score:
                 highest_risk_score = risk
             if risk > 0.7:
                 flagged += 1
                 riskiest.append(
                     {
-                        "id": f"TX-{t.id}",
-                        "amount": float(t.amount),
-                        "category": t.category,
-                        "transaction_date": t.transaction_date.isoformat(),
+                        "id": f"TX-{t['id']}",
+                        "amount": float(t["amount"]),
+                        "category": t["category"],
+                        "transaction_date": t["transaction_date"].isoformat(),
                         "risk_score": risk,
                     }
                 )
@@ -401,6 +481,7 @@ def simulate_backend_data(
             user_id=current_user.id,
             blockchain_tx_hash=f"0x{uuid.uuid4().hex}",
             analysis_type="BANKING" if created_analyses % 2 else "CSV",
+            **analysis_repository.summary_columns(analysis_results),
         )
         db.add(analysis)
         created_analyses += 1
@@ -445,6 +526,9 @@ def reset_user_data(db: Session = Depends(get_db), current_user: User = Depends(
     db.execute(delete(GeneratedReport).where(GeneratedReport.user_id == current_user.id))
     db.execute(delete(FinancialAnalysis).where(FinancialAnalysis.user_id == current_user.id))
     db.execute(delete(Transaction).where(Transaction.user_id == current_user.id))
+    rollup_repository.delete_user_rollups(db, current_user.id)
+    db.execute(delete(FraudBaseline).where(FraudBaseline.user_id == current_user.id))
+    db.execute(delete(OpenBankingSyncCursor).where(OpenBankingSyncCursor.user_id == current_user.id))
     db.execute(delete(UserUiSetting).where(UserUiSetting.user_id == current_user.id))
     db.commit()
     return {"ok": True, "message": "Dados do usuario removidos."}
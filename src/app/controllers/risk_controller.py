@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domains.identity.dependencies import get_current_user_async
+from src.domains.risk.services import risk_scoring_service
+from src.infra.persistence.database import apply_user_rls_context_async, get_async_db
+from src.infra.persistence.models import User
+from src.infra.shared.schemas import risk_schema
+
+router = APIRouter(prefix="/risk")
+
+
+@router.post("/score", response_model=risk_schema.RiskScoreResponse)
+async def score_transaction(
+    payload: risk_schema.RiskScoreRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    """
+    Scores a single transaction in real time against the fraud ensemble.
+    """
+    await apply_user_rls_context_async(db, current_user.id)
+    return await risk_scoring_service.score_transaction(
+        db=db, user_id=current_user.id, amount=payload.amount, timestamp=payload.transaction_date
+    )
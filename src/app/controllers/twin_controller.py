@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -11,13 +11,25 @@ from src.infra.shared.schemas import digital_twin_schema
 router = APIRouter()
 
 
-@router.post("/twins/", response_model=digital_twin_schema.DigitalTwin)
+@router.post("/twins/", response_model=digital_twin_schema.SimulationJob, status_code=status.HTTP_202_ACCEPTED)
 def create_twin(twin_data: digital_twin_schema.DigitalTwinCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     apply_user_rls_context(db, current_user.id)
-    return digital_twin_service.create_digital_twin_for_user(db=db, twin_data=twin_data, user=current_user)
+    try:
+        return digital_twin_service.enqueue_digital_twin_for_user(db=db, twin_data=twin_data, user=current_user)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
 
 
 @router.get("/twins/", response_model=List[digital_twin_schema.DigitalTwin])
 def get_twins(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
     apply_user_rls_context(db, current_user.id)
     return digital_twin_service.get_twins_for_user(db=db, user_id=current_user.id)
+
+
+@router.get("/twins/jobs/{job_id}", response_model=digital_twin_schema.SimulationJob)
+def get_twin_job(job_id: int, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+    apply_user_rls_context(db, current_user.id)
+    job = digital_twin_service.get_job_for_user(db=db, job_id=job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Simulation job not found.")
+    return job
@@ -5,12 +5,30 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from src.app.config import settings
-from src.app.controllers import analysis_controller, auth_controller, open_banking_controller, report_controller, twin_controller
+from src.app.controllers import (
+    analysis_controller,
+    auth_controller,
+    open_banking_controller,
+    report_controller,
+    risk_controller,
+    twin_controller,
+)
 from src.app.middleware.security import SecurityHeadersMiddleware
 from src.domains.identity.services.auth_service import ensure_default_admin_user
-from src.domains.exceptions import AnalysisGatewayError, UserAlreadyExistsException, UserNotFoundException
+from src.domains.exceptions import (
+    AnalysisGatewayError,
+    FraudInferenceOverloadedError,
+    UserAlreadyExistsException,
+    UserNotFoundException,
+)
+from src.domains.insights.services import simulation_worker
+from src.domains.insights.simulators.digital_twin_simulator import shutdown_simulation_pool
+from src.domains.risk.services.inference_pool import shutdown_inference_pool
+from src.domains.risk.services.model_registry import model_registry
+from src.infra.gateways.http_clients import http_clients
+from src.infra.observability.metrics import metrics
 from src.infra.persistence import models
-from src.infra.persistence.database import Base, SessionLocal, engine
+from src.infra.persistence.database import Base, SessionLocal, dispose_async_engine, engine
 
 app = FastAPI(title=settings.PROJECT_NAME)
 app.add_middleware(SecurityHeadersMiddleware)
@@ -20,6 +38,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -40,6 +59,24 @@ async def startup_event():
     except Exception as e:
         print(f"Error creating database tables: {e}")
 
+    if settings.fraud_model_warmup_on_startup:
+        try:
+            model_registry.warmup()
+        except Exception as e:
+            print(f"Error warming up fraud models: {e}")
+
+    if settings.twin_job_worker == "process":
+        simulation_worker.start_local_worker()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_inference_pool()
+    shutdown_simulation_pool()
+    simulation_worker.stop_local_worker()
+    await http_clients.aclose()
+    await dispose_async_engine()
+
 
 @app.exception_handler(UserNotFoundException)
 async def user_not_found_exception_handler(request: Request, exc: UserNotFoundException):
@@ -56,13 +93,24 @@ async def analysis_gateway_error_handler(request: Request, exc: AnalysisGatewayE
     return JSONResponse(status_code=503, content={"message": exc.message})
 
 
+@app.exception_handler(FraudInferenceOverloadedError)
+async def fraud_inference_overloaded_handler(request: Request, exc: FraudInferenceOverloadedError):
+    return JSONResponse(status_code=503, content={"message": exc.message}, headers={"Retry-After": "1"})
+
+
 app.include_router(auth_controller.router, prefix="/api/v1", tags=["Authentication"])
 app.include_router(twin_controller.router, prefix="/api/v1", tags=["Digital Twins"])
 app.include_router(analysis_controller.router, prefix="/api/v1", tags=["Analysis"])
 app.include_router(open_banking_controller.router, prefix="/api/v1", tags=["Open Banking"])
 app.include_router(report_controller.router, prefix="/api/v1", tags=["UI"])
+app.include_router(risk_controller.router, prefix="/api/v1", tags=["Risk"])
 
 
 @app.get("/", tags=["Status"])
 def read_root():
     return {"message": "Service is running"}
+
+
+@app.get("/metrics", tags=["Status"])
+def read_metrics():
+    return metrics.snapshot()
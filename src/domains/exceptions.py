@@ -14,4 +14,8 @@ class UserAlreadyExistsException(AppException):
 
 class AnalysisGatewayError(AppException):
     """Raised when the analysis gateway fails."""
-    pass
\ No newline at end of file
+    pass
+
+class FraudInferenceOverloadedError(AppException):
+    """Raised when the fraud inference pool has no free slot."""
+    pass
@@ -1,33 +1,53 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.app.config import settings
-from src.infra.persistence.database import get_db
+from src.infra.persistence.database import get_async_db, get_db
 from src.infra.persistence.repositories import user_repository
 from src.infra.shared.schemas import user_schema
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/token")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _email_from_token(token: str) -> str:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         email: str = payload.get("sub")
         token_type: str = payload.get("typ", "access")
         if email is None:
-            raise credentials_exception
+            raise _credentials_exception()
         if token_type != "access":
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
-    user = user_repository.get_user_by_email(db, email=email)
+        raise _credentials_exception()
+    return email
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    user = user_repository.get_user_by_email(db, email=_email_from_token(token))
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """
+    get_current_user for routes on the async session; the user is loaded into the request's
+    AsyncSession so it can be passed straight to repositories run on that session.
+    """
+    email = _email_from_token(token)
+    user = await db.run_sync(user_repository.get_user_by_email, email=email)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
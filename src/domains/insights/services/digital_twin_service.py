@@ -1,22 +1,61 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+
+from sqlalchemy.orm import Session, joinedload
 
 from src.infra.persistence import models
+from src.infra.persistence.repositories import simulation_job_repository
 from src.infra.shared.schemas import digital_twin_schema
-from src.domains.insights.simulators.digital_twin_simulator import run_monte_carlo_simulation
+from src.domains.insights.services.simulation_cache import get_or_run_simulation
+from src.domains.insights.simulators.digital_twin_simulator import validate_profile
+
+PROGRESS_STEP = 0.05
+
 
-def create_digital_twin_for_user(db: Session, twin_data: digital_twin_schema.DigitalTwinCreate, user: models.User) -> models.DigitalTwin:
-    simulation_results = run_monte_carlo_simulation(twin_data.financial_profile)
+def enqueue_digital_twin_for_user(db: Session, twin_data: digital_twin_schema.DigitalTwinCreate, user: models.User) -> models.SimulationJob:
+    """
+    Stores the twin without results and queues its simulation for the job worker. Raises
+    ValueError, before storing anything, for a profile the simulator cannot run.
+    """
+    validate_profile(twin_data.financial_profile)
     db_twin = models.DigitalTwin(
         name=twin_data.name,
         financial_profile=twin_data.financial_profile,
-        simulation_results=simulation_results,
+        simulation_results=None,
         owner=user
     )
     db.add(db_twin)
+    db.flush()
+    db_job = simulation_job_repository.create_job(db, user_id=user.id, twin_id=db_twin.id)
     db.commit()
-    db.refresh(db_twin)
-    return db_twin
+    db.refresh(db_job)
+    return db_job
+
+
+def run_simulation_job(db: Session, job: models.SimulationJob) -> None:
+    """
+    Runs a claimed job's simulation through the result cache, recording progress in PROGRESS_STEP increments, and stores
+    the results on its twin. Failures are recorded on the job instead of being raised.
+    """
+    reported = job.progress
+
+    def on_progress(fraction: float) -> None:
+        nonlocal reported
+        if fraction - reported >= PROGRESS_STEP:
+            reported = fraction
+            simulation_job_repository.set_progress(db, job, round(fraction, 4))
+
+    try:
+        job.twin.simulation_results = get_or_run_simulation(db, job.twin.financial_profile, on_progress)
+    except Exception as e:
+        db.rollback()
+        simulation_job_repository.finish_job(db, job, error=str(e) or e.__class__.__name__)
+        return
+    simulation_job_repository.finish_job(db, job)
+
+
+def get_job_for_user(db: Session, job_id: int, user_id: int) -> Optional[models.SimulationJob]:
+    return simulation_job_repository.get_job_for_user(db, job_id, user_id)
 
 
 def get_twins_for_user(db: Session, user_id: int) -> list[models.DigitalTwin]:
-    return db.query(models.DigitalTwin).filter(models.DigitalTwin.user_id == user_id).all()
+    return db.query(models.DigitalTwin).options(joinedload(models.DigitalTwin.job)).filter(models.DigitalTwin.user_id == user_id).all()
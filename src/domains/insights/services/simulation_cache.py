@@ -0,0 +1,139 @@
+"""
+Content-addressed cache for Monte Carlo results.
+
+The key is a SHA-256 of the canonicalized financial profile (seed included) together with the
+engine version and the settings that shape results. Lookups go through an in-process LRU tier
+first, then the simulation_result_cache table; both honour the same TTL and are size-bounded.
+The table tier is best-effort: a failed read or write is logged and the simulation still runs
+or returns.
+"""
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.app.config import settings
+from src.domains.insights.simulators.digital_twin_simulator import (
+    ENGINE_VERSION,
+    ProgressCallback,
+    run_monte_carlo_simulation,
+)
+from src.infra.observability.metrics import metrics
+from src.infra.persistence.repositories import simulation_cache_repository
+
+logger = logging.getLogger(__name__)
+
+# Profile keys that change how a run executes but not its results.
+EXECUTION_KEYS = frozenset({"num_workers"})
+
+_memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_lock = threading.Lock()
+_memory_hits = metrics.counter("monte_carlo_cache_memory_hits_total")
+_db_hits = metrics.counter("monte_carlo_cache_db_hits_total")
+_misses = metrics.counter("monte_carlo_cache_misses_total")
+_db_errors = metrics.counter("monte_carlo_cache_db_errors_total")
+
+
+def _canonical(value: Any) -> Any:
+    # Numbers keep their type: the simulator does not treat 1 and 1.0 alike (num_simulations and
+    # seed must be ints), and json.dumps writes them as "1" and "1.0", so they get different keys.
+    if isinstance(value, dict):
+        return {str(key): _canonical(value[key]) for key in sorted(value, key=str)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def cache_key(financial_profile: dict) -> str:
+    material = {
+        "profile": _canonical({k: v for k, v in financial_profile.items() if k not in EXECUTION_KEYS}),
+        "engine": settings.monte_carlo_engine,
+        "engine_version": ENGINE_VERSION,
+        "chunk_size": settings.monte_carlo_chunk_size,
+        "default_simulations": settings.monte_carlo_simulations,
+        "default_band_interval_months": settings.monte_carlo_band_interval_months,
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _memory_get(key: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        entry = _memory.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > settings.monte_carlo_cache_ttl_seconds:
+            del _memory[key]
+            return None
+        _memory.move_to_end(key)
+        return entry[1]
+
+
+def _memory_put(key: str, results: Dict[str, Any]) -> None:
+    with _lock:
+        _memory[key] = (time.monotonic(), results)
+        _memory.move_to_end(key)
+        while len(_memory) > settings.monte_carlo_cache_memory_entries:
+            _memory.popitem(last=False)
+
+
+def clear_memory_cache() -> None:
+    with _lock:
+        _memory.clear()
+
+
+def _db_get(db: Session, key: str) -> Optional[Dict[str, Any]]:
+    try:
+        return simulation_cache_repository.get_entry(db, key, settings.monte_carlo_cache_ttl_seconds)
+    except SQLAlchemyError:
+        db.rollback()
+        _db_errors.inc()
+        logger.exception("Reading Monte Carlo cache entry %s failed", key)
+        return None
+
+
+def _db_put(db: Session, key: str, results: Dict[str, Any]) -> None:
+    try:
+        simulation_cache_repository.save_entry(
+            db, key, results, settings.monte_carlo_cache_ttl_seconds, settings.monte_carlo_cache_db_entries
+        )
+    except SQLAlchemyError:
+        # Two workers finishing the same profile race on the key; the other one's entry is as good.
+        db.rollback()
+        _db_errors.inc()
+        logger.exception("Saving Monte Carlo cache entry %s failed", key)
+
+
+def get_or_run_simulation(
+    db: Session, financial_profile: dict, on_progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Returns cached results for an equivalent profile, or runs the simulation and caches it.
+    """
+    if not settings.monte_carlo_cache_enabled:
+        return run_monte_carlo_simulation(financial_profile, on_progress)
+
+    key = cache_key(financial_profile)
+    results = _memory_get(key)
+    if results is not None:
+        _memory_hits.inc()
+        return copy.deepcopy(results)
+
+    results = _db_get(db, key)
+    if results is not None:
+        _db_hits.inc()
+        _memory_put(key, results)
+        return copy.deepcopy(results)
+
+    _misses.inc()
+    results = run_monte_carlo_simulation(financial_profile, on_progress)
+    _db_put(db, key, results)
+    _memory_put(key, results)
+    return copy.deepcopy(results)
@@ -0,0 +1,103 @@
+"""
+Local worker for digital twin simulation jobs.
+
+Jobs live in the simulation_jobs table, so no broker is needed: the worker polls for the oldest
+queued job, claims it and runs it. The API starts one worker process on startup when
+`twin_job_worker` is "process"; with "none", run workers separately:
+
+    python -m src.domains.insights.services.simulation_worker [--requeue-running]
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from typing import Optional
+
+from src.app.config import settings
+from src.domains.insights.services import digital_twin_service
+from src.infra.persistence.database import SessionLocal
+from src.infra.persistence.repositories import simulation_job_repository
+
+STOP_TIMEOUT_SECONDS = 10
+
+_process: Optional[multiprocessing.Process] = None
+_stop_event = None
+
+
+def process_next_job() -> bool:
+    """
+    Claims and runs one queued job. Returns False when the queue was empty.
+    """
+    db = SessionLocal()
+    try:
+        job = simulation_job_repository.claim_next_job(db)
+        if job is None:
+            return False
+        digital_twin_service.run_simulation_job(db, job)
+        return True
+    finally:
+        db.close()
+
+
+def run_worker(stop_event=None, poll_interval: Optional[float] = None) -> None:
+    """
+    Processes jobs until `stop_event` is set, sleeping `poll_interval` seconds when idle.
+    A worker started by the API also exits once the API process is gone.
+    """
+    poll_interval = poll_interval or settings.twin_job_poll_interval_seconds
+    parent_pid = os.getppid() if stop_event is not None else None
+    while stop_event is None or not stop_event.is_set():
+        if parent_pid is not None and os.getppid() != parent_pid:
+            return
+        try:
+            if process_next_job():
+                continue
+        except Exception as e:
+            print(f"Error processing simulation job: {e}")
+        if stop_event is None:
+            time.sleep(poll_interval)
+        else:
+            stop_event.wait(poll_interval)
+
+
+def start_local_worker() -> None:
+    """
+    Starts the worker in a separate process. It is not a daemon process because the simulator
+    may start its own process pool for multi-worker runs.
+    """
+    global _process, _stop_event
+    if _process is not None and _process.is_alive():
+        return
+    context = multiprocessing.get_context("spawn")
+    _stop_event = context.Event()
+    _process = context.Process(target=run_worker, args=(_stop_event,), name="twin-simulation-worker")
+    _process.start()
+
+
+def stop_local_worker() -> None:
+    global _process, _stop_event
+    if _process is None:
+        return
+    _stop_event.set()
+    _process.join(STOP_TIMEOUT_SECONDS)
+    if _process.is_alive():
+        _process.terminate()
+        _process.join()
+    _process, _stop_event = None, None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs digital twin simulation jobs.")
+    parser.add_argument(
+        "--requeue-running",
+        action="store_true",
+        help="Return jobs left running by a stopped worker to the queue before starting.",
+    )
+    args = parser.parse_args()
+    if args.requeue_running:
+        db = SessionLocal()
+        try:
+            print(f"Requeued {simulation_job_repository.requeue_running_jobs(db)} running job(s).")
+        finally:
+            db.close()
+    run_worker()
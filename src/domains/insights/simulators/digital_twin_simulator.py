@@ -1,44 +1,306 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+
 import numpy as np
 
-def run_monte_carlo_simulation(financial_profile: dict) -> dict:
+from src.app.config import settings
+
+# Bump when a change to the engines alters results for the same profile and seed.
+ENGINE_VERSION = 2
+BAND_PERCENTILES = (5, 25, 50, 75, 95)
+MONTHLY_PROGRESS_STEPS = 20
+# Percentile grid of the per-block summaries; it holds every reported percentile exactly.
+SUMMARY_PERCENTILES = np.linspace(0, 100, 1001)
+
+ProgressCallback = Callable[[float], None]
+# (count, mean, M2, values at SUMMARY_PERCENTILES)
+Summary = Tuple[int, float, float, np.ndarray]
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _simulate_python(
+    initial_capital: float,
+    monthly_contribution: float,
+    years_to_simulate: int,
+    expected_annual_return: float,
+    annual_volatility: float,
+    num_simulations: int,
+) -> np.ndarray:
+    """
+    Reference engine: one scalar draw per simulation-year.
+    """
+    final_values = []
+
+    for _ in range(num_simulations):
+        current_value = initial_capital
+        for _ in range(years_to_simulate):
+            annual_return = np.random.normal(
+                loc=expected_annual_return, scale=annual_volatility
+            )
+            current_value += monthly_contribution * 12
+            current_value *= 1 + annual_return
+        final_values.append(current_value)
+
+    return np.array(final_values)
+
+
+def _simulate_numpy(
+    initial_capital: float,
+    monthly_contribution: float,
+    years_to_simulate: int,
+    expected_annual_return: float,
+    annual_volatility: float,
+    num_simulations: int,
+    chunk_size: int,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Vectorized engine: draws a (simulations x years) return matrix per chunk of simulations,
+    so memory is bounded by chunk_size x years regardless of num_simulations.
+    """
+    rng = rng or np.random.default_rng()
+    final_values = np.empty(num_simulations)
+    yearly_contribution = monthly_contribution * 12
+
+    for start in range(0, num_simulations, chunk_size):
+        size = min(chunk_size, num_simulations - start)
+        growth = 1 + rng.normal(
+            loc=expected_annual_return, scale=annual_volatility, size=(size, years_to_simulate)
+        )
+        values = np.full(size, initial_capital, dtype=np.float64)
+        for year in range(years_to_simulate):
+            values += yearly_contribution
+            values *= growth[:, year]
+        final_values[start:start + size] = values
+
+    return final_values
+
+
+def _simulate_monthly(
+    initial_capital: float,
+    monthly_contribution: float,
+    years_to_simulate: int,
+    expected_annual_return: float,
+    annual_volatility: float,
+    num_simulations: int,
+    band_interval_months: int,
+    rng: np.random.Generator,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Tuple[np.ndarray, dict]:
+    """
+    Monthly-step engine: contributions are added every month and returns are drawn per month
+    (annual mean / 12, annual volatility / sqrt(12)). Percentile bands are taken from the current
+    values every `band_interval_months` while stepping, so only one value per path is kept.
+    """
+    monthly_return = expected_annual_return / 12
+    monthly_volatility = annual_volatility / np.sqrt(12)
+    num_months = years_to_simulate * 12
+    progress_every = max(1, num_months // MONTHLY_PROGRESS_STEPS)
+
+    values = np.full(num_simulations, initial_capital, dtype=np.float64)
+    growth = np.empty(num_simulations)
+    months = [0]
+    band_values = [np.percentile(values, BAND_PERCENTILES)]
+
+    for month in range(1, num_months + 1):
+        rng.standard_normal(out=growth)
+        growth *= monthly_volatility
+        growth += 1 + monthly_return
+        values += monthly_contribution
+        values *= growth
+        if month % band_interval_months == 0 or month == num_months:
+            months.append(month)
+            band_values.append(np.percentile(values, BAND_PERCENTILES))
+        if on_progress and month % progress_every == 0:
+            on_progress(month / num_months)
+
+    bands = np.round(np.array(band_values), 2).T
+    return values, {
+        "months": months,
+        **{f"p{percentile}": band.tolist() for percentile, band in zip(BAND_PERCENTILES, bands)},
+    }
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def validate_profile(financial_profile: dict) -> None:
+    """
+    Raises ValueError for a profile the engines cannot run: `num_simulations` must be an integer
+    from 1 to settings.monte_carlo_max_simulations, and a monthly run's `band_interval_months`
+    a positive integer.
+    """
+    num_simulations = financial_profile.get("num_simulations", settings.monte_carlo_simulations)
+    if not _is_int(num_simulations) or not 1 <= num_simulations <= settings.monte_carlo_max_simulations:
+        raise ValueError(
+            f"num_simulations must be an integer from 1 to {settings.monte_carlo_max_simulations}, "
+            f"got {num_simulations!r}."
+        )
+    if financial_profile.get("time_step") == "monthly":
+        band_interval_months = financial_profile.get(
+            "band_interval_months", settings.monte_carlo_band_interval_months
+        )
+        if not _is_int(band_interval_months) or band_interval_months < 1:
+            raise ValueError(f"band_interval_months must be a positive integer, got {band_interval_months!r}.")
+
+
+def _summarise(final_values: np.ndarray) -> Summary:
+    mean = float(np.mean(final_values))
+    m2 = float(np.sum((final_values - mean) ** 2))
+    return len(final_values), mean, m2, np.percentile(final_values, SUMMARY_PERCENTILES)
+
+
+def _merge_summaries(parts: List[Summary]) -> Summary:
+    """
+    Combines block summaries: moments with the parallel Welford update, percentiles by mixing the
+    blocks' piecewise-linear CDFs weighted by count. A single summary is returned unchanged.
+    """
+    if len(parts) == 1:
+        return parts[0]
+    count, mean, m2 = 0, 0.0, 0.0
+    for part_count, part_mean, part_m2, _ in parts:
+        total = count + part_count
+        delta = part_mean - mean
+        mean += delta * part_count / total
+        m2 += part_m2 + delta ** 2 * count * part_count / total
+        count = total
+    points = np.unique(np.concatenate([part[3] for part in parts]))
+    cdf = sum(
+        part[0] / count * np.interp(points, part[3], SUMMARY_PERCENTILES, left=0.0, right=100.0)
+        for part in parts
+    )
+    return count, mean, m2, np.interp(SUMMARY_PERCENTILES, cdf, points)
+
+
+def _simulate_blocks(params: tuple, blocks: List[Tuple[int, np.random.SeedSequence]]) -> List[Summary]:
+    """
+    Simulates consecutive blocks of paths, each from its own seed stream, and returns one
+    summary per block, so only one block of final values is held at a time.
+    """
+    return [
+        _summarise(_simulate_numpy(*params, size, chunk_size=size, rng=np.random.default_rng(seed)))
+        for size, seed in blocks
+    ]
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.monte_carlo_max_workers)
+    return _executor
+
+
+def shutdown_simulation_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _simulate_parallel(
+    params: tuple,
+    num_simulations: int,
+    num_workers: int,
+    seed: Optional[int],
+    on_progress: Optional[ProgressCallback] = None,
+) -> Summary:
+    """
+    Splits the paths into chunk-sized blocks with independent SeedSequence.spawn streams and
+    spreads contiguous runs of blocks across up to `num_workers` processes. Streams are tied to
+    blocks, not workers, so a given seed yields the same result for any worker count. Workers
+    send back per-block summaries, not final values.
+    """
+    chunk_size = settings.monte_carlo_chunk_size
+    sizes = [min(chunk_size, num_simulations - start) for start in range(0, num_simulations, chunk_size)]
+    blocks = list(zip(sizes, np.random.SeedSequence(seed).spawn(len(sizes))))
+    num_workers = max(1, min(num_workers, settings.monte_carlo_max_workers, len(blocks)))
+
+    if num_workers == 1:
+        parts = []
+        for block in blocks:
+            parts.extend(_simulate_blocks(params, [block]))
+            if on_progress:
+                on_progress(len(parts) / len(blocks))
+    else:
+        shards = [list(shard) for shard in np.array_split(np.arange(len(blocks)), num_workers)]
+        futures = [
+            _get_executor().submit(_simulate_blocks, params, [blocks[i] for i in shard])
+            for shard in shards
+        ]
+        if on_progress:
+            for done, _ in enumerate(as_completed(futures), start=1):
+                on_progress(done / len(futures))
+        parts = [summary for future in futures for summary in future.result()]
+
+    # Merged once, in block order, so the result does not depend on how blocks were sharded.
+    return _merge_summaries(parts)
+
+
+def run_monte_carlo_simulation(
+    financial_profile: dict, on_progress: Optional[ProgressCallback] = None
+) -> dict:
     """
     Runs a Monte Carlo simulation for investment returns.
 
+    With the numpy engine, `num_workers` in the profile spreads paths across processes and
+    `seed` makes the run reproducible. `"time_step": "monthly"` switches to the monthly-step
+    engine, which also returns percentile `bands` over time for fan charts; it runs in-process.
+    Profiles that fail validate_profile raise ValueError.
+
     Args:
         financial_profile: A dictionary containing financial parameters.
+        on_progress: Optional callback receiving the completed fraction (0-1) as the run advances.
 
     Returns:
         A dictionary with the simulation's statistical results.
     """
+    validate_profile(financial_profile)
     initial_capital = financial_profile.get("initial_capital", 0)
     monthly_contribution = financial_profile.get("monthly_contribution", 0)
     years_to_simulate = financial_profile.get("years_to_simulate", 1)
     expected_annual_return = financial_profile.get("expected_annual_return", 0.0)
     annual_volatility = financial_profile.get("annual_volatility", 0.0)
-    num_simulations = financial_profile.get("num_simulations", 10000)
+    num_simulations = financial_profile.get("num_simulations", settings.monte_carlo_simulations)
+    num_workers = financial_profile.get("num_workers", 1)
+    seed = financial_profile.get("seed")
+    params = (
+        initial_capital,
+        monthly_contribution,
+        years_to_simulate,
+        expected_annual_return,
+        annual_volatility,
+    )
 
-    final_values = []
+    bands = None
 
-    for _ in range(num_simulations):
-        current_value = initial_capital
-        for _ in range(years_to_simulate):
-            annual_return = np.random.normal(
-                loc=expected_annual_return, scale=annual_volatility
-            )
-            current_value += monthly_contribution * 12
-            current_value *= 1 + annual_return
-        final_values.append(current_value)
+    if financial_profile.get("time_step") == "monthly":
+        band_interval_months = financial_profile.get(
+            "band_interval_months", settings.monte_carlo_band_interval_months
+        )
+        final_values_np, bands = _simulate_monthly(
+            *params, num_simulations, band_interval_months, np.random.default_rng(seed), on_progress
+        )
+        count, mean, m2, quantiles = _summarise(final_values_np)
+    elif settings.monte_carlo_engine == "python":
+        count, mean, m2, quantiles = _summarise(_simulate_python(*params, num_simulations))
+    else:
+        count, mean, m2, quantiles = _simulate_parallel(params, num_simulations, num_workers, seed, on_progress)
 
-    final_values_np = np.array(final_values)
+    def percentile(q: float) -> float:
+        return float(np.interp(q, SUMMARY_PERCENTILES, quantiles))
 
     results = {
-        "mean_value": np.mean(final_values_np),
-        "median_value": np.median(final_values_np),
-        "std_deviation": np.std(final_values_np),
-        "percentile_5": np.percentile(final_values_np, 5),
-        "percentile_25": np.percentile(final_values_np, 25),
-        "percentile_75": np.percentile(final_values_np, 75),
-        "percentile_95": np.percentile(final_values_np, 95),
+        "mean_value": mean,
+        "median_value": percentile(50),
+        "std_deviation": float(np.sqrt(m2 / count)),
+        "percentile_5": percentile(5),
+        "percentile_25": percentile(25),
+        "percentile_75": percentile(75),
+        "percentile_95": percentile(95),
     }
+    if bands is not None:
+        results["bands"] = bands
 
     return results
@@ -0,0 +1,139 @@
+"""
+Batch Open Banking sync across all connected users.
+
+A run snapshots every user with a bank connection into sync_run_items, never attempted first and
+then least recently attempted, and works through them with at most `sync_scheduler_concurrency`
+users in flight. Requests to the provider are additionally throttled by
+`open_banking_rate_limit_per_second` on the shared client. Each user's outcome is committed as
+soon as it finishes, so a run that is interrupted resumes with the users still pending. For the nightly refresh:
+
+    python -m src.domains.open_banking.services.sync_scheduler [--new-run] [--limit N]
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.config import settings
+from src.domains.open_banking.services import sync_service
+from src.infra.gateways.http_clients import http_clients
+from src.infra.observability.metrics import metrics
+from src.infra.persistence.database import AsyncSessionLocal, apply_user_rls_context_async, dispose_async_engine
+from src.infra.persistence.models import User
+from src.infra.persistence.repositories import sync_cursor_repository, sync_run_repository
+
+_users_total = metrics.counter("sync_scheduler_users_total")
+_failed_users_total = metrics.counter("sync_scheduler_failed_users_total")
+_transactions_total = metrics.counter("sync_scheduler_transactions_total")
+_users_in_flight = metrics.gauge("sync_scheduler_users_in_flight")
+_users_per_minute = metrics.gauge("sync_scheduler_users_per_minute")
+_transactions_per_second = metrics.gauge("sync_scheduler_transactions_per_second")
+_user_latency_ms = metrics.histogram("sync_scheduler_user_latency_ms")
+
+
+async def _sync_user(db: AsyncSession, user_id: int) -> Tuple[int, Optional[str]]:
+    user = await db.get(User, user_id)
+    if user is None:
+        return 0, f"User {user_id} no longer exists."
+    # Transaction-local, like in the request handlers; sync_service commits once at the end.
+    await apply_user_rls_context_async(db, user_id)
+    result = await sync_service.synchronize_transactions_for_user(db=db, user=user)
+    error = None
+    if result["failed_accounts"]:
+        error = "Accounts failed: " + ", ".join(
+            f"{a['account_id']} ({a['error']})" for a in result["failed_accounts"]
+        )
+    return result["transactions_synced"], error
+
+
+def _describe_error(exc: Exception) -> str:
+    if isinstance(exc, HTTPException):
+        return f"HTTP {exc.status_code}: {exc.detail}"
+    return f"{exc.__class__.__name__}: {exc}"
+
+
+async def run_batch_sync(
+    new_run: bool = False, limit: Optional[int] = None, concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Resumes the unfinished run, or starts a new one, and syncs its pending users.
+
+    Users whose accounts only partly synced are recorded as failed; the transactions that did
+    sync are kept and counted. Returns the run totals plus this invocation's throughput.
+    """
+    concurrency = concurrency or settings.sync_scheduler_concurrency
+    async with AsyncSessionLocal() as db:
+        run = None if new_run else await db.run_sync(sync_run_repository.get_unfinished_run)
+        if run is None:
+            user_ids = await db.run_sync(sync_run_repository.stale_first_user_ids, limit)
+            run = await db.run_sync(sync_run_repository.create_run, user_ids)
+        user_ids = await db.run_sync(sync_run_repository.pending_user_ids, run.id)
+
+        started_at = time.perf_counter()
+        processed = 0
+        synced = 0
+        slots = asyncio.Semaphore(concurrency)
+
+        async def process(user_id: int) -> None:
+            nonlocal processed, synced
+            # Each user gets its own session: an AsyncSession cannot be shared by concurrent tasks.
+            async with slots, AsyncSessionLocal() as user_db:
+                _users_in_flight.inc()
+                user_started_at = time.perf_counter()
+                try:
+                    transactions, error = await _sync_user(user_db, user_id)
+                except Exception as e:
+                    await user_db.rollback()
+                    transactions, error = 0, _describe_error(e)
+                    # Failed users go to the back of the next run too, instead of blocking its head.
+                    await user_db.run_sync(sync_cursor_repository.record_sync_attempt, user_id)
+                finally:
+                    _users_in_flight.dec()
+                    _user_latency_ms.observe((time.perf_counter() - user_started_at) * 1000)
+                if error:
+                    _failed_users_total.inc()
+                await user_db.run_sync(sync_run_repository.finish_item, run.id, user_id, transactions, error)
+
+            processed += 1
+            synced += transactions
+            _users_total.inc()
+            _transactions_total.inc(transactions)
+            elapsed = max(time.perf_counter() - started_at, 1e-9)
+            _users_per_minute.set(processed * 60 / elapsed)
+            _transactions_per_second.set(synced / elapsed)
+
+        await asyncio.gather(*(process(user_id) for user_id in user_ids))
+        run = await db.run_sync(sync_run_repository.finish_run, run)
+
+        elapsed = max(time.perf_counter() - started_at, 1e-9)
+        return {
+            "run_id": run.id,
+            "total_users": run.total_users,
+            "processed_users": run.processed_users,
+            "failed_users": run.failed_users,
+            "transactions_synced": run.transactions_synced,
+            "users_this_session": processed,
+            "elapsed_seconds": round(elapsed, 3),
+            "users_per_minute": round(processed * 60 / elapsed, 2),
+            "transactions_per_second": round(synced / elapsed, 2),
+        }
+
+
+async def _main(new_run: bool, limit: Optional[int], concurrency: Optional[int]) -> None:
+    try:
+        print(await run_batch_sync(new_run=new_run, limit=limit, concurrency=concurrency))
+    finally:
+        await http_clients.aclose()
+        await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Syncs Open Banking transactions for all connected users.")
+    parser.add_argument("--new-run", action="store_true", help="Start a new run instead of resuming an unfinished one.")
+    parser.add_argument("--limit", type=int, default=None, help="Only include the N stalest users in a new run.")
+    parser.add_argument("--concurrency", type=int, default=None, help="Users synced at once.")
+    args = parser.parse_args()
+    asyncio.run(_main(args.new_run, args.limit, args.concurrency))
@@ -1,12 +1,17 @@
+import asyncio
+import random
 import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from decimal import Decimal
 from datetime import datetime
 
 from src.app.config import settings
-from src.infra.persistence.models import User, Transaction as TransactionModel
+from src.infra.gateways.http_clients import http_clients
+from src.infra.persistence.models import OpenBankingSyncCursor, User
+from src.infra.persistence.repositories import sync_cursor_repository, transaction_repository
 
 
 async def connect_bank_account_to_user(user_id: str, bank_id: str) -> Dict[str, Any]:
@@ -20,91 +25,178 @@ async def connect_bank_account_to_user(user_id: str, bank_id: str) -> Dict[str,
     Returns:
         The response from the mock Open Banking provider.
     """
-    async with httpx.AsyncClient() as client:
+    client = http_clients.get("open_banking")
+    try:
+        response = await client.post(
+            "/conectar-conta",
+            json={"id_usuario": user_id, "id_banco": bank_id},
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Error connecting to the Open Banking service: {e}",
+        )
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f"Error from Open Banking service: {e.response.text}",
+        )
+
+
+def _account_id(account: Dict[str, Any]) -> Optional[str]:
+    # The provider returns `account_id`; `id_conta` is the older field name.
+    return account.get("account_id") or account.get("id_conta")
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, httpx.RequestError)
+
+
+def _describe_error(exc: BaseException) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"HTTP {exc.response.status_code}: {exc.response.text[:200]}"
+    return f"{exc.__class__.__name__}: {exc}"
+
+
+async def _get_page(
+    client: httpx.AsyncClient, url: str, params: Dict[str, str], semaphore: asyncio.Semaphore
+) -> Any:
+    """
+    GETs one page, retrying connection errors, 429 and 5xx responses with full-jitter
+    exponential backoff. The semaphore is held only while a request is in flight.
+    """
+    retries = settings.open_banking_fetch_retries
+    for attempt in range(retries + 1):
         try:
-            response = await client.post(
-                f"{settings.OPEN_BANKING_MOCK_URL}/conectar-conta",
-                json={"id_usuario": user_id, "id_banco": bank_id},
-            )
+            async with semaphore:
+                response = await client.get(url, params=params)
             response.raise_for_status()
             return response.json()
-        except httpx.RequestError as e:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Error connecting to the Open Banking service: {e}",
-            )
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Error from Open Banking service: {e.response.text}",
-            )
-
-
-async def synchronize_transactions_for_user(db: Session, user: User) -> dict:
+        except (httpx.RequestError, httpx.HTTPStatusError) as e:
+            if attempt == retries or not _is_retryable(e):
+                raise
+        delay = min(settings.open_banking_retry_max_delay, settings.open_banking_retry_base_delay * 2 ** attempt)
+        await asyncio.sleep(random.uniform(0, delay))
+
+
+async def _fetch_account_transactions(
+    client: httpx.AsyncClient, account_id: str, semaphore: asyncio.Semaphore, params: Optional[Dict[str, str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetches an account's transactions page by page, following `next_cursor`. A provider that
+    answers with a plain list is treated as a single page.
+    """
+    url = f"/accounts/{account_id}/transactions"
+    page_params = {**(params or {}), "limit": str(settings.open_banking_page_size)}
+    transactions: List[Dict[str, Any]] = []
+    while True:
+        page = await _get_page(client, url, page_params, semaphore)
+        if isinstance(page, list):
+            return transactions + page
+        transactions.extend(page["transactions"])
+        if not page.get("next_cursor"):
+            return transactions
+        page_params["cursor"] = page["next_cursor"]
+
+
+def _since_params(cursor: Optional[OpenBankingSyncCursor]) -> Optional[Dict[str, str]]:
+    # `since` is inclusive: transactions booked later on the cursor's last day are fetched
+    # again and dropped by the upsert.
+    if cursor is None or cursor.last_transaction_date is None:
+        return None
+    return {"since": cursor.last_transaction_date.isoformat()}
+
+
+def _to_transaction_row(transaction: Dict[str, Any], account: Dict[str, Any], user_id: int) -> Dict[str, Any]:
+    external_id = transaction.get("transaction_id")
+    return {
+        "description": transaction['description'],
+        "amount": Decimal(str(transaction['amount'])),
+        "category": transaction.get('category'),
+        "transaction_date": datetime.strptime(transaction['transaction_date'], '%Y-%m-%d').date(),
+        "user_id": user_id,
+        "source": f"{account.get('id_banco') or 'OPEN_BANKING'}_SYNC",
+        "external_id": str(external_id) if external_id is not None else None,
+    }
+
+
+def _advance_cursor(
+    db: Session, user_id: int, account_id: str, rows: List[Dict[str, Any]], cursor: Optional[OpenBankingSyncCursor]
+) -> None:
+    if not rows:
+        return
+    newest = max(rows, key=lambda row: row["transaction_date"])
+    if cursor is not None and cursor.last_transaction_date and cursor.last_transaction_date > newest["transaction_date"]:
+        return
+    sync_cursor_repository.save_cursor(
+        db, user_id, account_id, newest["transaction_date"], newest["external_id"], cursor
+    )
+
+
+async def synchronize_transactions_for_user(db: AsyncSession, user: User) -> dict:
     """
     Sincroniza as transações do usuário a partir do mock do Open Banking.
+
+    Account transactions are fetched concurrently (bounded by `open_banking_sync_concurrency`);
+    accounts that still fail after retries are listed in `failed_accounts` and the rest are kept.
+    Each account is fetched from its sync cursor onwards and rows are upserted on the provider's
+    transaction id, so `transactions_synced` counts only new rows. The attempt is recorded for the
+    batch scheduler even when nothing new came back.
     """
-    async with httpx.AsyncClient() as client:
-        try:
-            # First, get all connected accounts for the user
-            accounts_response = await client.get(
-                f"{settings.OPEN_BANKING_MOCK_URL}/accounts",
-                params={"id_usuario": str(user.id)}
-            )
-            accounts_response.raise_for_status()
-            accounts = accounts_response.json()
-        except httpx.RequestError as e:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Error connecting to the Open Banking service: {e}"
-            )
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Error from Open Banking service: {e.response.text}"
-            )
-
-        all_transactions: List[Dict[str, Any]] = []
-        for account in accounts:
-            account_id = account.get("id_conta")
-            if not account_id:
-                continue
-
-            try:
-                # Then, fetch transactions for each account
-                transactions_response = await client.get(
-                    f"{settings.OPEN_BANKING_MOCK_URL}/accounts/{account_id}/transactions"
-                )
-                transactions_response.raise_for_status()
-                transactions = transactions_response.json()
-                
-                for trans in transactions:
-                    trans['id_banco'] = account.get('id_banco')
-
-                all_transactions.extend(transactions)
-            except httpx.RequestError as e:
-                # Log the error but continue, to allow for partial data processing
-                print(f"Warning: Could not fetch transactions for account {account_id}: {e}")
-                continue
-            except httpx.HTTPStatusError as e:
-                # Log the error but continue
-                print(f"Warning: The Open Banking service returned an error for account {account_id}: {e.response.text}")
-                continue
-        
-        for transaction in all_transactions:
-            db_transaction = TransactionModel(
-                description=transaction['description'],
-                amount=Decimal(transaction['amount']),
-                category=transaction['category'],
-                transaction_date=datetime.strptime(transaction['transaction_date'], '%Y-%m-%d').date(),
-                user_id=user.id,
-                source=f"{transaction['id_banco']}_SYNC"
-            )
-            db.add(db_transaction)
-        
-        db.commit()
-        
-        return {
-            "message": "Sincronização de transações concluída.",
-            "transactions_synced": len(all_transactions)
-        }
\ No newline at end of file
+    client = http_clients.get("open_banking")
+    try:
+        # First, get all connected accounts for the user
+        accounts_response = await client.get(
+            "/accounts",
+            params={"id_usuario": str(user.id)}
+        )
+        accounts_response.raise_for_status()
+        accounts = accounts_response.json()
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Error connecting to the Open Banking service: {e}"
+        )
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f"Error from Open Banking service: {e.response.text}"
+        )
+
+    cursors = await db.run_sync(sync_cursor_repository.get_cursors, user.id)
+    semaphore = asyncio.Semaphore(settings.open_banking_sync_concurrency)
+    fetchable = [(account, _account_id(account)) for account in accounts]
+    fetchable = [(account, str(account_id)) for account, account_id in fetchable if account_id]
+    results = await asyncio.gather(
+        *(
+            _fetch_account_transactions(client, account_id, semaphore, _since_params(cursors.get(account_id)))
+            for _, account_id in fetchable
+        ),
+        return_exceptions=True,
+    )
+
+    all_transactions: List[Dict[str, Any]] = []
+    failed_accounts: List[Dict[str, Any]] = []
+    for (account, account_id), result in zip(fetchable, results):
+        if isinstance(result, BaseException):
+            failed_accounts.append({"account_id": account_id, "error": _describe_error(result)})
+            continue
+        rows = [_to_transaction_row(trans, account, user.id) for trans in result]
+        all_transactions.extend(rows)
+        await db.run_sync(_advance_cursor, user.id, account_id, rows, cursors.get(account_id))
+
+    inserted = await db.run_sync(transaction_repository.upsert_transactions, all_transactions)
+    await db.run_sync(sync_cursor_repository.record_sync_attempt, user.id)
+    await db.commit()
+
+    return {
+        "message": "Sincronização de transações concluída.",
+        "transactions_synced": inserted,
+        "transactions_received": len(all_transactions),
+        "accounts_synced": len(fetchable) - len(failed_accounts),
+        "failed_accounts": failed_accounts,
+    }
\ No newline at end of file
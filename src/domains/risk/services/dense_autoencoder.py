@@ -0,0 +1,53 @@
+import json
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+ACTIVATIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+    "tanh": np.tanh,
+    "elu": lambda x: np.where(x > 0, x, np.expm1(x)),
+}
+
+
+class DenseAutoencoder:
+    """
+    Pure NumPy forward pass for a stack of Dense layers, as exported by
+    tools/scripts/export_autoencoder_weights.py.
+
+    The .npz holds `kernel_<i>` / `bias_<i>` arrays and a JSON `activations` list. Computation runs
+    in the stored dtype (float32 for Keras exports) so results match `Model.predict`.
+    `predict` mirrors the Keras signature so the two backends are interchangeable.
+    """
+
+    def __init__(self, layers: List[Tuple[np.ndarray, np.ndarray, str]]):
+        unknown = {activation for _, _, activation in layers} - ACTIVATIONS.keys()
+        if unknown:
+            raise ValueError(f"Unsupported activations in autoencoder export: {sorted(unknown)}")
+        self.layers = layers
+        self.dtype = layers[0][0].dtype if layers else np.float32
+
+    @classmethod
+    def from_npz(cls, path: str) -> "DenseAutoencoder":
+        with np.load(path, allow_pickle=False) as data:
+            activations = json.loads(str(data["activations"]))
+            layers = [
+                (data[f"kernel_{i}"], data[f"bias_{i}"], activation)
+                for i, activation in enumerate(activations)
+            ]
+        return cls(layers)
+
+    def save_npz(self, path: str) -> None:
+        arrays: Dict[str, np.ndarray] = {"activations": np.array(json.dumps([a for _, _, a in self.layers]))}
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    def predict(self, X: np.ndarray, verbose: int = 0) -> np.ndarray:
+        output = np.asarray(X, dtype=self.dtype)
+        for kernel, bias, activation in self.layers:
+            output = ACTIVATIONS[activation](output @ kernel + bias)
+        return output
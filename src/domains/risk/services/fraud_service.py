@@ -1,20 +1,296 @@
-import joblib
-import os
+import datetime
 import numpy as np
-import pandas as pd
-import tensorflow as tf
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
-_model_path = os.path.join(os.path.dirname(__file__), '..', 'models')
-_model_path = os.path.abspath(os.path.join("src", "domains/risk/models"))
-_if_model = joblib.load(os.path.join(_model_path, 'fraud_model_v1.pkl'))
-_scaler = joblib.load(os.path.join(_model_path, 'scaler.pkl'))
-_autoencoder = tf.keras.models.load_model(os.path.join(_model_path, 'autoencoder_v1.keras'))
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-async def analyze_for_fraud(transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+from src.domains.risk.services.inference_pool import get_inference_pool
+from src.domains.risk.services.model_registry import model_registry
+from src.infra.persistence.repositories import fraud_baseline_repository
+
+HIGH_RISK_THRESHOLD = 0.7
+DEFAULT_HOUR = 12
+REFERENCE_SAMPLE_SIZE = 10_000
+TIMESTAMP_COLUMNS = ('timestamp', 'transaction_date', 'date', 'created_at')
+
+
+# Points of the quantile sketch kept per score: the 0th, 1st, ..., 100th percentile.
+SKETCH_QUANTILES = np.linspace(0.0, 1.0, 101)
+# Scores are normalised between these quantiles, so a few outliers cannot stretch the range.
+NORMALISATION_QUANTILES = (0.01, 0.99)
+
+
+def _cdf(x: np.ndarray, points: np.ndarray) -> np.ndarray:
+    # Sorted points read as evenly spaced quantiles, linear in between.
+    if points.size == 1:
+        return (x >= points[0]).astype(np.float64)
+    return np.interp(x, points, np.linspace(0.0, 1.0, points.size))
+
+
+def _merge_sketch(sketch: Optional[List[float]], sketch_count: int, values: np.ndarray) -> List[float]:
+    """
+    Folds `values` into a quantile sketch summarising `sketch_count` earlier values: the
+    count-weighted mix of both distributions is read back at SKETCH_QUANTILES.
+    """
+    parts = [(np.sort(values), values.size)]
+    if sketch:
+        parts.append((np.asarray(sketch, dtype=np.float64), sketch_count))
+    grid = np.unique(np.concatenate([points for points, _ in parts]))
+    cdf = sum(count * _cdf(grid, points) for points, count in parts) / sum(count for _, count in parts)
+    return np.interp(SKETCH_QUANTILES, cdf, grid).tolist()
+
+
+def _bounds(sketch: Optional[List[float]], low: Optional[float], high: Optional[float]) -> Tuple[float, float]:
+    if not sketch:
+        return low, high
+    lower, upper = np.interp(NORMALISATION_QUANTILES, SKETCH_QUANTILES, sketch)
+    return float(lower), float(upper)
+
+
+@dataclass
+class ScoreBaseline:
+    """
+    Running distribution of the raw IsolationForest and reconstruction-error scores seen for a
+    user. Normalising against it, instead of against the current batch, keeps risk scores
+    comparable across analyses and lets new transactions be scored on their own.
+
+    The min/max are exact; the sketches are percentile summaries that normalisation reads its
+    NORMALISATION_QUANTILES bounds from. Baselines stored before the sketches existed fall back
+    to min/max until their next merge.
+    """
+    scored_transactions: int = 0
+    if_score_min: Optional[float] = None
+    if_score_max: Optional[float] = None
+    mse_min: Optional[float] = None
+    mse_max: Optional[float] = None
+    if_score_sketch: Optional[List[float]] = None
+    mse_sketch: Optional[List[float]] = None
+
+    def merged(self, if_scores: np.ndarray, mse: np.ndarray) -> "ScoreBaseline":
+        def low(current: Optional[float], values: np.ndarray) -> float:
+            return float(values.min()) if current is None else min(current, float(values.min()))
+
+        def high(current: Optional[float], values: np.ndarray) -> float:
+            return float(values.max()) if current is None else max(current, float(values.max()))
+
+        def sketch(current: Optional[List[float]], values: np.ndarray) -> List[float]:
+            return _merge_sketch(current, self.scored_transactions if current else 0, values)
+
+        return ScoreBaseline(
+            scored_transactions=self.scored_transactions + int(if_scores.size),
+            if_score_min=low(self.if_score_min, if_scores),
+            if_score_max=high(self.if_score_max, if_scores),
+            mse_min=low(self.mse_min, mse),
+            mse_max=high(self.mse_max, mse),
+            if_score_sketch=sketch(self.if_score_sketch, if_scores),
+            mse_sketch=sketch(self.mse_sketch, mse),
+        )
+
+    def if_score_bounds(self) -> Tuple[float, float]:
+        return _bounds(self.if_score_sketch, self.if_score_min, self.if_score_max)
+
+    def mse_bounds(self) -> Tuple[float, float]:
+        return _bounds(self.mse_sketch, self.mse_min, self.mse_max)
+
+
+@dataclass
+class FraudScores:
+    """
+    Result of columnar scoring. `indices` point into the input arrays and, together with
+    `scores`, only cover the high-risk rows, ordered from riskiest to least risky.
+    """
+    indices: np.ndarray
+    scores: np.ndarray
+    highest_risk_score: float
+    transactions_above_threshold: int
+    valid_transactions: int
+    model_version: str
+    baseline: Optional[ScoreBaseline] = None
+
+
+def _min_max(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    value_range = high - low
+    if value_range == 0:
+        return np.zeros_like(values)
+    return (values - low) / value_range
+
+
+def model_label(model_version: Optional[str]) -> str:
+    return f"ensemble_{model_version or model_registry.default_version}"
+
+
+def _model_scores(models: Any, amounts: np.ndarray, hours: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    X = np.column_stack((amounts, np.where(np.isnan(hours), DEFAULT_HOUR, hours)))
+    X_scaled = models.scaler.transform(X)
+
+    if_scores = models.isolation_forest.score_samples(X_scaled)
+    reconstructed_data = models.autoencoder.predict(X_scaled, verbose=0)
+    mse = np.mean(np.power(X_scaled - reconstructed_data, 2), axis=1)
+    return if_scores, mse
+
+
+def risk_from_raw_scores(if_scores: np.ndarray, mse: np.ndarray, baseline: ScoreBaseline) -> np.ndarray:
+    """
+    Combines raw model scores into 0..1 risk scores normalised against `baseline`.
+    Values outside the baseline bounds are clipped.
+    """
+    if_risk_scores = 1 - _min_max(if_scores, *baseline.if_score_bounds())
+    ae_risk_scores = _min_max(mse, *baseline.mse_bounds())
+    return np.clip((if_risk_scores * 0.5) + (ae_risk_scores * 0.5), 0.0, 1.0)
+
+
+def raw_scores(
+    amounts: np.ndarray, hours: np.ndarray, model_version: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the raw IsolationForest scores and reconstruction errors for every row,
+    with NaN for rows whose amount is NaN.
+    """
+    models = model_registry.get(model_version)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    hours = np.asarray(hours, dtype=np.float64)
+    if_scores = np.full(amounts.shape, np.nan)
+    mse = np.full(amounts.shape, np.nan)
+    valid = ~np.isnan(amounts)
+    if valid.any():
+        if_scores[valid], mse[valid] = _model_scores(models, amounts[valid], hours[valid])
+    return if_scores, mse
+
+
+@lru_cache(maxsize=None)
+def reference_baseline(model_version: Optional[str] = None) -> ScoreBaseline:
+    """
+    Baseline for users without history: raw score distribution over a fixed sample drawn from
+    the distribution the scaler was fitted on.
+    """
+    models = model_registry.get(model_version)
+    rng = np.random.default_rng(0)
+    sample = rng.normal(models.scaler.mean_, models.scaler.scale_, size=(REFERENCE_SAMPLE_SIZE, 2))
+    if_scores, mse = _model_scores(models, sample[:, 0], np.clip(np.round(sample[:, 1]), 0, 23))
+    return ScoreBaseline().merged(if_scores, mse)
+
+
+def score_features(
+    amounts: np.ndarray,
+    hours: np.ndarray,
+    threshold: float = HIGH_RISK_THRESHOLD,
+    model_version: Optional[str] = None,
+    baseline: Optional[ScoreBaseline] = None,
+) -> FraudScores:
+    """
+    Scores transactions given as two aligned columns: amount and hour of day.
+    Rows with a NaN amount are skipped; NaN hours default to midday.
+
+    Scores are normalised against `baseline` extended with this batch (just the batch when no
+    baseline is given); the extended baseline is returned for the caller to persist.
+    """
+    models = model_registry.get(model_version)
+    amounts = np.asarray(amounts, dtype=np.float64)
+    hours = np.asarray(hours, dtype=np.float64)
+    valid = ~np.isnan(amounts)
+    valid_indices = np.flatnonzero(valid)
+    if valid_indices.size == 0:
+        empty = np.empty(0)
+        return FraudScores(empty.astype(np.int64), empty, 0.0, 0, 0, models.model_version, baseline)
+
+    if_scores, mse = _model_scores(models, amounts[valid], hours[valid])
+    baseline = (baseline or ScoreBaseline()).merged(if_scores, mse)
+    final_risk_scores = risk_from_raw_scores(if_scores, mse, baseline)
+
+    above = np.flatnonzero(final_risk_scores > threshold)
+    above = above[np.argsort(-final_risk_scores[above], kind="stable")]
+    return FraudScores(
+        indices=valid_indices[above],
+        scores=final_risk_scores[above],
+        highest_risk_score=float(final_risk_scores.max()),
+        transactions_above_threshold=int(above.size),
+        valid_transactions=int(valid_indices.size),
+        model_version=models.model_version,
+        baseline=baseline,
+    )
+
+
+def score_columnar(
+    data: Any, threshold: float = HIGH_RISK_THRESHOLD, model_version: Optional[str] = None
+) -> FraudScores:
+    """
+    Scores a NumPy structured array or an Arrow table / record batch with an `amount`
+    column and an `hour` (or `time_of_day`) column.
+    """
+    names = data.dtype.names if isinstance(data, np.ndarray) else getattr(data, "column_names", None)
+    if not names or "amount" not in names:
+        raise ValueError("Columnar input must provide an 'amount' column.")
+    hour_column = next((name for name in ("hour", "time_of_day") if name in names), None)
+
+    def column(name: str) -> np.ndarray:
+        if isinstance(data, np.ndarray):
+            return np.asarray(data[name], dtype=np.float64)
+        return np.asarray(data.column(name).to_numpy(zero_copy_only=False), dtype=np.float64)
+
+    amounts = column("amount")
+    hours = column(hour_column) if hour_column else np.full(amounts.shape, DEFAULT_HOUR, dtype=np.float64)
+    return score_features(amounts, hours, threshold=threshold, model_version=model_version)
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def to_hour(value: Any) -> float:
+    if isinstance(value, datetime.datetime):
+        return value.hour
+    if isinstance(value, datetime.date):
+        return 0
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.fromisoformat(value.strip()).hour
+        except ValueError:
+            return np.nan
+    return np.nan
+
+
+def _serializable(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def load_baseline(db: Session, user_id: int, label: str, for_update: bool = False) -> Optional[ScoreBaseline]:
+    """
+    The user's persisted baseline, or None if nothing has been scored yet. With `for_update` the
+    row stays locked until the transaction ends, for callers that write a merged baseline back.
+    """
+    if for_update:
+        db_baseline = fraud_baseline_repository.lock_baseline(db, user_id, label)
+    else:
+        db_baseline = fraud_baseline_repository.get_baseline(db, user_id, label)
+    if not db_baseline or not db_baseline.scored_transactions:
+        return None
+    return ScoreBaseline(
+        **{field: getattr(db_baseline, field) for field in fraud_baseline_repository.BASELINE_FIELDS}
+    )
+
+
+async def analyze_for_fraud(
+    transactions: List[Dict[str, Any]],
+    model_version: Optional[str] = None,
+    db: Optional[AsyncSession] = None,
+    user_id: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Analyzes a list of financial transactions for fraudulent activity using an ensemble of
     Isolation Forest and an Autoencoder.
+
+    When `db` and `user_id` are given, scores are normalised against the user's persisted
+    baseline, which is then extended with this batch (flushed, not committed). The baseline row
+    is locked from the read until the caller commits, so concurrent analyses for the same user
+    merge in turn rather than the last writer dropping the other's batch.
     """
     if not transactions:
         return {
@@ -22,61 +298,51 @@ async def analyze_for_fraud(transactions: List[Dict[str, Any]]) -> Dict[str, Any
             "highest_risk_score": 0.0,
             "transactions_above_threshold": 0,
             "riskiest_transactions": [],
-            "model_version": "ensemble_v1"
+            "model_version": model_label(model_version)
         }
 
-    df = pd.DataFrame(transactions)
-    df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
-    
-    timestamp_col = None
-    for col in ['timestamp', 'transaction_date', 'date', 'created_at']:
-        if col in df.columns:
-            timestamp_col = col
-            break
-    
+    timestamp_col: Optional[str] = next((col for col in TIMESTAMP_COLUMNS if col in transactions[0]), None)
+    amounts = np.fromiter((_to_float(t.get('amount')) for t in transactions), dtype=np.float64, count=len(transactions))
     if timestamp_col:
-        try:
-            df['time_of_day'] = pd.to_datetime(df[timestamp_col], errors='coerce').dt.hour
-        except:
-            df['time_of_day'] = 12
+        hours = np.fromiter((to_hour(t.get(timestamp_col)) for t in transactions), dtype=np.float64, count=len(transactions))
     else:
-        df['time_of_day'] = 12
-    
-    df['time_of_day'] = df['time_of_day'].fillna(12)
-    df = df.dropna(subset=['amount'])
+        hours = np.full(len(transactions), DEFAULT_HOUR, dtype=np.float64)
 
-    if df.empty:
+    use_baseline = db is not None and user_id is not None
+    baseline = (
+        await db.run_sync(load_baseline, user_id, model_label(model_version), True) if use_baseline else None
+    )
+
+    scores = await get_inference_pool().run(
+        score_features, amounts, hours, HIGH_RISK_THRESHOLD, model_version, baseline
+    )
+    if use_baseline and scores.valid_transactions:
+        await db.run_sync(
+            fraud_baseline_repository.save_baseline, user_id, scores.model_version, vars(scores.baseline)
+        )
+    if scores.valid_transactions == 0:
         return {
             "fraud_detected": False,
             "highest_risk_score": 0.0,
             "transactions_above_threshold": 0,
             "riskiest_transactions": [],
-            "model_version": "ensemble_v1",
+            "model_version": scores.model_version,
             "warning": "No valid transactions after data cleaning"
         }
 
-    X = df[['amount', 'time_of_day']]
-
-    X_scaled = _scaler.transform(X)
-
-    if_scores = _if_model.score_samples(X_scaled)
-    if_risk_scores = 1 - (if_scores - if_scores.min()) / (if_scores.max() - if_scores.min())
-
-    reconstructed_data = _autoencoder.predict(X_scaled, verbose=0)
-    mse = np.mean(np.power(X_scaled - reconstructed_data, 2), axis=1)
-    ae_risk_scores = (mse - mse.min()) / (mse.max() - mse.min())
-
-    final_risk_scores = (if_risk_scores * 0.5) + (ae_risk_scores * 0.5)
-
-    df['risk_score'] = final_risk_scores
-    high_risk_threshold = 0.7
-    riskiest_transactions = df[df['risk_score'] > high_risk_threshold].sort_values(by='risk_score', ascending=False)
+    riskiest_transactions = []
+    for index, risk_score in zip(scores.indices.tolist(), scores.scores.tolist()):
+        record = {key: _serializable(value) for key, value in transactions[index].items()}
+        record['amount'] = float(amounts[index])
+        record['time_of_day'] = float(DEFAULT_HOUR if np.isnan(hours[index]) else hours[index])
+        record['risk_score'] = risk_score
+        riskiest_transactions.append(record)
 
     return {
-        "fraud_detected": any(df['risk_score'] > high_risk_threshold),
-        "highest_risk_score": float(df['risk_score'].max()),
-        "transactions_above_threshold": len(riskiest_transactions),
-        "riskiest_transactions": riskiest_transactions.to_dict(orient='records'),
-        "model_version": "ensemble_v1",
+        "fraud_detected": scores.transactions_above_threshold > 0,
+        "highest_risk_score": scores.highest_risk_score,
+        "transactions_above_threshold": scores.transactions_above_threshold,
+        "riskiest_transactions": riskiest_transactions,
+        "model_version": scores.model_version,
         "timestamp_column_used": timestamp_col or "none (default hour used)"
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.app.config import settings
+from src.domains.exceptions import FraudInferenceOverloadedError
+from src.infra.observability.metrics import metrics
+
+
+def _preload_models() -> None:
+    # Process workers created after a warmed-up parent already share its models;
+    # this only loads them when the worker starts from a clean interpreter.
+    from src.domains.risk.services.model_registry import model_registry
+
+    model_registry.warmup()
+
+
+class InferencePool:
+    """
+    Runs CPU-bound model inference off the event loop.
+
+    `executor` is "thread", "process" or "inline" (run on the loop, for debugging).
+    At most `max_pending` calls are queued or running at once; further callers wait up to
+    `queue_timeout` seconds for a slot and then get FraudInferenceOverloadedError.
+    """
+
+    def __init__(self, executor: str, max_workers: int, max_pending: int, queue_timeout: float):
+        self.executor_kind = executor
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        self._queue_depth = metrics.gauge("fraud_inference_queue_depth")
+        self._in_flight = metrics.gauge("fraud_inference_in_flight")
+        self._rejected = metrics.counter("fraud_inference_rejected_total")
+        self._wait_ms = metrics.histogram("fraud_inference_queue_wait_ms")
+        self._latency_ms = metrics.histogram("fraud_inference_latency_ms")
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.executor_kind == "inline":
+            return None
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_preload_models)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="fraud-inference"
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        queued_at = time.perf_counter()
+        self._queue_depth.inc()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected.inc()
+            raise FraudInferenceOverloadedError("Fraud inference pool is saturated, please retry later.")
+        finally:
+            self._queue_depth.dec()
+
+        started_at = time.perf_counter()
+        self._wait_ms.observe((started_at - queued_at) * 1000)
+        self._in_flight.inc()
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return fn(*args)
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            self._in_flight.dec()
+            self._latency_ms.observe((time.perf_counter() - started_at) * 1000)
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool: Optional[InferencePool] = None
+
+
+def get_inference_pool() -> InferencePool:
+    global _pool
+    if _pool is None:
+        _pool = InferencePool(
+            executor=settings.fraud_inference_executor,
+            max_workers=settings.fraud_inference_workers,
+            max_pending=settings.fraud_inference_max_pending,
+            queue_timeout=settings.fraud_inference_queue_timeout,
+        )
+    return _pool
+
+
+def shutdown_inference_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
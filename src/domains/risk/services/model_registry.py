@@ -0,0 +1,116 @@
+import os
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional
+
+import joblib
+import numpy as np
+
+from src.app.config import settings
+from src.domains.risk.services.dense_autoencoder import DenseAutoencoder
+
+
+@dataclass
+class FraudModelBundle:
+    version: str
+    isolation_forest: Any
+    scaler: Any
+    autoencoder: Any
+
+    @property
+    def model_version(self) -> str:
+        return f"ensemble_{self.version}"
+
+
+class ModelRegistry:
+    """
+    Loads fraud model artifacts lazily, once per version, and keeps them for the life of the process.
+
+    Artifacts for version `vN` live in `base_path` as `fraud_model_vN.pkl`, `scaler_vN.pkl`
+    (falling back to the shared `scaler.pkl`) and either `autoencoder_vN.npz` (NumPy backend)
+    or `autoencoder_vN.keras` (Keras backend). Pickles are opened with
+    joblib's `mmap_mode`, so their arrays are backed by the page cache and shared between
+    processes; calling `warmup()` before forking workers shares everything else copy-on-write.
+    """
+
+    def __init__(
+        self,
+        base_path: str,
+        default_version: str,
+        mmap_mode: Optional[str] = "r",
+        autoencoder_backend: str = "numpy",
+    ):
+        self.base_path = base_path
+        self.default_version = default_version
+        self.mmap_mode = mmap_mode
+        self.autoencoder_backend = autoencoder_backend
+        self._bundles: Dict[str, FraudModelBundle] = {}
+        self._locks: Dict[str, Lock] = {}
+        self._registry_lock = Lock()
+
+    def _artifact(self, *names: str) -> str:
+        for name in names:
+            path = os.path.join(self.base_path, name)
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(f"None of {names} found in {self.base_path}")
+
+    def _load_autoencoder(self, version: str) -> Any:
+        if self.autoencoder_backend == "numpy":
+            return DenseAutoencoder.from_npz(self._artifact(f"autoencoder_{version}.npz"))
+
+        import tensorflow as tf
+
+        return tf.keras.models.load_model(self._artifact(f"autoencoder_{version}.keras"))
+
+    def _load(self, version: str) -> FraudModelBundle:
+        return FraudModelBundle(
+            version=version,
+            isolation_forest=joblib.load(self._artifact(f"fraud_model_{version}.pkl"), mmap_mode=self.mmap_mode),
+            scaler=joblib.load(self._artifact(f"scaler_{version}.pkl", "scaler.pkl"), mmap_mode=self.mmap_mode),
+            autoencoder=self._load_autoencoder(version),
+        )
+
+    def get(self, version: Optional[str] = None) -> FraudModelBundle:
+        version = version or self.default_version
+        bundle = self._bundles.get(version)
+        if bundle is not None:
+            return bundle
+
+        with self._registry_lock:
+            lock = self._locks.setdefault(version, Lock())
+        with lock:
+            bundle = self._bundles.get(version)
+            if bundle is None:
+                bundle = self._load(version)
+                self._bundles[version] = bundle
+        return bundle
+
+    def warmup(self, versions: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Loads the given versions (default: the configured one) and runs one prediction through
+        each model so lazy initialisation happens now rather than on the first request.
+        """
+        warmed = []
+        sample = np.zeros((1, 2))
+        for version in versions or [self.default_version]:
+            bundle = self.get(version)
+            scaled = bundle.scaler.transform(sample)
+            bundle.isolation_forest.score_samples(scaled)
+            bundle.autoencoder.predict(scaled, verbose=0)
+            warmed.append(version)
+        return warmed
+
+    def loaded_versions(self) -> List[str]:
+        return sorted(self._bundles)
+
+    def unload(self, version: str) -> None:
+        self._bundles.pop(version, None)
+
+
+model_registry = ModelRegistry(
+    base_path=os.path.abspath(settings.ml_model_path),
+    default_version=settings.fraud_model_version,
+    mmap_mode=settings.ml_model_mmap_mode or None,
+    autoencoder_backend=settings.fraud_autoencoder_backend,
+)
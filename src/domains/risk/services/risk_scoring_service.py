@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.config import settings
+from src.domains.risk.services import fraud_service
+from src.domains.risk.services.inference_pool import get_inference_pool
+from src.domains.risk.services.micro_batcher import MicroBatcher
+from src.infra.observability.metrics import metrics
+
+# LRU over (user, model) with a TTL; only touched from the event loop, so no lock.
+_baseline_cache: "OrderedDict[Tuple[int, str], Tuple[float, Optional[fraud_service.ScoreBaseline]]]" = OrderedDict()
+_batcher: Optional[MicroBatcher] = None
+_latency_ms = metrics.histogram("risk_score_latency_ms")
+
+
+async def _score_batch(items: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+    amounts = np.fromiter((amount for amount, _ in items), dtype=np.float64, count=len(items))
+    hours = np.fromiter((hour for _, hour in items), dtype=np.float64, count=len(items))
+    if_scores, mse = await get_inference_pool().run(fraud_service.raw_scores, amounts, hours)
+    return list(zip(if_scores.tolist(), mse.tolist()))
+
+
+def get_batcher() -> MicroBatcher:
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            _score_batch,
+            max_batch_size=settings.risk_microbatch_max_size,
+            max_wait_ms=settings.risk_microbatch_max_wait_ms,
+            name="risk_score_batch",
+        )
+    return _batcher
+
+
+async def _user_baseline(db: AsyncSession, user_id: int, label: str) -> Optional[fraud_service.ScoreBaseline]:
+    key = (user_id, label)
+    cached = _baseline_cache.get(key)
+    now = time.monotonic()
+    if cached and now - cached[0] < settings.risk_baseline_cache_ttl_seconds:
+        _baseline_cache.move_to_end(key)
+        return cached[1]
+    baseline = await db.run_sync(fraud_service.load_baseline, user_id, label)
+    _baseline_cache[key] = (now, baseline)
+    _baseline_cache.move_to_end(key)
+    while len(_baseline_cache) > settings.risk_baseline_cache_entries:
+        _baseline_cache.popitem(last=False)
+    return baseline
+
+
+async def score_transaction(
+    db: AsyncSession, user_id: int, amount: float, timestamp: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Scores one transaction in real time. Model inference is shared with concurrent requests
+    through the micro-batcher; the result is normalised against the user's persisted baseline,
+    or the model reference baseline for users without history.
+    """
+    started_at = time.perf_counter()
+    hour = fraud_service.to_hour(timestamp) if timestamp is not None else fraud_service.DEFAULT_HOUR
+    if_score, mse = await get_batcher().submit((float(amount), hour))
+
+    label = fraud_service.model_label(None)
+    baseline = await _user_baseline(db, user_id, label)
+    baseline_source = "user"
+    if baseline is None:
+        baseline = fraud_service.reference_baseline()
+        baseline_source = "reference"
+
+    risk_score = float(
+        fraud_service.risk_from_raw_scores(np.array([if_score]), np.array([mse]), baseline)[0]
+    )
+    _latency_ms.observe((time.perf_counter() - started_at) * 1000)
+    return {
+        "risk_score": risk_score,
+        "high_risk": risk_score > fraud_service.HIGH_RISK_THRESHOLD,
+        "threshold": fraud_service.HIGH_RISK_THRESHOLD,
+        "model_version": label,
+        "baseline": baseline_source,
+    }
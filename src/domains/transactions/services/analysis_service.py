@@ -1,29 +1,35 @@
 import asyncio
 import datetime
 from decimal import Decimal
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.app.config import settings
-from src.domains.exceptions import AnalysisGatewayError
+from src.domains.exceptions import AnalysisGatewayError, FraudInferenceOverloadedError
 from src.domains.insights.services import carbon_service, generative_ai_service
 from src.domains.risk.services import fraud_service
 from src.infra.blockchain import auditor_service
+from src.infra.gateways.http_clients import http_clients
 from src.infra.persistence import models
-from src.infra.persistence.repositories import analysis_repository
+from src.infra.persistence.repositories import analysis_repository, transaction_repository
 
 
-def create_transactions_in_db(db: Session, transactions_data: List[Dict[str, Any]], user: models.User):
+def create_transactions_in_db(
+    db: Session, transactions_data: List[Dict[str, Any]], user: models.User, commit: bool = True
+):
     for transaction_data in transactions_data:
         transaction_data["transaction_date"] = datetime.datetime.strptime(
             transaction_data["transaction_date"], "%Y-%m-%d"
         ).date()
         transaction_data["source"] = "CSV_UPLOAD"
-        db_transaction = models.Transaction(**transaction_data, owner=user)
-        db.add(db_transaction)
-    db.commit()
+    transaction_repository.bulk_insert_transactions(
+        db, ({**t, "user_id": user.id} for t in transactions_data)
+    )
+    if commit:
+        db.commit()
 
 
 def _convert_decimals_to_float(obj: Any):
@@ -53,10 +59,9 @@ def _normalize_transactions(transactions_data: List[Dict[str, Any]]) -> List[Dic
 async def _call_gateway(transactions_data: List[Dict[str, Any]]) -> Dict[str, Any]:
     try:
         payload = {"transactions": _normalize_transactions(transactions_data)}
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{settings.GATEWAY_API_URL}/process", json=payload, timeout=10.0)
-            response.raise_for_status()
-            return response.json()
+        response = await http_clients.get("gateway").post("/process", json=payload)
+        response.raise_for_status()
+        return response.json()
     except httpx.RequestError as exc:
         raise AnalysisGatewayError(f"An error occurred while requesting {exc.request.url!r}.")
 
@@ -80,40 +85,134 @@ def _build_report(
     return report
 
 
-async def run_comprehensive_analysis(
-    db: Session, transactions_data: List[Dict[str, Any]], user: models.User
-) -> models.FinancialAnalysis:
-    create_transactions_in_db(db, transactions_data, user)
-    total_transactions = len(transactions_data)
-    total_amount = sum(float(t["amount"]) for t in transactions_data)
+def _result_or_error(result: Any) -> Dict[str, Any]:
+    return result if not isinstance(result, Exception) else {"error": str(result)}
+
+
+def _merge_fraud_results(merged: Optional[Dict[str, Any]], result: Dict[str, Any]) -> Dict[str, Any]:
+    limit = settings.analysis_riskiest_transactions_limit
+    if merged is None or ("warning" in merged and "warning" not in result and "error" not in result):
+        merged = dict(result)
+        merged["riskiest_transactions"] = list(result.get("riskiest_transactions", []))[:limit]
+        return merged
+    if "error" in merged or "warning" in result:
+        return merged
+    if "error" in result:
+        return result
+
+    riskiest = merged["riskiest_transactions"] + list(result.get("riskiest_transactions", []))
+    riskiest.sort(key=lambda t: t.get("risk_score", 0.0), reverse=True)
+    merged["fraud_detected"] = bool(merged["fraud_detected"] or result["fraud_detected"])
+    merged["highest_risk_score"] = max(merged["highest_risk_score"], result["highest_risk_score"])
+    merged["transactions_above_threshold"] += result["transactions_above_threshold"]
+    merged["riskiest_transactions"] = riskiest[:limit]
+    return merged
+
 
+def _merge_carbon_results(merged: Optional[Dict[str, Any]], result: Dict[str, Any]) -> Dict[str, Any]:
+    if merged is None:
+        if "error" in result:
+            return result
+        return {**result, "breakdown_by_category": dict(result["breakdown_by_category"])}
+    if "error" in merged:
+        return merged
+    if "error" in result:
+        return result
+
+    merged["total_carbon_kg"] += result["total_carbon_kg"]
+    breakdown = merged["breakdown_by_category"]
+    for category, footprint in result["breakdown_by_category"].items():
+        breakdown[category] = breakdown.get(category, Decimal("0")) + footprint
+    return merged
+
+
+def _merge_gateway_results(merged: Optional[Dict[str, Any]], result: Dict[str, Any]) -> Dict[str, Any]:
+    if merged is None:
+        return dict(result)
+    if "error" in merged:
+        return merged
+    if "error" in result:
+        return result
+
+    for key, value in result.items():
+        current = merged.get(key)
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        if is_number and isinstance(current, (int, float)) and not isinstance(current, bool):
+            merged[key] = current + value
+        else:
+            merged[key] = value
+    return merged
+
+
+async def _analyze_batch(
+    db: AsyncSession, transactions_data: List[Dict[str, Any]], user: models.User
+) -> List[Dict[str, Any]]:
     tasks = [
-        fraud_service.analyze_for_fraud(transactions_data),
+        fraud_service.analyze_for_fraud(transactions_data, db=db, user_id=user.id),
         carbon_service.calculate_carbon_footprint(transactions_data),
         _call_gateway(transactions_data),
     ]
     results = await asyncio.gather(*tasks, return_exceptions=True)
+    for result in results:
+        if isinstance(result, FraudInferenceOverloadedError):
+            raise result
+    return [_result_or_error(result) for result in results]
+
+
+async def _single_batch(transactions_data: List[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+    if transactions_data:
+        yield transactions_data
+
 
-    fraud_results = results[0] if not isinstance(results[0], Exception) else {"error": str(results[0])}
-    carbon_results = results[1] if not isinstance(results[1], Exception) else {"error": str(results[1])}
-    gateway_result = results[2] if not isinstance(results[2], Exception) else {"error": str(results[2])}
+async def run_streaming_analysis(
+    db: AsyncSession, batches: AsyncIterator[List[Dict[str, Any]]], user: models.User
+) -> models.FinancialAnalysis:
+    """
+    Runs the CSV analysis pipeline over batches of rows as they are parsed, so only one batch
+    of transactions is held in memory at a time. Per-batch results are merged into a single report.
+    """
+    total_transactions = 0
+    total_amount = 0.0
+    fraud_results: Optional[Dict[str, Any]] = None
+    carbon_results: Optional[Dict[str, Any]] = None
+    gateway_result: Optional[Dict[str, Any]] = None
+
+    async for transactions_data in batches:
+        await db.run_sync(create_transactions_in_db, transactions_data, user, commit=False)
+        total_transactions += len(transactions_data)
+        total_amount += sum(float(t["amount"]) for t in transactions_data)
+
+        batch_fraud, batch_carbon, batch_gateway = await _analyze_batch(db, transactions_data, user)
+        fraud_results = _merge_fraud_results(fraud_results, batch_fraud)
+        carbon_results = _merge_carbon_results(carbon_results, batch_carbon)
+        gateway_result = _merge_gateway_results(gateway_result, batch_gateway)
+    await db.commit()
+
+    if fraud_results is None:
+        fraud_results, carbon_results, gateway_result = await _analyze_batch(db, [], user)
 
     final_report = _build_report(total_transactions, total_amount, fraud_results, carbon_results, gateway_result)
     final_report["generative_summary"] = await generative_ai_service.generate_personalized_report(
         user=user, analysis_data=final_report
     )
 
-    saved_analysis = analysis_repository.create_analysis(
-        db=db, user=user, analysis_data=final_report, analysis_type="CSV"
+    saved_analysis = await db.run_sync(
+        analysis_repository.create_analysis, user=user, analysis_data=final_report, analysis_type="CSV"
     )
     tx_hash = await auditor_service.commit_analysis_to_blockchain(analysis_data=final_report)
-    return analysis_repository.add_blockchain_hash_to_analysis(
-        db=db, analysis_id=saved_analysis.id, tx_hash=tx_hash
+    return await db.run_sync(
+        analysis_repository.add_blockchain_hash_to_analysis, analysis_id=saved_analysis.id, tx_hash=tx_hash
     )
 
 
-async def run_banking_analysis(db: Session, user: models.User) -> models.FinancialAnalysis:
-    transactions = analysis_repository.get_transactions_by_source_prefix(db, user.id, "_SYNC")
+async def run_comprehensive_analysis(
+    db: AsyncSession, transactions_data: List[Dict[str, Any]], user: models.User
+) -> models.FinancialAnalysis:
+    return await run_streaming_analysis(db=db, batches=_single_batch(transactions_data), user=user)
+
+
+async def run_banking_analysis(db: AsyncSession, user: models.User) -> models.FinancialAnalysis:
+    transactions = await db.run_sync(analysis_repository.get_transactions_by_source_prefix, user.id, "_SYNC")
     transactions_data = [
         {
             "id": t.id,
@@ -140,14 +239,12 @@ async def run_banking_analysis(db: Session, user: models.User) -> models.Financi
             }
             for t in transactions_data
         ]
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "http://reconciliation_middleware:18080/reconcile",
-                json={"transactions": cobol_ready_data},
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            reconciliation_summary = response.json()
+        response = await http_clients.get("reconciliation").post(
+            "/reconcile",
+            json={"transactions": cobol_ready_data},
+        )
+        response.raise_for_status()
+        reconciliation_summary = response.json()
     except httpx.RequestError as exc:
         reconciliation_summary = {"error": f"Failed to connect to reconciliation middleware: {exc}"}
     except Exception as e:
@@ -156,16 +253,7 @@ async def run_banking_analysis(db: Session, user: models.User) -> models.Financi
     total_transactions = len(transactions_data)
     total_amount = sum(float(t["amount"]) for t in transactions_data)
 
-    tasks = [
-        fraud_service.analyze_for_fraud(transactions_data),
-        carbon_service.calculate_carbon_footprint(transactions_data),
-        _call_gateway(transactions_data),
-    ]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    fraud_results = results[0] if not isinstance(results[0], Exception) else {"error": str(results[0])}
-    carbon_results = results[1] if not isinstance(results[1], Exception) else {"error": str(results[1])}
-    gateway_result = results[2] if not isinstance(results[2], Exception) else {"error": str(results[2])}
+    fraud_results, carbon_results, gateway_result = await _analyze_batch(db, transactions_data, user)
 
     final_report = _build_report(
         total_transactions,
@@ -179,18 +267,33 @@ async def run_banking_analysis(db: Session, user: models.User) -> models.Financi
         user=user, analysis_data=final_report
     )
 
-    saved_analysis = analysis_repository.create_analysis(
-        db=db, user=user, analysis_data=final_report, analysis_type="BANKING"
+    saved_analysis = await db.run_sync(
+        analysis_repository.create_analysis, user=user, analysis_data=final_report, analysis_type="BANKING"
     )
     tx_hash = await auditor_service.commit_analysis_to_blockchain(analysis_data=final_report)
-    return analysis_repository.add_blockchain_hash_to_analysis(
-        db=db, analysis_id=saved_analysis.id, tx_hash=tx_hash
+    return await db.run_sync(
+        analysis_repository.add_blockchain_hash_to_analysis, analysis_id=saved_analysis.id, tx_hash=tx_hash
     )
 
 
-def get_user_analysis_history(db: Session, user_id: int) -> List[models.FinancialAnalysis]:
-    return analysis_repository.get_analyses_by_user_id(db=db, user_id=user_id)
+async def get_user_analysis_history(
+    db: AsyncSession, user_id: int, include_results: bool = False
+) -> List[Dict[str, Any]]:
+    return await db.run_sync(
+        analysis_repository.get_analysis_history, user_id=user_id, include_results=include_results
+    )
+
 
+async def get_user_analysis(db: AsyncSession, user_id: int, analysis_id: int) -> Optional[models.FinancialAnalysis]:
+    return await db.run_sync(analysis_repository.get_analysis_for_user, user_id=user_id, analysis_id=analysis_id)
 
-def get_user_analysis_history_by_type(db: Session, user_id: int, analysis_type: str) -> List[models.FinancialAnalysis]:
-    return analysis_repository.get_analyses_by_user_and_type(db=db, user_id=user_id, analysis_type=analysis_type)
+
+async def get_user_analysis_history_by_type(
+    db: AsyncSession, user_id: int, analysis_type: str, include_results: bool = False
+) -> List[Dict[str, Any]]:
+    return await db.run_sync(
+        analysis_repository.get_analysis_history,
+        user_id=user_id,
+        analysis_type=analysis_type,
+        include_results=include_results,
+    )
@@ -0,0 +1,84 @@
+import codecs
+import csv
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import UploadFile
+
+from src.app.config import settings
+
+
+def _split_complete_records(buffer: str) -> tuple[List[str], str]:
+    """
+    Splits decoded text into complete CSV records and the trailing partial record.
+
+    A newline only terminates a record when it is outside a quoted field, so quote parity
+    is tracked per record ("" escapes keep the parity even). The buffer always starts at a
+    record boundary because the remainder is carried over to the next chunk.
+    """
+    records: List[str] = []
+    start = 0
+    scan = 0
+    in_quotes = False
+    while True:
+        newline = buffer.find("\n", scan)
+        if newline == -1:
+            break
+        if buffer.count('"', scan, newline) % 2:
+            in_quotes = not in_quotes
+        scan = newline + 1
+        if not in_quotes:
+            records.append(buffer[start:scan])
+            start = scan
+    return records, buffer[start:]
+
+
+async def iter_upload_rows(
+    upload: UploadFile, chunk_size: Optional[int] = None, encoding: str = "utf-8"
+) -> AsyncIterator[Dict[str, Optional[str]]]:
+    """
+    Reads a CSV upload in fixed-size chunks and yields one dict per row, like csv.DictReader,
+    without ever holding more than one chunk of the file in memory.
+    """
+    chunk_size = chunk_size or settings.csv_ingestion_chunk_size
+    decoder = codecs.getincrementaldecoder(encoding)()
+    fieldnames: Optional[List[str]] = None
+    pending = ""
+
+    while True:
+        chunk = await upload.read(chunk_size)
+        final = not chunk
+        pending += decoder.decode(chunk, final=final)
+        records, pending = _split_complete_records(pending)
+        if final and pending:
+            records.append(pending)
+            pending = ""
+
+        for row in csv.reader(records):
+            if not row:
+                continue
+            if fieldnames is None:
+                fieldnames = row
+                continue
+            values: List[Optional[str]] = list(row[: len(fieldnames)])
+            values.extend([None] * (len(fieldnames) - len(values)))
+            yield dict(zip(fieldnames, values))
+
+        if final:
+            break
+
+
+async def iter_upload_batches(
+    upload: UploadFile, batch_size: Optional[int] = None, chunk_size: Optional[int] = None
+) -> AsyncIterator[List[Dict[str, Optional[str]]]]:
+    """
+    Groups the rows of a CSV upload into lists of at most `batch_size` rows.
+    """
+    batch_size = batch_size or settings.csv_ingestion_batch_size
+    batch: List[Dict[str, Optional[str]]] = []
+    async for row in iter_upload_rows(upload, chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
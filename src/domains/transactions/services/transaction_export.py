@@ -0,0 +1,164 @@
+"""
+Streaming exports of a user's transactions as CSV, NDJSON or Parquet.
+
+Rows come from the database in batches through a server-side cursor and each batch is encoded
+and handed to the response before the next one is fetched, so memory stays at one batch however
+long the history is. Text formats can be gzip-compressed on the fly. Parquet needs the optional
+`pyarrow` package and writes one row group per batch.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Any, Iterable, Iterator, List, Optional
+
+from src.app.config import settings
+from src.infra.persistence.database import SessionLocal, apply_user_rls_context
+from src.infra.persistence.repositories import transaction_repository
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Parquet pages are already compressed; gzipping them again only costs CPU.
+GZIP_FORMATS = {"csv", "ndjson"}
+
+
+def _amount(value: Any) -> Any:
+    return float(value) if value is not None else None
+
+
+def csv_chunks(batches: Iterable[List[Any]]) -> Iterator[bytes]:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(transaction_repository.EXPORT_COLUMNS)
+    for batch in batches:
+        for tx_id, transaction_date, description, amount, category, source in batch:
+            writer.writerow([tx_id, transaction_date, description, _amount(amount), category, source])
+        yield output.getvalue().encode("utf-8")
+        output.seek(0)
+        output.truncate()
+    if output.tell():
+        yield output.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(batches: Iterable[List[Any]]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = []
+        for tx_id, transaction_date, description, amount, category, source in batch:
+            record = {
+                "id": tx_id,
+                "transaction_date": transaction_date.isoformat() if transaction_date else None,
+                "description": description,
+                "amount": _amount(amount),
+                "category": category,
+                "source": source,
+            }
+            lines.append(json.dumps(record, ensure_ascii=False))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file that buffers what the Parquet writer emits until it is drained. It reports
+    the absolute position, which the writer records as column chunk offsets in the footer.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def parquet_chunks(batches: Iterable[List[Any]]) -> Iterator[bytes]:
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("transaction_date", pa.date32()),
+            ("description", pa.string()),
+            ("amount", pa.decimal128(10, 2)),
+            ("category", pa.string()),
+            ("source", pa.string()),
+        ]
+    )
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    # Closing the writer appends the footer.
+    yield sink.drain()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: Optional[int] = None) -> Iterator[bytes]:
+    level = settings.transactions_export_gzip_level if level is None else level
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip: listed (or covered by "*") with a q-value
+    above zero. An unparsable q-value counts as a refusal.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+
+ENCODERS = {"csv": csv_chunks, "ndjson": ndjson_chunks, "parquet": parquet_chunks}
+
+
+def stream_user_transactions(user_id: int, export_format: str, gzip: bool = False) -> Iterator[bytes]:
+    """
+    Encoded export of the user's transactions, chunk by chunk. Uses its own session: the
+    response body is produced after the request's dependencies have been closed.
+    """
+    db = SessionLocal()
+    try:
+        apply_user_rls_context(db, user_id)
+        chunks = ENCODERS[export_format](transaction_repository.iter_export_batches(db, user_id))
+        yield from gzip_chunks(chunks) if gzip else chunks
+    finally:
+        db.close()
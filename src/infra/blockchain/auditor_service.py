@@ -1,8 +1,8 @@
-import httpx
 import json
 import numpy as np
 from typing import Dict, Any
 from src.domains.transactions.services.custom_json_encoder import CustomNumpyEncoder
+from src.infra.gateways.http_clients import http_clients
 
 async def commit_analysis_to_blockchain(analysis_data: Dict[str, Any]) -> str:
     """
@@ -44,12 +44,7 @@ async def commit_analysis_to_blockchain(analysis_data: Dict[str, Any]) -> str:
         # Fallback to a minimal valid JSON
         sanitized_data = {"data": "analysis_completed", "status": "success"}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "http://crypto_middleware:18081/secure-commit",
-            json=sanitized_data,
-            timeout=10.0
-        )
-        response.raise_for_status()
-        result = response.json()
-        return result.get("tx_hash", "0x0000000000000000000000000000000000000000")
\ No newline at end of file
+    response = await http_clients.get("crypto").post("/secure-commit", json=sanitized_data)
+    response.raise_for_status()
+    result = response.json()
+    return result.get("tx_hash", "0x0000000000000000000000000000000000000000")
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Application-lifetime HTTP clients for outbound service calls.
+
+Each upstream gets one pooled httpx.AsyncClient with its own base URL, timeout and keepalive
+limits, so repeated calls reuse connections instead of paying TCP/TLS setup every time. HTTP/2
+is negotiated when enabled and the optional `h2` package is installed. Upstreams with a
+configured rate limit throttle every request through a token bucket.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+
+from src.app.config import settings
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class Upstream:
+    base_url: str
+    timeout: float
+    rate_limit_per_second: float = 0.0
+
+
+def _upstreams() -> Dict[str, Upstream]:
+    return {
+        "gateway": Upstream(settings.GATEWAY_API_URL, settings.cpp_gateway_timeout),
+        "reconciliation": Upstream(settings.RECONCILIATION_MIDDLEWARE_URL, settings.reconciliation_middleware_timeout),
+        "crypto": Upstream(settings.CRYPTO_MIDDLEWARE_URL, settings.crypto_middleware_timeout),
+        "open_banking": Upstream(
+            settings.OPEN_BANKING_MOCK_URL, settings.open_banking_timeout, settings.open_banking_rate_limit_per_second
+        ),
+    }
+
+
+class TokenBucket:
+    """
+    Allows `rate` acquisitions per second on average, with bursts of up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class HttpClientRegistry:
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            upstream = _upstreams()[name]
+            event_hooks = {}
+            if upstream.rate_limit_per_second > 0:
+                bucket = TokenBucket(upstream.rate_limit_per_second)
+                event_hooks["request"] = [lambda request: bucket.acquire()]
+            client = httpx.AsyncClient(
+                base_url=upstream.base_url,
+                timeout=httpx.Timeout(upstream.timeout, connect=settings.http_client_connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.http_client_max_connections,
+                    max_keepalive_connections=settings.http_client_max_keepalive_connections,
+                    keepalive_expiry=settings.http_client_keepalive_expiry,
+                ),
+                http2=settings.http_client_http2 and HTTP2_AVAILABLE,
+                event_hooks=event_hooks,
+            )
+            self._clients[name] = client
+        return client
+
+    async def aclose(self, name: Optional[str] = None) -> None:
+        names = [name] if name else list(self._clients)
+        for client_name in names:
+            client = self._clients.pop(client_name, None)
+            if client is not None:
+                await client.aclose()
+
+
+http_clients = HttpClientRegistry()
@@ -1,35 +1,115 @@
+import hashlib
+import os
 import random
 import uuid
 from datetime import date, timedelta
+from typing import Dict, Iterator, Optional
 from .models import Account, Balance, Transaction
 
+# Número de transações por conta. Vazio = 5 a 20 por conta, como antes; use valores altos
+# (milhões) para testes de carga, já que as transações são geradas sob demanda.
+TRANSACTIONS_PER_ACCOUNT = os.getenv("MOCK_TRANSACTIONS_PER_ACCOUNT")
+HISTORY_DAYS = int(os.getenv("MOCK_HISTORY_DAYS", "90"))
+SEED = os.getenv("MOCK_SEED", "begriff")
+
+CATEGORIES = ["Groceries", "Salary", "Restaurant", "Online Shopping", "Utilities", "Transport", "Health", "Entertainment"]
+DESCRIPTIONS = ["Groceries", "Salary", "Restaurant", "Online Shopping", "Utilities"]
+
 MOCK_DB = {}
+# account_id -> user_id, para localizar a conta sem percorrer todos os usuários.
+ACCOUNT_INDEX: Dict[str, int] = {}
+
+
+def _digest(*parts, size: int = 8) -> bytes:
+    return hashlib.blake2b(":".join(str(p) for p in (SEED, *parts)).encode(), digest_size=size).digest()
+
+
+class TransactionFeed:
+    """
+    Histórico determinístico e preguiçoso de uma conta.
+
+    A transação `i` é derivada apenas de (conta, i), então qualquer posição é gerada em O(1)
+    sem materializar o histórico. As datas não decrescem com `i`, o que permite paginar por
+    índice e aplicar o filtro `since` com busca binária. Um feed de tamanho 0 é uma conta sem
+    transações: devolve páginas vazias.
+    """
+
+    def __init__(self, account_id: str, size: int, end_date: date, history_days: int):
+        if size < 0:
+            raise ValueError(f"O tamanho do feed não pode ser negativo: {size}")
+        self.account_id = account_id
+        self.size = size
+        self.end_date = end_date
+        self.history_days = history_days
+
+    def __len__(self) -> int:
+        return self.size
+
+    def date_at(self, index: int) -> date:
+        if not 0 <= index < self.size:
+            raise IndexError(f"Transação {index} fora do feed de {self.size}")
+        offset = self.history_days - (index * (self.history_days + 1)) // self.size
+        return self.end_date - timedelta(days=offset)
+
+    def get(self, index: int) -> Transaction:
+        rng = random.Random(int.from_bytes(_digest(self.account_id, index), "big"))
+        return Transaction(
+            transaction_id=uuid.UUID(bytes=_digest(self.account_id, index, "id", size=16)),
+            amount=round(rng.uniform(-1000, 1000), 2),
+            description=rng.choice(DESCRIPTIONS),
+            category=rng.choice(CATEGORIES),
+            transaction_date=self.date_at(index),
+        )
+
+    def first_index_since(self, since: Optional[date]) -> int:
+        low, high = 0, self.size
+        if since is None:
+            return low
+        while low < high:
+            middle = (low + high) // 2
+            if self.date_at(middle) < since:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def iter_from(self, start: int, limit: Optional[int] = None) -> Iterator[Transaction]:
+        stop = self.size if limit is None else min(self.size, start + limit)
+        for index in range(start, stop):
+            yield self.get(index)
+
+
+def _feed_size(account_id: str) -> int:
+    if TRANSACTIONS_PER_ACCOUNT:
+        return int(TRANSACTIONS_PER_ACCOUNT)
+    return random.Random(int.from_bytes(_digest(account_id, "size"), "big")).randint(5, 20)
+
 
 def get_or_create_user_data(user_id: int) -> dict:
     if user_id not in MOCK_DB:
+        rng = random.Random(int.from_bytes(_digest(user_id), "big"))
         MOCK_DB[user_id] = {
             "accounts": [
-                Account(type="CHECKING", balance=Balance(amount=random.uniform(1000, 5000), currency="BRL")),
-                Account(type="CREDIT_CARD", balance=Balance(amount=random.uniform(-500, -100), currency="BRL")),
+                Account(
+                    account_id=uuid.UUID(bytes=_digest(user_id, account_type, size=16)),
+                    type=account_type,
+                    balance=Balance(amount=rng.uniform(low, high), currency="BRL"),
+                )
+                for account_type, low, high in (("CHECKING", 1000, 5000), ("CREDIT_CARD", -500, -100))
             ],
             "transactions": {},
         }
         for account in MOCK_DB[user_id]["accounts"]:
-            MOCK_DB[user_id]["transactions"][account.account_id] = _generate_transactions_for_account()
+            account_id = str(account.account_id)
+            MOCK_DB[user_id]["transactions"][account_id] = TransactionFeed(
+                account_id, _feed_size(account_id), date.today(), HISTORY_DAYS
+            )
+            ACCOUNT_INDEX[account_id] = user_id
     return MOCK_DB[user_id]
 
-def _generate_transactions_for_account() -> list[Transaction]:
-    transactions = []
-    today = date.today()
-    categories = ["Groceries", "Salary", "Restaurant", "Online Shopping", "Utilities", "Transport", "Health", "Entertainment"]
-    for _ in range(random.randint(5, 20)):
-        transaction_date = today - timedelta(days=random.randint(0, 90))
-        transactions.append(
-            Transaction(
-                amount=random.uniform(-1000, 1000),
-                description=random.choice(["Groceries", "Salary", "Restaurant", "Online Shopping", "Utilities"]),
-                transaction_date=transaction_date,
-                category=random.choice(categories),
-            )
-        )
-    return transactions
+
+def get_feed(account_id: str) -> Optional[TransactionFeed]:
+    user_id = ACCOUNT_INDEX.get(account_id)
+    if user_id is None:
+        return None
+    return MOCK_DB[user_id]["transactions"].get(account_id)
@@ -1,12 +1,20 @@
 import os
-from fastapi import FastAPI, HTTPException, Query
+import base64
+import json
+from datetime import date
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Optional
 
 # Importa as funções do gerador de dados e os modelos
-from .data_generator import get_or_create_user_data
+from .data_generator import get_feed, get_or_create_user_data
 from .models import Account
 
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 10000
+
 app = FastAPI(
     title="Mock Open Banking Provider",
     description="Um servidor simulado que gera dados bancários dinâmicos por usuário.",
@@ -48,21 +56,53 @@ def get_accounts(id_usuario: str = Query(..., description="ID do usuário para b
         raise HTTPException(status_code=500, detail=f"Erro interno ao buscar contas: {e}")
 
 
+def _encode_cursor(index: int) -> str:
+    return base64.urlsafe_b64encode(str(index).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="cursor inválido.")
+
+
 @app.get("/accounts/{account_id}/transactions")
-def get_transactions(account_id: str):
+def get_transactions(
+    account_id: str,
+    request: Request,
+    since: Optional[date] = Query(None, description="Retorna apenas transações a partir desta data (inclusive)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco devolvido em next_cursor pela página anterior"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Tamanho da página"),
+    format: Optional[str] = Query(None, description="'ndjson' para streaming, uma transação por linha"),
+):
     """
-    Retorna as transações para uma conta específica.
-    Esta função agora busca em todos os usuários no MOCK_DB para encontrar a conta correspondente.
+    Retorna as transações para uma conta específica, em ordem de data.
+
+    - Sem `cursor` nem `limit`: a lista completa (formato original).
+    - Com `cursor` ou `limit`: uma página `{"transactions": [...], "next_cursor": ...}`.
+    - Com `format=ndjson` (ou `Accept: application/x-ndjson`): streaming NDJSON a partir do
+      cursor, limitado a `limit` quando informado, sem montar a resposta em memória.
     """
-    try:
-        # Acessa a MOCK_DB diretamente do data_generator
-        from .data_generator import MOCK_DB
-
-        for user_id, user_data in MOCK_DB.items():
-            if account_id in user_data.get("transactions", {}):
-                return user_data["transactions"][account_id]
-        
-        # Se o loop terminar e não encontrar, a conta não existe.
+    feed = get_feed(account_id)
+    if feed is None:
         raise HTTPException(status_code=404, detail="Conta não encontrada")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erro interno ao buscar transações: {e}")
\ No newline at end of file
+
+    start = feed.first_index_since(since)
+    if cursor is not None:
+        start = max(start, _decode_cursor(cursor))
+
+    if format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", ""):
+        lines = (json.dumps(jsonable_encoder(t)) + "\n" for t in feed.iter_from(start, limit))
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    if cursor is None and limit is None:
+        return list(feed.iter_from(start))
+
+    page_size = limit or DEFAULT_PAGE_SIZE
+    transactions = list(feed.iter_from(start, page_size))
+    next_index = start + len(transactions)
+    return {
+        "transactions": transactions,
+        "next_cursor": _encode_cursor(next_index) if next_index < len(feed) else None,
+    }
@@ -16,4 +16,5 @@ class Transaction(BaseModel):
     transaction_id: UUID = Field(default_factory=uuid.uuid4)
     amount: float
     description: str
+    category: str
     transaction_date: date
@@ -0,0 +1,121 @@
+import logging
+import time
+from typing import Any, Dict, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+from src.app.config import settings
+from src.infra.observability.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_KINDS = ("select", "insert", "update", "delete")
+MAX_LOGGED_STATEMENT_CHARS = 2000
+
+_statements_total = metrics.counter("db_statements_total")
+_slow_statements_total = metrics.counter("db_slow_statements_total")
+_statement_latency_ms = {
+    kind: metrics.histogram(f"db_{kind}_statement_latency_ms") for kind in (*STATEMENT_KINDS, "other")
+}
+_checkout_wait_ms = metrics.histogram("db_pool_checkout_wait_ms")
+_checkout_timeouts_total = metrics.counter("db_pool_checkout_timeouts_total")
+_connections_checked_out = metrics.gauge("db_pool_connections_checked_out")
+_connections_opened_total = metrics.counter("db_pool_connections_opened_total")
+
+_timed_pool_classes: Dict[Type[Pool], Type[Pool]] = {}
+
+
+def statement_kind(statement: str) -> str:
+    verb = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    return verb if verb in STATEMENT_KINDS else "other"
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """
+    Keeps the shape of the bound parameters (names or positions) and drops their values.
+    """
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: "?" for key in parameters}
+    if isinstance(parameters, (list, tuple)):
+        return ["?"] * len(parameters)
+    return "?"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("statement_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["statement_started_at"].pop()
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    kind = statement_kind(statement)
+    _statements_total.inc()
+    _statement_latency_ms[kind].observe(elapsed_ms)
+    if elapsed_ms >= settings.db_slow_query_ms:
+        _slow_statements_total.inc()
+        logger.warning(
+            "Slow %s statement (%.1f ms): %s params=%s",
+            kind,
+            elapsed_ms,
+            statement[:MAX_LOGGED_STATEMENT_CHARS],
+            redact_parameters(parameters, executemany),
+        )
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    started = exception_context.connection.info.get("statement_started_at") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def _on_connect(dbapi_connection, connection_record):
+    _connections_opened_total.inc()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    _connections_checked_out.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    _connections_checked_out.dec()
+
+
+def timed_pool_class(pool_class: Type[Pool]) -> Type[Pool]:
+    """
+    Subclass of `pool_class` that records how long each checkout waited for a connection,
+    including time spent opening a new one.
+    """
+    if pool_class not in _timed_pool_classes:
+
+        def _do_get(self):
+            started_at = time.perf_counter()
+            try:
+                return pool_class._do_get(self)
+            except exc.TimeoutError:
+                _checkout_timeouts_total.inc()
+                raise
+            finally:
+                _checkout_wait_ms.observe((time.perf_counter() - started_at) * 1000)
+
+        _timed_pool_classes[pool_class] = type(f"Timed{pool_class.__name__}", (pool_class,), {"_do_get": _do_get})
+    return _timed_pool_classes[pool_class]
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Records statement latency per kind, logs slow statements with their parameters redacted,
+    and tracks pool connections. For an AsyncEngine pass its `sync_engine`.
+    """
+    if not settings.db_statement_metrics_enabled:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    event.listen(engine.pool, "connect", _on_connect)
+    event.listen(engine.pool, "checkout", _on_checkout)
+    event.listen(engine.pool, "checkin", _on_checkin)
@@ -1,8 +1,16 @@
+from typing import Optional
+
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from src.app.config import settings
+from src.infra.observability.db_metrics import instrument_engine, timed_pool_class
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
 
 
 def get_connect_args():
@@ -12,10 +20,26 @@ def get_connect_args():
         return {"sslmode": settings.DATABASE_SSL_MODE}
     return {}
 
+def get_pool_args(async_engine: bool = False):
+    # In-memory SQLite keeps its single shared connection; every other URL gets a sized QueuePool.
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": timed_pool_class(AsyncAdaptedQueuePool if async_engine else QueuePool),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
 engine = create_engine(
     settings.DATABASE_URL, 
-    connect_args=get_connect_args()
+    connect_args=get_connect_args(),
+    **get_pool_args()
 )
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -29,6 +53,73 @@ def get_db():
         db.close()
 
 
+# set_config(..., true) is SET LOCAL as a function call: SET itself takes no bind parameters,
+# which only works with drivers that interpolate them client side (psycopg2, not asyncpg).
+_RLS_CONTEXT_STATEMENT = text("SELECT set_config('app.current_user_id', :user_id, true)")
+
+
 def apply_user_rls_context(db, user_id: int):
     if settings.DATABASE_URL.startswith("postgresql"):
-        db.execute(text("SET LOCAL app.current_user_id = :user_id"), {"user_id": str(user_id)})
+        db.execute(_RLS_CONTEXT_STATEMENT, {"user_id": str(user_id)})
+
+
+def get_async_database_url() -> str:
+    """
+    DATABASE_URL with its driver swapped for the asyncio one (asyncpg / aiosqlite).
+    """
+    url = make_url(settings.DATABASE_URL)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    if drivername is None:
+        raise ValueError(f"No async driver configured for '{url.get_backend_name()}' databases.")
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def get_async_connect_args():
+    if settings.DATABASE_URL.startswith("postgresql"):
+        return {"ssl": settings.DATABASE_SSL_MODE}
+    return {}
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    # Created on first use so processes that only use the sync engine (workers, scripts)
+    # do not need the async driver installed.
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(), connect_args=get_async_connect_args(), **get_pool_args(async_engine=True)
+        )
+        instrument_engine(_async_engine.sync_engine)
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    global _async_session_factory
+    if _async_session_factory is None:
+        # Attributes stay loaded after commit: an expired attribute would need a lazy load,
+        # which AsyncSession cannot do implicitly.
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def apply_user_rls_context_async(db: AsyncSession, user_id: int):
+    if settings.DATABASE_URL.startswith("postgresql"):
+        await db.execute(_RLS_CONTEXT_STATEMENT, {"user_id": str(user_id)})
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
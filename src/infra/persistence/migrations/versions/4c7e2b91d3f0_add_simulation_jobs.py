@@ -0,0 +1,50 @@
+"""Add simulation_jobs
+
+Revision ID: 4c7e2b91d3f0
+Revises: a0d835456e89
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c7e2b91d3f0'
+down_revision: Union[str, None] = 'a0d835456e89'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'simulation_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('twin_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('progress', sa.Float(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['twin_id'], ['digital_twins.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_simulation_jobs_id'), 'simulation_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_simulation_jobs_user_id'), 'simulation_jobs', ['user_id'], unique=False)
+    op.create_index(op.f('ix_simulation_jobs_twin_id'), 'simulation_jobs', ['twin_id'], unique=False)
+    op.create_index(op.f('ix_simulation_jobs_status'), 'simulation_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_simulation_jobs_created_at'), 'simulation_jobs', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_simulation_jobs_created_at'), table_name='simulation_jobs')
+    op.drop_index(op.f('ix_simulation_jobs_status'), table_name='simulation_jobs')
+    op.drop_index(op.f('ix_simulation_jobs_twin_id'), table_name='simulation_jobs')
+    op.drop_index(op.f('ix_simulation_jobs_user_id'), table_name='simulation_jobs')
+    op.drop_index(op.f('ix_simulation_jobs_id'), table_name='simulation_jobs')
+    op.drop_table('simulation_jobs')
@@ -0,0 +1,63 @@
+"""Add sync_runs
+
+Revision ID: 7f3a8c15e9b2
+Revises: b5d19e7a0c34
+Create Date: 2026-10-18 20:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3a8c15e9b2'
+down_revision: Union[str, None] = 'b5d19e7a0c34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sync_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('total_users', sa.Integer(), nullable=False),
+        sa.Column('processed_users', sa.Integer(), nullable=False),
+        sa.Column('failed_users', sa.Integer(), nullable=False),
+        sa.Column('transactions_synced', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_sync_runs_id'), 'sync_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_sync_runs_status'), 'sync_runs', ['status'], unique=False)
+    op.create_table(
+        'sync_run_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('transactions_synced', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['run_id'], ['sync_runs.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_id', 'user_id', name='uq_sync_run_items_run_user'),
+    )
+    op.create_index(op.f('ix_sync_run_items_id'), 'sync_run_items', ['id'], unique=False)
+    op.create_index(op.f('ix_sync_run_items_run_id'), 'sync_run_items', ['run_id'], unique=False)
+    op.create_index(op.f('ix_sync_run_items_status'), 'sync_run_items', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sync_run_items_status'), table_name='sync_run_items')
+    op.drop_index(op.f('ix_sync_run_items_run_id'), table_name='sync_run_items')
+    op.drop_index(op.f('ix_sync_run_items_id'), table_name='sync_run_items')
+    op.drop_table('sync_run_items')
+    op.drop_index(op.f('ix_sync_runs_status'), table_name='sync_runs')
+    op.drop_index(op.f('ix_sync_runs_id'), table_name='sync_runs')
+    op.drop_table('sync_runs')
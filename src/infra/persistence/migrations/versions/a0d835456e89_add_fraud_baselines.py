@@ -0,0 +1,44 @@
+"""Add fraud_baselines
+
+Revision ID: a0d835456e89
+Revises: 9950e26b46a4
+Create Date: 2026-10-18 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a0d835456e89'
+down_revision: Union[str, None] = '9950e26b46a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'fraud_baselines',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('model_version', sa.String(), nullable=False),
+        sa.Column('scored_transactions', sa.Integer(), nullable=False),
+        sa.Column('if_score_min', sa.Float(), nullable=True),
+        sa.Column('if_score_max', sa.Float(), nullable=True),
+        sa.Column('mse_min', sa.Float(), nullable=True),
+        sa.Column('mse_max', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'model_version', name='uq_fraud_baselines_user_model'),
+    )
+    op.create_index(op.f('ix_fraud_baselines_id'), 'fraud_baselines', ['id'], unique=False)
+    op.create_index(op.f('ix_fraud_baselines_user_id'), 'fraud_baselines', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_fraud_baselines_user_id'), table_name='fraud_baselines')
+    op.drop_index(op.f('ix_fraud_baselines_id'), table_name='fraud_baselines')
+    op.drop_table('fraud_baselines')
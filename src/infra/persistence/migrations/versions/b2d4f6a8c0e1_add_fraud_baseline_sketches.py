@@ -0,0 +1,29 @@
+"""Add score quantile sketches to fraud_baselines
+
+Revision ID: b2d4f6a8c0e1
+Revises: f6b1d3e5a7c9
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c0e1'
+down_revision: Union[str, None] = 'f6b1d3e5a7c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing baselines keep normalising on min/max until their next merge starts the sketches.
+    op.add_column('fraud_baselines', sa.Column('if_score_sketch', sa.JSON(), nullable=True))
+    op.add_column('fraud_baselines', sa.Column('mse_sketch', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('fraud_baselines', 'mse_sketch')
+    op.drop_column('fraud_baselines', 'if_score_sketch')
@@ -0,0 +1,45 @@
+"""Add incremental Open Banking sync
+
+Revision ID: b5d19e7a0c34
+Revises: e81f4a6c2d57
+Create Date: 2026-10-18 20:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d19e7a0c34'
+down_revision: Union[str, None] = 'e81f4a6c2d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('external_id', sa.String(), nullable=True))
+    op.create_index('uq_transactions_user_external_id', 'transactions', ['user_id', 'external_id'], unique=True)
+    op.create_table(
+        'open_banking_sync_cursors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.String(), nullable=False),
+        sa.Column('last_transaction_date', sa.Date(), nullable=True),
+        sa.Column('last_transaction_id', sa.String(), nullable=True),
+        sa.Column('synced_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'account_id', name='uq_open_banking_sync_cursors_user_account'),
+    )
+    op.create_index(op.f('ix_open_banking_sync_cursors_id'), 'open_banking_sync_cursors', ['id'], unique=False)
+    op.create_index(op.f('ix_open_banking_sync_cursors_user_id'), 'open_banking_sync_cursors', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_open_banking_sync_cursors_user_id'), table_name='open_banking_sync_cursors')
+    op.drop_index(op.f('ix_open_banking_sync_cursors_id'), table_name='open_banking_sync_cursors')
+    op.drop_table('open_banking_sync_cursors')
+    op.drop_index('uq_transactions_user_external_id', table_name='transactions')
+    op.drop_column('transactions', 'external_id')
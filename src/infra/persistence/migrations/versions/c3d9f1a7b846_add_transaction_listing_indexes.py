@@ -0,0 +1,40 @@
+"""Add transaction listing indexes
+
+Revision ID: c3d9f1a7b846
+Revises: 7f3a8c15e9b2
+Create Date: 2026-10-18 21:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9f1a7b846'
+down_revision: Union[str, None] = '7f3a8c15e9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_transactions_user_id_id', ['user_id', 'id']),
+    ('ix_transactions_user_date_id', ['user_id', 'transaction_date', 'id']),
+    ('ix_transactions_user_amount_id', ['user_id', 'amount', 'id']),
+    ('ix_transactions_user_category_id', ['user_id', 'category', 'id']),
+    ('ix_transactions_user_source_id', ['user_id', 'source', 'id']),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the table writable while large tenants are indexed on PostgreSQL;
+    # it cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, 'transactions', columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='transactions', postgresql_concurrently=True)
@@ -0,0 +1,46 @@
+"""Add open_banking_sync_states
+
+Revision ID: c8e1a3f5b7d9
+Revises: b2d4f6a8c0e1
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e1a3f5b7d9'
+down_revision: Union[str, None] = 'b2d4f6a8c0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'open_banking_sync_states',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('connected_at', sa.DateTime(), nullable=True),
+        sa.Column('last_attempt_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id'),
+    )
+    op.create_index(op.f('ix_open_banking_sync_states_id'), 'open_banking_sync_states', ['id'], unique=False)
+    op.create_index(
+        op.f('ix_open_banking_sync_states_last_attempt_at'), 'open_banking_sync_states', ['last_attempt_at'], unique=False
+    )
+    # Users synced so far are the ones with cursors; their newest cursor is the best known attempt.
+    op.execute(
+        "INSERT INTO open_banking_sync_states (user_id, connected_at, last_attempt_at) "
+        "SELECT user_id, min(synced_at), max(synced_at) FROM open_banking_sync_cursors GROUP BY user_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_open_banking_sync_states_last_attempt_at'), table_name='open_banking_sync_states')
+    op.drop_index(op.f('ix_open_banking_sync_states_id'), table_name='open_banking_sync_states')
+    op.drop_table('open_banking_sync_states')
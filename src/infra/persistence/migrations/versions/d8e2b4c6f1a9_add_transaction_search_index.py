@@ -0,0 +1,73 @@
+"""Add transaction search index
+
+Revision ID: d8e2b4c6f1a9
+Revises: c3d9f1a7b846
+Create Date: 2026-10-18 22:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e2b4c6f1a9'
+down_revision: Union[str, None] = 'c3d9f1a7b846'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The search DDL as of this revision, frozen here instead of imported so the migration never
+# changes under a database it already ran on. tests/test_query_plans.py checks it still matches
+# transaction_search.py; changing the DDL there needs a new migration.
+SEARCH_TEXT = "(coalesce(description, '') || ' ' || coalesce(category, '') || ' ' || source)"
+POSTGRES_INDEX = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transactions_search_trgm "
+    f"ON transactions USING gin ({SEARCH_TEXT} gin_trgm_ops)"
+)
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    "description, category, source, content='transactions', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+    "INSERT INTO transactions_fts(rowid, description, category, source) "
+    "VALUES (new.id, new.description, new.category, new.source); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description, category, source) "
+    "VALUES ('delete', old.id, old.description, old.category, old.source); END",
+    "CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE ON transactions BEGIN "
+    "INSERT INTO transactions_fts(transactions_fts, rowid, description, category, source) "
+    "VALUES ('delete', old.id, old.description, old.category, old.source); "
+    "INSERT INTO transactions_fts(rowid, description, category, source) "
+    "VALUES (new.id, new.description, new.category, new.source); END",
+)
+
+
+def _sqlite_supports_fts(bind) -> bool:
+    # FTS5 with the trigram tokenizer (SQLite 3.34+) in the library this connection uses.
+    version = tuple(int(part) for part in bind.exec_driver_sql("SELECT sqlite_version()").scalar().split("."))
+    options = {row[0] for row in bind.exec_driver_sql("PRAGMA compile_options")}
+    return version >= (3, 34) and "ENABLE_FTS5" in options
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        with op.get_context().autocommit_block():
+            op.execute(POSTGRES_INDEX)
+    elif dialect == 'sqlite' and _sqlite_supports_fts(bind):
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        # Index the rows that already exist.
+        op.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_transactions_search_trgm")
+    elif dialect == 'sqlite':
+        for trigger in ('transactions_fts_update', 'transactions_fts_delete', 'transactions_fts_insert'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS transactions_fts")
@@ -0,0 +1,51 @@
+"""Add transaction_daily_rollups
+
+Revision ID: e4a7c9d2b3f5
+Revises: d8e2b4c6f1a9
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c9d2b3f5'
+down_revision: Union[str, None] = 'd8e2b4c6f1a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_daily_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.Column('amount_sum', sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.Column('amount_abs_sum', sa.Numeric(precision=16, scale=2), nullable=False),
+        sa.Column('amount_min', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('amount_max', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', 'category', name='uq_transaction_daily_rollups_user_day_category'),
+    )
+    op.create_index(op.f('ix_transaction_daily_rollups_id'), 'transaction_daily_rollups', ['id'], unique=False)
+    # Backfill from the existing transactions; inserts from now on keep the rollups current.
+    op.execute(
+        "INSERT INTO transaction_daily_rollups "
+        "(user_id, day, category, transaction_count, amount_sum, amount_abs_sum, amount_min, amount_max) "
+        "SELECT user_id, transaction_date, coalesce(category, ''), count(*), coalesce(sum(amount), 0), "
+        "coalesce(sum(abs(amount)), 0), min(amount), max(amount) "
+        "FROM transactions WHERE user_id IS NOT NULL AND transaction_date IS NOT NULL "
+        "GROUP BY user_id, transaction_date, coalesce(category, '')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transaction_daily_rollups_id'), table_name='transaction_daily_rollups')
+    op.drop_table('transaction_daily_rollups')
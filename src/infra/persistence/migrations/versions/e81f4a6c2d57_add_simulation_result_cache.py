@@ -0,0 +1,38 @@
+"""Add simulation_result_cache
+
+Revision ID: e81f4a6c2d57
+Revises: 4c7e2b91d3f0
+Create Date: 2026-10-18 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81f4a6c2d57'
+down_revision: Union[str, None] = '4c7e2b91d3f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'simulation_result_cache',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('results', sa.JSON(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index(op.f('ix_simulation_result_cache_created_at'), 'simulation_result_cache', ['created_at'], unique=False)
+    op.create_index(op.f('ix_simulation_result_cache_last_used_at'), 'simulation_result_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_simulation_result_cache_last_used_at'), table_name='simulation_result_cache')
+    op.drop_index(op.f('ix_simulation_result_cache_created_at'), table_name='simulation_result_cache')
+    op.drop_table('simulation_result_cache')
@@ -0,0 +1,91 @@
+"""Promote financial analysis summary metrics to columns
+
+Revision ID: f6b1d3e5a7c9
+Revises: e4a7c9d2b3f5
+Create Date: 2026-10-19 00:10:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b1d3e5a7c9'
+down_revision: Union[str, None] = 'e4a7c9d2b3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+financial_analyses = sa.table(
+    'financial_analyses',
+    sa.column('id', sa.Integer()),
+    sa.column('analysis_results', sa.JSON()),
+    sa.column('total_transactions', sa.Integer()),
+    sa.column('total_amount', sa.Numeric(16, 2)),
+    sa.column('fraud_detected', sa.Boolean()),
+    sa.column('highest_risk_score', sa.Float()),
+    sa.column('transactions_above_threshold', sa.Integer()),
+    sa.column('total_carbon_kg', sa.Float()),
+)
+
+
+def _summary_columns(results) -> dict:
+    if isinstance(results, str):
+        results = json.loads(results)
+    summary = (results or {}).get('summary') or {}
+    fraud = (results or {}).get('fraud_analysis') or {}
+    carbon = (results or {}).get('carbon_analysis') or {}
+    return {
+        'total_transactions': summary.get('total_transactions'),
+        'total_amount': summary.get('total_amount'),
+        'fraud_detected': fraud.get('fraud_detected'),
+        'highest_risk_score': fraud.get('highest_risk_score'),
+        'transactions_above_threshold': fraud.get('transactions_above_threshold'),
+        'total_carbon_kg': carbon.get('total_carbon_kg'),
+    }
+
+
+def upgrade() -> None:
+    op.add_column('financial_analyses', sa.Column('total_transactions', sa.Integer(), nullable=True))
+    op.add_column('financial_analyses', sa.Column('total_amount', sa.Numeric(precision=16, scale=2), nullable=True))
+    op.add_column('financial_analyses', sa.Column('fraud_detected', sa.Boolean(), nullable=True))
+    op.add_column('financial_analyses', sa.Column('highest_risk_score', sa.Float(), nullable=True))
+    op.add_column('financial_analyses', sa.Column('transactions_above_threshold', sa.Integer(), nullable=True))
+    op.add_column('financial_analyses', sa.Column('total_carbon_kg', sa.Float(), nullable=True))
+    op.create_index(
+        op.f('ix_financial_analyses_highest_risk_score'), 'financial_analyses', ['highest_risk_score'], unique=False
+    )
+    op.create_index('ix_financial_analyses_user_created', 'financial_analyses', ['user_id', 'created_at'], unique=False)
+
+    # Backfill in id order, one batch of reports in memory at a time.
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(financial_analyses.c.id, financial_analyses.c.analysis_results)
+            .where(financial_analyses.c.id > last_id)
+            .order_by(financial_analyses.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            financial_analyses.update().where(financial_analyses.c.id == sa.bindparam('analysis_id')),
+            [{'analysis_id': row.id, **_summary_columns(row.analysis_results)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index('ix_financial_analyses_user_created', table_name='financial_analyses')
+    op.drop_index(op.f('ix_financial_analyses_highest_risk_score'), table_name='financial_analyses')
+    op.drop_column('financial_analyses', 'total_carbon_kg')
+    op.drop_column('financial_analyses', 'transactions_above_threshold')
+    op.drop_column('financial_analyses', 'highest_risk_score')
+    op.drop_column('financial_analyses', 'fraud_detected')
+    op.drop_column('financial_analyses', 'total_amount')
+    op.drop_column('financial_analyses', 'total_transactions')
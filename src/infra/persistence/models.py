@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, JSON, DateTime, Numeric, Date, Text
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, JSON, DateTime, Numeric, Date, Text, Float, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 import datetime
 
 from src.infra.persistence.database import Base
+from src.infra.persistence.transaction_search import attach_search_ddl
 
 
 class User(Base):
@@ -19,6 +20,9 @@ class User(Base):
     ui_settings = relationship("UserUiSetting", back_populates="owner")
     reports = relationship("GeneratedReport", back_populates="owner")
     report_schedules = relationship("ReportSchedule", back_populates="owner")
+    fraud_baselines = relationship("FraudBaseline", back_populates="owner")
+    simulation_jobs = relationship("SimulationJob", back_populates="owner")
+    sync_cursors = relationship("OpenBankingSyncCursor", back_populates="owner")
 
 
 from typing import Optional
@@ -35,10 +39,47 @@ class DigitalTwin(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
     owner = relationship("User", back_populates="twins")
+    job = relationship("SimulationJob", back_populates="twin", uselist=False)
+
+
+class SimulationJob(Base):
+    __tablename__ = "simulation_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    twin_id = Column(Integer, ForeignKey("digital_twins.id"), nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued", index=True)
+    progress = Column(Float, nullable=False, default=0.0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    owner = relationship("User", back_populates="simulation_jobs")
+    twin = relationship("DigitalTwin", back_populates="job")
+
+
+class SimulationResultCache(Base):
+    __tablename__ = "simulation_result_cache"
+
+    key = Column(String(64), primary_key=True)
+    results = Column(JSON, nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
+    last_used_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
 
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("uq_transactions_user_external_id", "user_id", "external_id", unique=True),
+        # One per sort key of the transactions listing; `id` breaks ties for keyset pagination.
+        Index("ix_transactions_user_id_id", "user_id", "id"),
+        Index("ix_transactions_user_date_id", "user_id", "transaction_date", "id"),
+        Index("ix_transactions_user_amount_id", "user_id", "amount", "id"),
+        Index("ix_transactions_user_category_id", "user_id", "category", "id"),
+        Index("ix_transactions_user_source_id", "user_id", "source", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String)
@@ -47,12 +88,97 @@ class Transaction(Base):
     transaction_date = Column(Date)
     user_id = Column(Integer, ForeignKey("users.id"))
     source = Column(String, nullable=False, index=True)
+    external_id = Column(String, nullable=True)
 
     owner = relationship("User", back_populates="transactions")
 
 
+attach_search_ddl(Transaction.__table__)
+
+
+class TransactionDailyRollup(Base):
+    """
+    Per user, day and category totals of `transactions`, kept up to date by every insert in
+    transaction_repository. Uncategorized transactions roll up under category "", and
+    transactions without a date are not rolled up.
+    """
+
+    __tablename__ = "transaction_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", "category", name="uq_transaction_daily_rollups_user_day_category"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    category = Column(String, nullable=False, default="")
+    transaction_count = Column(Integer, nullable=False, default=0)
+    amount_sum = Column(Numeric(16, 2), nullable=False, default=0)
+    amount_abs_sum = Column(Numeric(16, 2), nullable=False, default=0)
+    amount_min = Column(Numeric(10, 2), nullable=True)
+    amount_max = Column(Numeric(10, 2), nullable=True)
+
+
+class OpenBankingSyncCursor(Base):
+    __tablename__ = "open_banking_sync_cursors"
+    __table_args__ = (UniqueConstraint("user_id", "account_id", name="uq_open_banking_sync_cursors_user_account"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    account_id = Column(String, nullable=False)
+    last_transaction_date = Column(Date, nullable=True)
+    last_transaction_id = Column(String, nullable=True)
+    synced_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    owner = relationship("User", back_populates="sync_cursors")
+
+
+class OpenBankingSyncState(Base):
+    # One row per user with a bank connection: what the batch sync schedules from.
+    __tablename__ = "open_banking_sync_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, unique=True)
+    connected_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Last completed sync attempt, whether or not it brought new transactions.
+    last_attempt_at = Column(DateTime, nullable=True, index=True)
+
+
+class SyncRun(Base):
+    __tablename__ = "sync_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default="running", index=True)
+    total_users = Column(Integer, nullable=False, default=0)
+    processed_users = Column(Integer, nullable=False, default=0)
+    failed_users = Column(Integer, nullable=False, default=0)
+    transactions_synced = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, default=datetime.datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    items = relationship("SyncRunItem", back_populates="run")
+
+
+class SyncRunItem(Base):
+    __tablename__ = "sync_run_items"
+    __table_args__ = (UniqueConstraint("run_id", "user_id", name="uq_sync_run_items_run_user"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("sync_runs.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    position = Column(Integer, nullable=False)
+    status = Column(String, nullable=False, default="pending", index=True)
+    transactions_synced = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    run = relationship("SyncRun", back_populates="items")
+
+
 class FinancialAnalysis(Base):
     __tablename__ = "financial_analyses"
+    # History lists are read newest first per user.
+    __table_args__ = (Index("ix_financial_analyses_user_created", "user_id", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     analysis_results = Column(JSON, nullable=False)
@@ -60,6 +186,14 @@ class FinancialAnalysis(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     blockchain_tx_hash = Column(String, nullable=True, index=True)
     analysis_type = Column(String, nullable=False, index=True)
+    # Copied from analysis_results when the analysis is written (analysis_repository.summary_columns),
+    # so lists and reports can read them without loading the JSON.
+    total_transactions = Column(Integer, nullable=True)
+    total_amount = Column(Numeric(16, 2), nullable=True)
+    fraud_detected = Column(Boolean, nullable=True)
+    highest_risk_score = Column(Float, nullable=True, index=True)
+    transactions_above_threshold = Column(Integer, nullable=True)
+    total_carbon_kg = Column(Float, nullable=True)
 
     owner = relationship("User", back_populates="analyses")
 
@@ -100,3 +234,22 @@ class ReportSchedule(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
 
     owner = relationship("User", back_populates="report_schedules")
+
+
+class FraudBaseline(Base):
+    __tablename__ = "fraud_baselines"
+    __table_args__ = (UniqueConstraint("user_id", "model_version", name="uq_fraud_baselines_user_model"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    model_version = Column(String, nullable=False)
+    scored_transactions = Column(Integer, nullable=False, default=0)
+    if_score_min = Column(Float, nullable=True)
+    if_score_max = Column(Float, nullable=True)
+    mse_min = Column(Float, nullable=True)
+    mse_max = Column(Float, nullable=True)
+    if_score_sketch = Column(JSON, nullable=True)
+    mse_sketch = Column(JSON, nullable=True)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    owner = relationship("User", back_populates="fraud_baselines")
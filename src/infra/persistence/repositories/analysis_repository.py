@@ -1,13 +1,47 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from src.infra.persistence.models import FinancialAnalysis, User, Transaction
 
+SUMMARY_COLUMNS = (
+    FinancialAnalysis.id,
+    FinancialAnalysis.user_id,
+    FinancialAnalysis.created_at,
+    FinancialAnalysis.analysis_type,
+    FinancialAnalysis.blockchain_tx_hash,
+    FinancialAnalysis.total_transactions,
+    FinancialAnalysis.total_amount,
+    FinancialAnalysis.fraud_detected,
+    FinancialAnalysis.highest_risk_score,
+    FinancialAnalysis.transactions_above_threshold,
+    FinancialAnalysis.total_carbon_kg,
+)
+
+
+def summary_columns(analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The summary metrics of an analysis report, for the FinancialAnalysis columns that mirror them.
+    Sections that failed (e.g. {"error": ...}) leave their columns empty.
+    """
+    summary = analysis_data.get("summary") or {}
+    fraud = analysis_data.get("fraud_analysis") or {}
+    carbon = analysis_data.get("carbon_analysis") or {}
+    return {
+        "total_transactions": summary.get("total_transactions"),
+        "total_amount": summary.get("total_amount"),
+        "fraud_detected": fraud.get("fraud_detected"),
+        "highest_risk_score": fraud.get("highest_risk_score"),
+        "transactions_above_threshold": fraud.get("transactions_above_threshold"),
+        "total_carbon_kg": carbon.get("total_carbon_kg"),
+    }
+
 
 def create_analysis(db: Session, user: User, analysis_data: Dict[str, Any], analysis_type: str) -> FinancialAnalysis:
     db_analysis = FinancialAnalysis(
         analysis_results=analysis_data,
         owner=user,
-        analysis_type=analysis_type
+        analysis_type=analysis_type,
+        **summary_columns(analysis_data),
     )
     db.add(db_analysis)
     db.commit()
@@ -15,14 +49,25 @@ def create_analysis(db: Session, user: User, analysis_data: Dict[str, Any], anal
     return db_analysis
 
 
-def get_analyses_by_user_id(db: Session, user_id: int) -> List[FinancialAnalysis]:
-    return db.query(FinancialAnalysis).filter(FinancialAnalysis.user_id == user_id).all()
+def get_analysis_history(
+    db: Session, user_id: int, analysis_type: Optional[str] = None, include_results: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    The user's analyses, newest first, as dicts of SUMMARY_COLUMNS. The analysis_results JSON
+    is only selected (and parsed) when `include_results` is set.
+    """
+    columns = [*SUMMARY_COLUMNS, FinancialAnalysis.analysis_results] if include_results else SUMMARY_COLUMNS
+    query = select(*columns).where(FinancialAnalysis.user_id == user_id)
+    if analysis_type is not None:
+        query = query.where(FinancialAnalysis.analysis_type == analysis_type)
+    query = query.order_by(FinancialAnalysis.created_at.desc(), FinancialAnalysis.id.desc())
+    return [dict(row) for row in db.execute(query).mappings()]
+
 
-def get_analyses_by_user_and_type(db: Session, user_id: int, analysis_type: str) -> List[FinancialAnalysis]:
-    return db.query(FinancialAnalysis).filter(
-        FinancialAnalysis.user_id == user_id,
-        FinancialAnalysis.analysis_type == analysis_type
-    ).all()
+def get_analysis_for_user(db: Session, user_id: int, analysis_id: int) -> Optional[FinancialAnalysis]:
+    return db.execute(
+        select(FinancialAnalysis).where(FinancialAnalysis.id == analysis_id, FinancialAnalysis.user_id == user_id)
+    ).scalar_one_or_none()
 
 
 def add_blockchain_hash_to_analysis(db: Session, analysis_id: int, tx_hash: str) -> FinancialAnalysis:
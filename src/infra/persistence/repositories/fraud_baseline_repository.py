@@ -0,0 +1,93 @@
+import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.infra.persistence.models import FraudBaseline
+
+BASELINE_FIELDS = (
+    "scored_transactions",
+    "if_score_min",
+    "if_score_max",
+    "mse_min",
+    "mse_max",
+    "if_score_sketch",
+    "mse_sketch",
+)
+
+
+def get_baseline(db: Session, user_id: int, model_version: str) -> Optional[FraudBaseline]:
+    # populate_existing: save_baseline writes through Core, behind the back of a row already loaded.
+    return db.query(FraudBaseline).populate_existing().filter(
+        FraudBaseline.user_id == user_id,
+        FraudBaseline.model_version == model_version
+    ).first()
+
+
+def lock_baseline(db: Session, user_id: int, model_version: str) -> FraudBaseline:
+    """
+    Returns the user's baseline for a model version locked FOR UPDATE until the caller's
+    transaction ends, creating an empty one (scored_transactions = 0) first so there is always a
+    row to lock. Concurrent analyses for the same user then extend the baseline one after the
+    other instead of overwriting each other's merge.
+    """
+    table = FraudBaseline.__table__
+    row = {
+        "user_id": user_id,
+        "model_version": model_version,
+        "scored_transactions": 0,
+        "updated_at": datetime.datetime.utcnow(),
+    }
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        exists = db.scalar(
+            select(table.c.id).where(table.c.user_id == user_id, table.c.model_version == model_version)
+        )
+        if exists is None:
+            db.execute(table.insert(), [row])
+    else:
+        db.execute(dialect_insert(table).on_conflict_do_nothing(index_elements=["user_id", "model_version"]), [row])
+    return db.query(FraudBaseline).populate_existing().with_for_update().filter(
+        FraudBaseline.user_id == user_id,
+        FraudBaseline.model_version == model_version
+    ).one()
+
+
+def save_baseline(db: Session, user_id: int, model_version: str, values: Dict[str, Any]) -> None:
+    """
+    Creates or updates the user's baseline for a model version in one statement. Callers that
+    merge into the stored baseline read it with lock_baseline first, in the same transaction.
+    Does not commit; the caller does.
+    """
+    table = FraudBaseline.__table__
+    row = {
+        "user_id": user_id,
+        "model_version": model_version,
+        "updated_at": datetime.datetime.utcnow(),
+        **{field: values[field] for field in BASELINE_FIELDS},
+    }
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        _save_by_lookup(db, row)
+        return
+    statement = dialect_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "model_version"],
+        set_={field: statement.excluded[field] for field in (*BASELINE_FIELDS, "updated_at")},
+    )
+    db.execute(statement, [row])
+
+
+def _save_by_lookup(db: Session, row: Dict[str, Any]) -> None:
+    table = FraudBaseline.__table__
+    current_id = db.scalar(
+        select(table.c.id).where(
+            table.c.user_id == row["user_id"], table.c.model_version == row["model_version"]
+        ).with_for_update()
+    )
+    if current_id is None:
+        db.execute(table.insert(), [row])
+    else:
+        db.execute(table.update().where(table.c.id == current_id).values(**row))
@@ -0,0 +1,156 @@
+import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.infra.persistence.models import TransactionDailyRollup
+
+UNCATEGORIZED = ""
+GROUP_BY_COLUMNS = {
+    "day": TransactionDailyRollup.day,
+    "category": TransactionDailyRollup.category,
+}
+
+_CENT = Decimal("0.01")
+
+
+def _to_decimal(value: Any) -> Decimal:
+    # Rounded like the Numeric(10, 2) column the transaction is stored in.
+    return Decimal(str(value)).quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+def _aggregate(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    totals: Dict[Tuple[int, datetime.date, str], Dict[str, Any]] = {}
+    for row in rows:
+        if row["user_id"] is None or row["transaction_date"] is None:
+            continue
+        key = (row["user_id"], row["transaction_date"], row["category"] or UNCATEGORIZED)
+        entry = totals.get(key)
+        if entry is None:
+            entry = totals[key] = {
+                "user_id": key[0],
+                "day": key[1],
+                "category": key[2],
+                "transaction_count": 0,
+                "amount_sum": Decimal(0),
+                "amount_abs_sum": Decimal(0),
+                "amount_min": None,
+                "amount_max": None,
+            }
+        entry["transaction_count"] += 1
+        if row["amount"] is None:
+            continue
+        amount = _to_decimal(row["amount"])
+        entry["amount_sum"] += amount
+        entry["amount_abs_sum"] += abs(amount)
+        entry["amount_min"] = amount if entry["amount_min"] is None else min(entry["amount_min"], amount)
+        entry["amount_max"] = amount if entry["amount_max"] is None else max(entry["amount_max"], amount)
+    # A fixed key order keeps concurrent writers from locking the same rows in opposite orders.
+    return [totals[key] for key in sorted(totals)]
+
+
+def add_transactions(db: Session, rows: Iterable[Any]) -> None:
+    """
+    Folds newly inserted transactions (mappings with user_id, transaction_date, category and
+    amount) into the rollups. Runs inside the caller's transaction, so the rollups commit or roll
+    back together with the rows they count.
+    """
+    entries = _aggregate(rows)
+    if not entries:
+        return
+    table = TransactionDailyRollup.__table__
+    dialect_name = db.get_bind().dialect.name
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(dialect_name)
+    if dialect_insert is None:
+        _add_by_lookup(db, entries)
+        return
+
+    # LEAST/GREATEST in PostgreSQL, the multi-argument min/max scalars in SQLite.
+    least, greatest = (func.least, func.greatest) if dialect_name == "postgresql" else (func.min, func.max)
+    statement = dialect_insert(table)
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=["user_id", "day", "category"],
+        set_={
+            "transaction_count": table.c.transaction_count + excluded.transaction_count,
+            "amount_sum": table.c.amount_sum + excluded.amount_sum,
+            "amount_abs_sum": table.c.amount_abs_sum + excluded.amount_abs_sum,
+            "amount_min": least(
+                func.coalesce(table.c.amount_min, excluded.amount_min),
+                func.coalesce(excluded.amount_min, table.c.amount_min),
+            ),
+            "amount_max": greatest(
+                func.coalesce(table.c.amount_max, excluded.amount_max),
+                func.coalesce(excluded.amount_max, table.c.amount_max),
+            ),
+        },
+    )
+    db.execute(statement, entries)
+
+
+def _add_by_lookup(db: Session, entries: List[Dict[str, Any]]) -> None:
+    table = TransactionDailyRollup.__table__
+    for entry in entries:
+        current = db.execute(
+            select(table).where(
+                table.c.user_id == entry["user_id"], table.c.day == entry["day"], table.c.category == entry["category"]
+            ).with_for_update()
+        ).mappings().first()
+        if current is None:
+            db.execute(insert(table), [entry])
+            continue
+        db.execute(
+            update(table)
+            .where(table.c.id == current["id"])
+            .values(
+                transaction_count=current["transaction_count"] + entry["transaction_count"],
+                amount_sum=current["amount_sum"] + entry["amount_sum"],
+                amount_abs_sum=current["amount_abs_sum"] + entry["amount_abs_sum"],
+                amount_min=min((v for v in (current["amount_min"], entry["amount_min"]) if v is not None), default=None),
+                amount_max=max((v for v in (current["amount_max"], entry["amount_max"]) if v is not None), default=None),
+            )
+        )
+
+
+def delete_user_rollups(db: Session, user_id: int) -> None:
+    db.execute(delete(TransactionDailyRollup).where(TransactionDailyRollup.user_id == user_id))
+
+
+def get_totals(
+    db: Session,
+    user_id: int,
+    group_by: str = "day",
+    start_date: Optional[datetime.date] = None,
+    end_date: Optional[datetime.date] = None,
+    category: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Count, sum, absolute sum, min and max of the user's transactions per day or per category,
+    read from the rollups: the cost depends on the days and categories in range, not on how
+    many transactions they hold.
+    """
+    key = GROUP_BY_COLUMNS[group_by]
+    rollup = TransactionDailyRollup
+    statement = (
+        select(
+            key.label("key"),
+            func.sum(rollup.transaction_count).label("transaction_count"),
+            func.sum(rollup.amount_sum).label("amount_sum"),
+            func.sum(rollup.amount_abs_sum).label("amount_abs_sum"),
+            func.min(rollup.amount_min).label("amount_min"),
+            func.max(rollup.amount_max).label("amount_max"),
+        )
+        .where(rollup.user_id == user_id)
+        .group_by(key)
+        .order_by(key)
+    )
+    if start_date is not None:
+        statement = statement.where(rollup.day >= start_date)
+    if end_date is not None:
+        statement = statement.where(rollup.day <= end_date)
+    if category is not None:
+        statement = statement.where(rollup.category == category)
+    return [dict(row) for row in db.execute(statement).mappings()]
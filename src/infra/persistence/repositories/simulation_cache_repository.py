@@ -0,0 +1,46 @@
+import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from src.infra.persistence.models import SimulationResultCache
+
+
+def get_entry(db: Session, key: str, ttl_seconds: int) -> Optional[Dict[str, Any]]:
+    """
+    Returns cached results and records the hit, or None when the key is missing or expired.
+    Commits the hit bookkeeping.
+    """
+    entry = db.get(SimulationResultCache, key)
+    if entry is None:
+        return None
+    now = datetime.datetime.utcnow()
+    if entry.created_at < now - datetime.timedelta(seconds=ttl_seconds):
+        db.delete(entry)
+        db.commit()
+        return None
+    entry.hit_count += 1
+    entry.last_used_at = now
+    db.commit()
+    return entry.results
+
+
+def save_entry(db: Session, key: str, results: Dict[str, Any], ttl_seconds: int, max_entries: int) -> None:
+    """
+    Stores results under `key`, then drops expired entries and the least recently used ones
+    beyond `max_entries`. Commits.
+    """
+    now = datetime.datetime.utcnow()
+    db.merge(SimulationResultCache(key=key, results=results, hit_count=0, created_at=now, last_used_at=now))
+    db.flush()
+    db.execute(delete(SimulationResultCache).where(
+        SimulationResultCache.created_at < now - datetime.timedelta(seconds=ttl_seconds)
+    ))
+    overflow = db.scalar(select(func.count()).select_from(SimulationResultCache)) - max_entries
+    if overflow > 0:
+        stale_keys = select(SimulationResultCache.key).order_by(
+            SimulationResultCache.last_used_at
+        ).limit(overflow).scalar_subquery()
+        db.execute(delete(SimulationResultCache).where(SimulationResultCache.key.in_(stale_keys)))
+    db.commit()
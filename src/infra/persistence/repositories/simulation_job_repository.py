@@ -0,0 +1,77 @@
+import datetime
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from src.infra.persistence.models import SimulationJob
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+def create_job(db: Session, user_id: int, twin_id: int) -> SimulationJob:
+    """
+    Queues a simulation job for a twin. Flushes only; the caller commits.
+    """
+    db_job = SimulationJob(user_id=user_id, twin_id=twin_id, status=QUEUED, progress=0.0)
+    db.add(db_job)
+    db.flush()
+    return db_job
+
+
+def get_job_for_user(db: Session, job_id: int, user_id: int) -> Optional[SimulationJob]:
+    return db.query(SimulationJob).filter(
+        SimulationJob.id == job_id,
+        SimulationJob.user_id == user_id
+    ).first()
+
+
+def claim_next_job(db: Session) -> Optional[SimulationJob]:
+    """
+    Moves the oldest queued job to running and returns it, or None when the queue is empty.
+    The status-guarded UPDATE makes the claim safe when several workers poll the same table.
+    """
+    while True:
+        job_id = db.query(SimulationJob.id).filter(
+            SimulationJob.status == QUEUED
+        ).order_by(SimulationJob.created_at, SimulationJob.id).limit(1).scalar()
+        if job_id is None:
+            return None
+        claimed = db.execute(
+            update(SimulationJob)
+            .where(SimulationJob.id == job_id, SimulationJob.status == QUEUED)
+            .values(status=RUNNING, started_at=datetime.datetime.utcnow())
+        ).rowcount
+        db.commit()
+        if claimed:
+            return db.get(SimulationJob, job_id)
+
+
+def set_progress(db: Session, job: SimulationJob, progress: float) -> None:
+    job.progress = progress
+    db.commit()
+
+
+def finish_job(db: Session, job: SimulationJob, error: Optional[str] = None) -> None:
+    job.status = FAILED if error else COMPLETED
+    job.error = error
+    if not error:
+        job.progress = 1.0
+    job.finished_at = datetime.datetime.utcnow()
+    db.commit()
+
+
+def requeue_running_jobs(db: Session) -> int:
+    """
+    Returns jobs left running by a worker that stopped mid-simulation to the queue.
+    """
+    requeued = db.execute(
+        update(SimulationJob)
+        .where(SimulationJob.status == RUNNING)
+        .values(status=QUEUED, progress=0.0, started_at=None)
+    ).rowcount
+    db.commit()
+    return requeued
@@ -0,0 +1,68 @@
+import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.infra.persistence.models import OpenBankingSyncCursor, OpenBankingSyncState
+
+
+def get_cursors(db: Session, user_id: int) -> Dict[str, OpenBankingSyncCursor]:
+    cursors = db.query(OpenBankingSyncCursor).filter(OpenBankingSyncCursor.user_id == user_id).all()
+    return {cursor.account_id: cursor for cursor in cursors}
+
+
+def save_cursor(
+    db: Session,
+    user_id: int,
+    account_id: str,
+    last_transaction_date: Optional[datetime.date],
+    last_transaction_id: Optional[str],
+    cursor: Optional[OpenBankingSyncCursor] = None,
+) -> OpenBankingSyncCursor:
+    """
+    Creates or advances an account's sync cursor. Flushes only; the caller commits.
+    """
+    if cursor is None:
+        cursor = OpenBankingSyncCursor(user_id=user_id, account_id=account_id)
+        db.add(cursor)
+    cursor.last_transaction_date = last_transaction_date
+    cursor.last_transaction_id = last_transaction_id
+    cursor.synced_at = datetime.datetime.utcnow()
+    db.flush()
+    return cursor
+
+
+def _upsert_sync_state(db: Session, user_id: int, values: Dict[str, datetime.datetime]) -> None:
+    table = OpenBankingSyncState.__table__
+    row = {"user_id": user_id, "connected_at": datetime.datetime.utcnow(), **values}
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        if db.scalar(select(table.c.id).where(table.c.user_id == user_id).with_for_update()) is None:
+            db.execute(table.insert(), [row])
+        elif values:
+            db.execute(update(table).where(table.c.user_id == user_id).values(**values))
+        return
+    statement = dialect_insert(table)
+    if values:
+        statement = statement.on_conflict_do_update(index_elements=["user_id"], set_=values)
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=["user_id"])
+    db.execute(statement, [row])
+
+
+def record_connection(db: Session, user_id: int) -> None:
+    """
+    Makes the user a candidate for the batch sync; a repeated connection keeps the first
+    connected_at. Does not commit.
+    """
+    _upsert_sync_state(db, user_id, {})
+
+
+def record_sync_attempt(db: Session, user_id: int) -> None:
+    """
+    Stamps the user's last sync attempt, creating the sync state if the user has none yet.
+    Does not commit.
+    """
+    _upsert_sync_state(db, user_id, {"last_attempt_at": datetime.datetime.utcnow()})
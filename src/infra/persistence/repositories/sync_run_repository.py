@@ -0,0 +1,87 @@
+import datetime
+from typing import List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from src.infra.persistence.models import OpenBankingSyncState, SyncRun, SyncRunItem
+
+RUNNING = "running"
+COMPLETED = "completed"
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+def stale_first_user_ids(db: Session, limit: Optional[int] = None) -> List[int]:
+    """
+    Users with a bank connection, those never synced first, then by their last sync attempt.
+    """
+    statement = select(OpenBankingSyncState.user_id).order_by(
+        OpenBankingSyncState.last_attempt_at.asc().nulls_first(), OpenBankingSyncState.user_id
+    )
+    if limit:
+        statement = statement.limit(limit)
+    return list(db.execute(statement).scalars())
+
+
+def get_unfinished_run(db: Session) -> Optional[SyncRun]:
+    return db.query(SyncRun).filter(SyncRun.status == RUNNING).order_by(SyncRun.id.desc()).first()
+
+
+def create_run(db: Session, user_ids: List[int]) -> SyncRun:
+    """
+    Snapshots the users to sync, in order, so an interrupted run can be resumed. Commits.
+    """
+    run = SyncRun(status=RUNNING, total_users=len(user_ids))
+    db.add(run)
+    db.flush()
+    if user_ids:
+        db.execute(insert(SyncRunItem), [
+            {"run_id": run.id, "user_id": user_id, "position": position, "status": PENDING, "transactions_synced": 0}
+            for position, user_id in enumerate(user_ids)
+        ])
+    db.commit()
+    return run
+
+
+def pending_user_ids(db: Session, run_id: int) -> List[int]:
+    return list(db.execute(
+        select(SyncRunItem.user_id)
+        .where(SyncRunItem.run_id == run_id, SyncRunItem.status == PENDING)
+        .order_by(SyncRunItem.position)
+    ).scalars())
+
+
+def finish_item(db: Session, run_id: int, user_id: int, transactions_synced: int, error: Optional[str] = None) -> None:
+    """
+    Records one user's outcome and rolls it into the run totals. Commits.
+    """
+    db.execute(
+        update(SyncRunItem)
+        .where(SyncRunItem.run_id == run_id, SyncRunItem.user_id == user_id)
+        .values(
+            status=FAILED if error else DONE,
+            transactions_synced=transactions_synced,
+            error=error,
+            finished_at=datetime.datetime.utcnow(),
+        )
+    )
+    db.execute(
+        update(SyncRun)
+        .where(SyncRun.id == run_id)
+        .values(
+            processed_users=SyncRun.processed_users + 1,
+            failed_users=SyncRun.failed_users + (1 if error else 0),
+            transactions_synced=SyncRun.transactions_synced + transactions_synced,
+        )
+    )
+    db.commit()
+
+
+def finish_run(db: Session, run: SyncRun) -> SyncRun:
+    run.status = COMPLETED
+    run.finished_at = datetime.datetime.utcnow()
+    db.commit()
+    db.refresh(run)
+    return run
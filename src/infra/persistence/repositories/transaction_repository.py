@@ -0,0 +1,345 @@
+import base64
+import csv
+import datetime
+import io
+import json
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Select, column, func, insert, select, table, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from src.app.config import settings
+from src.infra.persistence import transaction_search
+from src.infra.persistence.models import Transaction
+from src.infra.persistence.repositories import rollup_repository
+
+TRANSACTION_COLUMNS = ("description", "amount", "category", "transaction_date", "user_id", "source", "external_id")
+EXPORT_COLUMNS = ("id", "transaction_date", "description", "amount", "category", "source")
+
+_COPY_NULL = "\\N"
+
+LISTING_SORT_COLUMNS = {
+    "id": Transaction.id,
+    "transaction_date": Transaction.transaction_date,
+    "amount": Transaction.amount,
+    "category": Transaction.category,
+    "source": Transaction.source,
+}
+# Sort key for search results ranked by the search index; only with ranked_search_available.
+RELEVANCE = "relevance"
+# Dialects that sort NULL above every value (NULLS LAST ascending, NULLS FIRST descending).
+_NULLS_SORT_HIGH = {"postgresql"}
+
+
+def _batched(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _to_row(transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {column: transaction_data.get(column) for column in TRANSACTION_COLUMNS}
+
+
+# DBAPI drivers with a COPY FROM STDIN path; asyncpg is what the async session runs on.
+_COPY_DRIVERS = {"psycopg2", "asyncpg"}
+
+
+def _supports_copy(db: Session) -> bool:
+    bind = db.get_bind()
+    return (
+        settings.transactions_bulk_use_copy
+        and bind.dialect.name == "postgresql"
+        and bind.dialect.driver in _COPY_DRIVERS
+    )
+
+
+def _copy_batch(db: Session, batch: List[Dict[str, Any]]) -> None:
+    if db.get_bind().dialect.driver == "asyncpg":
+        _copy_records_batch(db, batch)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow([_COPY_NULL if row[column] is None else row[column] for column in TRANSACTION_COLUMNS])
+    buffer.seek(0)
+
+    dbapi_connection = db.connection().connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {Transaction.__tablename__} ({', '.join(TRANSACTION_COLUMNS)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+            buffer,
+        )
+
+
+def _copy_records_batch(db: Session, batch: List[Dict[str, Any]]) -> None:
+    # Reached through AsyncSession.run_sync, which runs in the greenlet await_only needs.
+    # asyncpg sends COPY in binary, so amounts must already be Decimal.
+    records = [
+        tuple(
+            Decimal(str(row[column])) if column == "amount" and row[column] is not None else row[column]
+            for column in TRANSACTION_COLUMNS
+        )
+        for row in batch
+    ]
+    driver_connection = db.connection().connection.driver_connection
+    await_only(
+        driver_connection.copy_records_to_table(
+            Transaction.__tablename__, records=records, columns=list(TRANSACTION_COLUMNS)
+        )
+    )
+
+
+def bulk_insert_transactions(
+    db: Session, transactions_data: Iterable[Dict[str, Any]], batch_size: Optional[int] = None
+) -> int:
+    """
+    Inserts transactions in batches without building ORM objects.
+
+    Uses PostgreSQL COPY FROM STDIN when available and falls back to executemany inserts,
+    e.g. when COPY is rejected because row level security is enabled on the table.
+    Updates the daily rollups in the same transaction; committing is left to the caller.
+    """
+    batch_size = batch_size or settings.transactions_bulk_batch_size
+    use_copy = _supports_copy(db)
+    inserted = 0
+    for batch in _batched((_to_row(t) for t in transactions_data), batch_size):
+        if use_copy:
+            try:
+                with db.begin_nested():
+                    _copy_batch(db, batch)
+            except Exception:
+                use_copy = False
+        if not use_copy:
+            db.execute(insert(Transaction.__table__), batch)
+        rollup_repository.add_transactions(db, batch)
+        inserted += len(batch)
+    return inserted
+
+
+def bulk_insert_transactions_returning_ids(
+    db: Session, transactions_data: Iterable[Dict[str, Any]], batch_size: Optional[int] = None
+) -> List[int]:
+    """
+    Same as bulk_insert_transactions, but returns the generated ids in input order.
+    Always uses multi-row INSERT ... RETURNING, since COPY cannot report ids.
+    """
+    batch_size = batch_size or settings.transactions_bulk_batch_size
+    table = Transaction.__table__
+    statement = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+    ids: List[int] = []
+    for batch in _batched((_to_row(t) for t in transactions_data), batch_size):
+        ids.extend(db.execute(statement, batch).scalars().all())
+        rollup_repository.add_transactions(db, batch)
+    return ids
+
+
+def upsert_transactions(
+    db: Session, transactions_data: Iterable[Dict[str, Any]], batch_size: Optional[int] = None
+) -> int:
+    """
+    Inserts transactions keyed on (user_id, external_id), skipping rows that are already stored,
+    so replaying the same provider data is a no-op. Returns the number of new rows.
+    Uses INSERT ... ON CONFLICT DO NOTHING on PostgreSQL and SQLite; other dialects look up
+    existing keys first. Only the new rows are added to the daily rollups. Committing is left to
+    the caller.
+    """
+    batch_size = batch_size or settings.transactions_bulk_batch_size
+    table = Transaction.__table__
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(db.get_bind().dialect.name)
+    inserted = 0
+    for batch in _batched((_to_row(t) for t in transactions_data), batch_size):
+        if dialect_insert is not None:
+            statement = dialect_insert(table).on_conflict_do_nothing(
+                index_elements=["user_id", "external_id"]
+            ).returning(table.c.id, table.c.user_id, table.c.transaction_date, table.c.category, table.c.amount)
+            new_rows = db.execute(statement, batch).mappings().all()
+            rollup_repository.add_transactions(db, new_rows)
+            inserted += len(new_rows)
+            continue
+        keyed = [row for row in batch if row["external_id"] is not None]
+        existing = set(db.execute(
+            select(table.c.user_id, table.c.external_id).where(
+                table.c.external_id.in_([row["external_id"] for row in keyed])
+            )
+        ).all())
+        # Like the unique constraint, rows without an external_id never count as duplicates.
+        new_rows = [row for row in batch if row["external_id"] is None] + list({
+            (row["user_id"], row["external_id"]): row
+            for row in keyed if (row["user_id"], row["external_id"]) not in existing
+        }.values())
+        if new_rows:
+            db.execute(insert(table), new_rows)
+            rollup_repository.add_transactions(db, new_rows)
+        inserted += len(new_rows)
+    return inserted
+
+
+def _cursor_value(sort_by: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if sort_by == "transaction_date":
+        return datetime.date.fromisoformat(value)
+    if sort_by == "amount":
+        return Decimal(value)
+    if sort_by == RELEVANCE:
+        return float(value)
+    return value
+
+
+def encode_listing_cursor(row: Any, sort_by: str, sort_dir: str) -> str:
+    """
+    Cursor pointing after `row`, a (Transaction, sort_value) row from fetch_listing_page.
+    """
+    transaction, value = row
+    if isinstance(value, datetime.date):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    payload = json.dumps([sort_by, sort_dir, value, transaction.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_listing_cursor(cursor: str, sort_by: str, sort_dir: str) -> Tuple[Any, int]:
+    """
+    Returns the (sort value, id) of the last row of the previous page. Raises ValueError if the
+    cursor is malformed or was issued for a different sort.
+    """
+    try:
+        cursor_sort_by, cursor_sort_dir, value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value = _cursor_value(sort_by, value)
+    except Exception as e:
+        raise ValueError("Invalid cursor.") from e
+    if (cursor_sort_by, cursor_sort_dir) != (sort_by, sort_dir):
+        raise ValueError("Cursor was issued for a different sort order.")
+    return value, int(last_id)
+
+
+def _sorts_nulls_first(descending: bool, dialect_name: str) -> bool:
+    return descending == (dialect_name in _NULLS_SORT_HIGH)
+
+
+def ranked_search_available(q: Optional[str], search_backend: Optional[str]) -> bool:
+    if not q or search_backend is None:
+        return False
+    return search_backend != "fts5" or len(q) >= transaction_search.FTS_MIN_QUERY_LENGTH
+
+
+def listing_queries(
+    user_id: int,
+    dialect_name: str,
+    q: Optional[str] = None,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    sort_by: str = "transaction_date",
+    sort_dir: str = "desc",
+    after: Optional[Tuple[Any, int]] = None,
+    search_backend: Optional[str] = None,
+) -> List[Select]:
+    """
+    Filtered, keyset-paginated listing of a user's transactions, ordered by (sort column, id)
+    so each sort key is served by its (user_id, column, id) index. `after` is the decoded cursor
+    of the previous page. Statements select (Transaction, sort_value).
+
+    `q` goes through the search index named by `search_backend` (see transaction_search) when
+    ranked_search_available, which also enables sorting by RELEVANCE; otherwise it is an ILIKE.
+
+    For a nullable sort column the rows with and without a value are separate segments, each a
+    plain index range, returned in the order the dialect sorts them from the cursor onwards;
+    read them in turn with fetch_listing_page. One combined "after cursor OR IS NULL" predicate
+    could not be used as an index condition.
+    """
+    descending = sort_dir == "desc"
+    base = select(Transaction).where(Transaction.user_id == user_id)
+    rank = None
+
+    if ranked_search_available(q, search_backend) and search_backend == "trigram":
+        base = base.where(transaction_search.search_text().ilike(f"%{q}%"))
+        rank = func.word_similarity(q, transaction_search.search_text())
+    elif ranked_search_available(q, search_backend):
+        fts = table(transaction_search.FTS_TABLE, column("rowid"))
+        base = base.join(fts, fts.c.rowid == Transaction.id).where(
+            text(f"{transaction_search.FTS_TABLE} MATCH :search_query").bindparams(
+                search_query=transaction_search.fts_match_query(q)
+            )
+        )
+        rank = transaction_search.fts_rank()
+    elif q:
+        like_q = f"%{q}%"
+        base = base.where(
+            (Transaction.description.ilike(like_q)) | (Transaction.category.ilike(like_q)) | (Transaction.source.ilike(like_q))
+        )
+    if category:
+        base = base.where(Transaction.category.ilike(f"%{category}%"))
+    if source:
+        base = base.where(Transaction.source.ilike(f"%{source}%"))
+    if min_amount is not None:
+        base = base.where(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        base = base.where(Transaction.amount <= max_amount)
+
+    sort_column = rank if sort_by == RELEVANCE else LISTING_SORT_COLUMNS[sort_by]
+    order = [sort_column] if sort_column is Transaction.id else [sort_column, Transaction.id]
+    base = base.add_columns(sort_column.label("sort_value"))
+    base = base.order_by(*(c.desc() if descending else c.asc() for c in order))
+
+    if sort_by == RELEVANCE or not Transaction.__table__.c[sort_by].nullable:
+        if after is None:
+            return [base]
+        key = tuple_(*order)
+        last = (after[1],) if sort_column is Transaction.id else after
+        return [base.where(key < last if descending else key > last)]
+
+    values = base.where(sort_column.is_not(None))
+    nulls = base.where(sort_column.is_(None))
+    if after is not None and after[0] is not None:
+        key = tuple_(sort_column, Transaction.id)
+        values = base.where(key < after if descending else key > after)
+    if after is not None and after[0] is None:
+        nulls = nulls.where(Transaction.id < after[1] if descending else Transaction.id > after[1])
+
+    segments = [nulls, values] if _sorts_nulls_first(descending, dialect_name) else [values, nulls]
+    if after is not None:
+        # Segments before the cursor's one are already paged through.
+        segments = segments[segments.index(nulls if after[0] is None else values):]
+    return segments
+
+
+def export_query(user_id: int) -> Select:
+    # Newest first, served by the (user_id, transaction_date, id) index without a sort.
+    return (
+        select(*(getattr(Transaction, name) for name in EXPORT_COLUMNS))
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+    )
+
+
+def iter_export_batches(db: Session, user_id: int, batch_size: Optional[int] = None) -> Iterator[List[Any]]:
+    """
+    All of a user's transactions, newest first, as batches of EXPORT_COLUMNS rows. Fetched
+    through a server-side cursor where the driver has one, so memory stays at one batch
+    whatever the history size.
+    """
+    batch_size = batch_size or settings.transactions_export_batch_size
+    statement = export_query(user_id).execution_options(yield_per=batch_size)
+    yield from db.execute(statement).partitions()
+
+
+def fetch_listing_page(db: Session, statements: List[Select], limit: int) -> List[Any]:
+    rows: List[Any] = []
+    for statement in statements:
+        rows.extend(db.execute(statement.limit(limit - len(rows))).all())
+        if len(rows) >= limit:
+            break
+    return rows
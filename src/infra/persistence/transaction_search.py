@@ -0,0 +1,107 @@
+"""
+Indexed free-text search over transactions (description, category and source).
+
+PostgreSQL: a pg_trgm GIN index on the concatenated text serves the same `ILIKE '%q%'`
+substring match, ranked by word_similarity. SQLite: an FTS5 trigram table mirrors the columns
+through triggers and is ranked by bm25. Both are created with the transactions table by
+create_all and by the migration for existing databases; when neither is present the listing
+falls back to the plain ILIKE filter.
+"""
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import DDL, Connection, Table, event, func, literal_column, text
+from sqlalchemy.orm import Session
+
+FTS_TABLE = "transactions_fts"
+TRGM_INDEX = "ix_transactions_search_trgm"
+# The trigram tokenizer cannot match shorter queries.
+FTS_MIN_QUERY_LENGTH = 3
+
+# Must match the indexed expression exactly for PostgreSQL to use the index.
+SEARCH_TEXT_SQL = "(coalesce({t}description, '') || ' ' || coalesce({t}category, '') || ' ' || {t}source)"
+
+POSTGRES_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS {TRGM_INDEX} ON transactions USING gin ({SEARCH_TEXT_SQL.format(t='')} gin_trgm_ops)",
+)
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "description, category, source, content='transactions', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, description, category, source) "
+    "VALUES (new.id, new.description, new.category, new.source); END",
+    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, category, source) "
+    "VALUES ('delete', old.id, old.description, old.category, old.source); END",
+    f"CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE ON transactions BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, category, source) "
+    "VALUES ('delete', old.id, old.description, old.category, old.source); "
+    f"INSERT INTO {FTS_TABLE}(rowid, description, category, source) "
+    "VALUES (new.id, new.description, new.category, new.source); END",
+)
+
+# Found backends are cached for good; a missing index is looked up again after this long, so one
+# created by the migration while the app runs is picked up.
+MISSING_BACKEND_TTL_SECONDS = 60.0
+
+_backends: Dict[str, Tuple[Optional[str], float]] = {}
+
+
+def sqlite_supports_fts(connection: Connection) -> bool:
+    """
+    Whether the SQLite library behind `connection` has FTS5 and its trigram tokenizer (3.34+).
+    Checked on the connection: another extension module may have loaded a different build.
+    """
+    version = tuple(int(part) for part in connection.exec_driver_sql("SELECT sqlite_version()").scalar().split("."))
+    options = {row[0] for row in connection.exec_driver_sql("PRAGMA compile_options")}
+    return version >= (3, 34) and "ENABLE_FTS5" in options
+
+
+def _create_fts(ddl, target, bind, **kw) -> bool:
+    return sqlite_supports_fts(bind)
+
+
+def attach_search_ddl(table: Table) -> None:
+    for statement in POSTGRES_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in SQLITE_DDL:
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="sqlite", callable_=_create_fts)
+        )
+
+
+def search_backend(db: Session) -> Optional[str]:
+    """
+    "trigram", "fts5" or None, depending on which search index the database has. Cached per URL,
+    None only for MISSING_BACKEND_TTL_SECONDS.
+    """
+    bind = db.get_bind()
+    key = str(bind.url)
+    cached = _backends.get(key)
+    now = time.monotonic()
+    if cached is not None and (cached[0] is not None or now - cached[1] < MISSING_BACKEND_TTL_SECONDS):
+        return cached[0]
+    backend = None
+    if bind.dialect.name == "postgresql":
+        found = db.execute(text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": TRGM_INDEX}).first()
+        backend = "trigram" if found else None
+    elif bind.dialect.name == "sqlite":
+        found = db.execute(text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": FTS_TABLE}).first()
+        backend = "fts5" if found else None
+    _backends[key] = (backend, now)
+    return backend
+
+
+def search_text():
+    return literal_column(SEARCH_TEXT_SQL.format(t="transactions."))
+
+
+def fts_match_query(q: str) -> str:
+    # A quoted FTS5 phrase; with the trigram tokenizer it matches q as a substring.
+    return '"' + q.replace('"', '""') + '"'
+
+
+def fts_rank():
+    # bm25 is lower for better matches; negate so higher means more relevant on every backend.
+    return -func.bm25(literal_column(FTS_TABLE))
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class FinancialAnalysisBase(BaseModel):
     pass
@@ -8,11 +8,22 @@ class FinancialAnalysisBase(BaseModel):
 class FinancialAnalysisCreate(FinancialAnalysisBase):
     pass
 
-class FinancialAnalysis(FinancialAnalysisBase):
+class FinancialAnalysisSummary(FinancialAnalysisBase):
     id: int
     user_id: int
     created_at: datetime
-    analysis_results: Dict[str, Any]
+    analysis_type: Optional[str] = None
+    total_transactions: Optional[int] = None
+    total_amount: Optional[float] = None
+    fraud_detected: Optional[bool] = None
+    highest_risk_score: Optional[float] = None
+    transactions_above_threshold: Optional[int] = None
+    total_carbon_kg: Optional[float] = None
+    # Only filled in when the full results are requested.
+    analysis_results: Optional[Dict[str, Any]] = None
 
     class Config:
         from_attributes = True
+
+class FinancialAnalysis(FinancialAnalysisSummary):
+    analysis_results: Dict[str, Any]
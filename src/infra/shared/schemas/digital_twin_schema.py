@@ -1,3 +1,5 @@
+import datetime
+
 from pydantic import BaseModel
 
 
@@ -12,10 +14,25 @@ class DigitalTwinCreate(DigitalTwinBase):
 from typing import Optional
 
 
+class SimulationJob(BaseModel):
+    id: int
+    twin_id: int
+    status: str
+    progress: float
+    error: Optional[str] = None
+    created_at: Optional[datetime.datetime] = None
+    started_at: Optional[datetime.datetime] = None
+    finished_at: Optional[datetime.datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class DigitalTwin(DigitalTwinBase):
     id: int
     user_id: int
     simulation_results: Optional[dict]
+    job: Optional[SimulationJob] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RiskScoreRequest(BaseModel):
+    amount: float
+    transaction_date: Optional[str] = None
+
+
+class RiskScoreResponse(BaseModel):
+    risk_score: float
+    high_risk: bool
+    threshold: float
+    model_version: str
+    baseline: str
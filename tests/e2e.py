@@ -1,3 +1,4 @@
+import json
 import os
 import uuid
 from typing import Any, Dict
@@ -95,8 +96,17 @@ def test_e2e_simulation_and_ui_backing_endpoints():
             reverse=True,
         )
         latest = all_analyses[0]
-        summary = latest.get("analysis_results", {}).get("summary", {})
-        assert summary.get("total_transactions", 0) > 0
+        assert latest.get("total_transactions", 0) > 0
+        assert latest.get("analysis_results") is None
+
+        # Full report only for the opened analysis
+        detail_resp = client.get(f"{BASE_URL}/api/v1/analysis/{latest['id']}", headers=headers)
+        _assert_status(detail_resp, 200)
+        summary = detail_resp.json().get("analysis_results", {}).get("summary", {})
+        assert summary.get("total_transactions") == latest["total_transactions"]
+
+        missing_resp = client.get(f"{BASE_URL}/api/v1/analysis/999999999", headers=headers)
+        _assert_status(missing_resp, 404)
 
         # Transactions filter endpoint used by frontend table
         tx_resp = client.get(
@@ -117,12 +127,75 @@ def test_e2e_simulation_and_ui_backing_endpoints():
         assert tx_rows[0].get("id")
         assert "amount" in tx_rows[0]
 
-        # CSV export endpoint
+        # Free-text search without a sort: ranked by relevance where the database has a search index
+        search_resp = client.get(
+            f"{BASE_URL}/api/v1/ui/transactions",
+            headers=headers,
+            params={"q": "Movimentacao", "limit": 50},
+        )
+        _assert_status(search_resp, 200)
+        assert {r["id"] for r in search_resp.json()} >= {r["id"] for r in tx_rows}
+
+        # Keyset pagination: follow the cursor header to the next page
+        first_page = client.get(
+            f"{BASE_URL}/api/v1/ui/transactions",
+            headers=headers,
+            params={"sort_by": "amount", "sort_dir": "desc", "limit": 5},
+        )
+        _assert_status(first_page, 200)
+        next_cursor = first_page.headers.get("x-next-cursor")
+        assert len(first_page.json()) == 5 and next_cursor
+        second_page = client.get(
+            f"{BASE_URL}/api/v1/ui/transactions",
+            headers=headers,
+            params={"sort_by": "amount", "sort_dir": "desc", "limit": 5, "cursor": next_cursor},
+        )
+        _assert_status(second_page, 200)
+        assert not {r["id"] for r in first_page.json()} & {r["id"] for r in second_page.json()}
+        assert first_page.json()[-1]["amount"] >= second_page.json()[0]["amount"]
+
+        # Export endpoints (CSV, NDJSON)
         export_resp = client.get(f"{BASE_URL}/api/v1/ui/transactions/export.csv", headers=headers)
         _assert_status(export_resp, 200)
         assert "text/csv" in export_resp.headers.get("content-type", "")
         assert "id,transaction_date,description,amount,category,source" in export_resp.text
 
+        ndjson_resp = client.get(f"{BASE_URL}/api/v1/ui/transactions/export.ndjson", headers=headers)
+        _assert_status(ndjson_resp, 200)
+        ndjson_lines = ndjson_resp.text.splitlines()
+        assert len(ndjson_lines) == export_resp.text.count("\n") - 1
+        assert "amount" in json.loads(ndjson_lines[0])
+
+        # Dashboard aggregates from the daily rollups
+        rollups_resp = client.get(
+            f"{BASE_URL}/api/v1/ui/transactions/rollups", headers=headers, params={"group_by": "category"}
+        )
+        _assert_status(rollups_resp, 200)
+        assert sum(item["count"] for item in rollups_resp.json()) == len(ndjson_lines)
+
+        # Real-time risk scoring
+        risk_score = client.post(
+            f"{BASE_URL}/api/v1/risk/score",
+            headers=headers,
+            json={"amount": 150.0, "transaction_date": "2024-01-15"},
+        )
+        _assert_status(risk_score, 200)
+        assert 0.0 <= risk_score.json().get("risk_score", -1) <= 1.0
+
+        # Digital twin simulation jobs
+        twin_job = client.post(
+            f"{BASE_URL}/api/v1/twins/",
+            headers=headers,
+            json={"name": "e2e twin", "financial_profile": {"initial_capital": 1000, "years_to_simulate": 5}},
+        )
+        _assert_status(twin_job, 202)
+        assert twin_job.json().get("status") == "queued"
+        job_status = client.get(f"{BASE_URL}/api/v1/twins/jobs/{twin_job.json()['id']}", headers=headers)
+        _assert_status(job_status, 200)
+        twins = client.get(f"{BASE_URL}/api/v1/twins/", headers=headers)
+        _assert_status(twins, 200)
+        assert any((twin.get("job") or {}).get("id") == twin_job.json()["id"] for twin in twins.json())
+
         # UI settings endpoints
         settings_get = client.get(f"{BASE_URL}/api/v1/ui/settings", headers=headers)
         _assert_status(settings_get, 200)
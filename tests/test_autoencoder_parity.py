@@ -0,0 +1,34 @@
+"""
+Checks that the NumPy autoencoder backend (dense_autoencoder) reproduces the Keras model it was
+exported from, for every model version shipped with both files.
+
+    python -m pytest tests/test_autoencoder_parity.py
+
+Skipped when TensorFlow is not installed. tools/scripts/benchmark_autoencoder.py runs the same
+check before timing the two backends.
+"""
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from src.domains.risk.services.dense_autoencoder import DenseAutoencoder
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "domains", "risk", "models")
+EXPORTS = sorted(glob.glob(os.path.join(MODEL_DIR, "autoencoder_*.npz")))
+
+
+@pytest.mark.parametrize("npz_path", EXPORTS, ids=os.path.basename)
+def test_numpy_autoencoder_matches_keras(npz_path):
+    tf = pytest.importorskip("tensorflow")
+    keras_path = npz_path[: -len(".npz")] + ".keras"
+    if not os.path.exists(keras_path):
+        pytest.skip(f"No Keras model next to {os.path.basename(npz_path)}")
+
+    numpy_model = DenseAutoencoder.from_npz(npz_path)
+    keras_model = tf.keras.models.load_model(keras_path)
+    X = np.random.default_rng(42).normal(size=(10_000, 2))
+    np.testing.assert_allclose(
+        numpy_model.predict(X), keras_model.predict(X, verbose=0), rtol=1e-5, atol=1e-6
+    )
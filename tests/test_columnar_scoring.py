@@ -0,0 +1,110 @@
+"""
+Checks columnar fraud scoring (fraud_service.score_columnar) against a small deterministic
+model bundle: structured arrays and Arrow tables score like the equivalent score_features call,
+rows with a missing amount are skipped, and the returned indices point back into the input.
+
+    python -m pytest tests/test_columnar_scoring.py
+"""
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("JWT_SECRET_KEY", "columnar-scoring")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.domains.risk.services import fraud_service  # noqa: E402
+from src.domains.risk.services.model_registry import FraudModelBundle  # noqa: E402
+
+AMOUNTS = [10.0, np.nan, 900.0, 25.0, 5000.0, 40.0]
+HOURS = [9.0, 10.0, 3.0, np.nan, 2.0, 14.0]
+
+
+class _Identity:
+    def transform(self, X):
+        return X
+
+
+class _Isolation:
+    def score_samples(self, X):
+        # Larger amounts look more isolated.
+        return -np.abs(X[:, 0]) - 0.01 * X[:, 1]
+
+
+class _ZeroAutoencoder:
+    def predict(self, X, verbose=0):
+        return np.zeros_like(X)
+
+
+class _Registry:
+    default_version = "t"
+
+    def get(self, version=None):
+        return FraudModelBundle("t", _Isolation(), _Identity(), _ZeroAutoencoder())
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    monkeypatch.setattr(fraud_service, "model_registry", _Registry())
+
+
+def _structured(hour_column="hour"):
+    data = np.empty(len(AMOUNTS), dtype=[("amount", "f8"), (hour_column, "f8")])
+    data["amount"] = AMOUNTS
+    data[hour_column] = HOURS
+    return data
+
+
+def _assert_same(actual, expected):
+    np.testing.assert_array_equal(actual.indices, expected.indices)
+    np.testing.assert_allclose(actual.scores, expected.scores)
+    assert actual.highest_risk_score == pytest.approx(expected.highest_risk_score)
+    assert actual.transactions_above_threshold == expected.transactions_above_threshold
+    assert actual.valid_transactions == expected.valid_transactions
+
+
+def test_structured_array_matches_score_features():
+    expected = fraud_service.score_features(np.array(AMOUNTS), np.array(HOURS), threshold=0.3)
+    _assert_same(fraud_service.score_columnar(_structured(), threshold=0.3), expected)
+    _assert_same(fraud_service.score_columnar(_structured("time_of_day"), threshold=0.3), expected)
+
+
+def test_arrow_table_matches_structured_array():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"amount": pa.array(AMOUNTS, from_pandas=True), "hour": HOURS})
+    _assert_same(
+        fraud_service.score_columnar(table, threshold=0.3),
+        fraud_service.score_columnar(_structured(), threshold=0.3),
+    )
+
+
+def test_missing_amounts_are_skipped_and_indices_point_into_the_input():
+    scores = fraud_service.score_columnar(_structured(), threshold=0.0)
+    assert scores.valid_transactions == len(AMOUNTS) - 1
+    assert 1 not in scores.indices.tolist()
+    # The two largest amounts, riskiest first.
+    assert scores.indices.tolist()[:2] == [4, 2]
+    assert np.all(np.diff(scores.scores) <= 0)
+    assert scores.highest_risk_score == pytest.approx(scores.scores[0])
+
+
+def test_missing_hour_column_defaults_to_midday():
+    data = np.empty(len(AMOUNTS), dtype=[("amount", "f8")])
+    data["amount"] = AMOUNTS
+    expected = fraud_service.score_features(
+        np.array(AMOUNTS), np.full(len(AMOUNTS), fraud_service.DEFAULT_HOUR), threshold=0.3
+    )
+    _assert_same(fraud_service.score_columnar(data, threshold=0.3), expected)
+
+
+def test_amount_column_is_required():
+    data = np.zeros(2, dtype=[("value", "f8")])
+    with pytest.raises(ValueError, match="amount"):
+        fraud_service.score_columnar(data)
+
+
+def test_all_missing_amounts_score_nothing():
+    data = np.full(3, np.nan, dtype=[("amount", "f8")])
+    scores = fraud_service.score_columnar(data)
+    assert scores.valid_transactions == 0
+    assert scores.indices.size == 0 and scores.highest_risk_score == 0.0
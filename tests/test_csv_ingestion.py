@@ -0,0 +1,70 @@
+"""
+Checks the streaming CSV reader (csv_ingestion): records are only split on newlines outside
+quoted fields, and reading in tiny chunks yields the same rows as csv.DictReader on the whole
+file, including when a chunk ends inside a quoted field.
+
+    python -m pytest tests/test_csv_ingestion.py
+"""
+import asyncio
+import csv
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+
+os.environ.setdefault("JWT_SECRET_KEY", "csv-ingestion")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.domains.transactions.services import csv_ingestion  # noqa: E402
+
+CSV_TEXT = (
+    "id,amount,description\n"
+    '1,10.50,"Mercado, centro"\n'
+    '2,-3.00,"Linha um\nlinha dois"\n'
+    '3,7.25,"Ele disse ""oi""\nde novo"\n'
+    "4,1.00,\n"
+    '5,2.00,"Preço ""fim"""'
+)
+
+
+def test_split_keeps_quoted_newlines_inside_the_record():
+    records, rest = csv_ingestion._split_complete_records('a,"x\ny"\nb,z\n')
+    assert records == ['a,"x\ny"\n', "b,z\n"]
+    assert rest == ""
+
+
+def test_split_treats_escaped_quotes_as_literal():
+    records, rest = csv_ingestion._split_complete_records('a,"say ""hi""\nthere"\nb,1\n')
+    assert records == ['a,"say ""hi""\nthere"\n', "b,1\n"]
+    assert rest == ""
+
+
+def test_split_carries_an_open_quoted_field_over():
+    records, rest = csv_ingestion._split_complete_records('a,1\nb,"open\nstill open')
+    assert records == ["a,1\n"]
+    assert rest == 'b,"open\nstill open'
+
+    records, rest = csv_ingestion._split_complete_records(rest + '"\nc,2\n')
+    assert records == ['b,"open\nstill open"\n', "c,2\n"]
+    assert rest == ""
+
+
+def _read_rows(data: bytes, chunk_size: int) -> list:
+    async def collect():
+        upload = UploadFile(file=io.BytesIO(data), filename="t.csv")
+        return [row async for row in csv_ingestion.iter_upload_rows(upload, chunk_size=chunk_size)]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 16, 1024])
+def test_chunked_rows_match_dict_reader(chunk_size):
+    # Small chunks put boundaries inside quoted fields, between "" pairs and inside "ç".
+    expected = list(csv.DictReader(io.StringIO(CSV_TEXT)))
+    assert _read_rows(CSV_TEXT.encode("utf-8"), chunk_size) == expected
+
+
+def test_short_rows_are_padded_with_none():
+    rows = _read_rows(b"id,amount,description\n1,2\n", chunk_size=4)
+    assert rows == [{"id": "1", "amount": "2", "description": None}]
@@ -0,0 +1,94 @@
+"""
+Checks the database instrumentation (db_metrics) on a file-backed SQLite engine built like the
+app's: statement latency per kind, the slow-statement log with redacted parameters, and the
+pool checkout timing that relies on overriding QueuePool._do_get.
+
+    python -m pytest tests/test_db_metrics.py
+"""
+import logging
+import os
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+os.environ.setdefault("JWT_SECRET_KEY", "db-metrics")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.app.config import settings  # noqa: E402
+from src.infra.observability import db_metrics  # noqa: E402
+from src.infra.observability.metrics import metrics  # noqa: E402
+
+SECRET = "s3cret-card-number"
+
+
+def _count(name):
+    value = metrics.snapshot()[name]
+    return value["count"] if isinstance(value, dict) else value
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'metrics.db'}",
+        poolclass=db_metrics.timed_pool_class(QueuePool),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    db_metrics.instrument_engine(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE cards (id INTEGER PRIMARY KEY, number TEXT)"))
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def test_timed_pool_class_subclasses_the_pool():
+    timed = db_metrics.timed_pool_class(QueuePool)
+    assert issubclass(timed, QueuePool)
+    assert "_do_get" in vars(timed)
+    assert db_metrics.timed_pool_class(QueuePool) is timed
+
+
+def test_statement_latency_is_recorded_per_kind(engine):
+    before = {kind: _count(f"db_{kind}_statement_latency_ms") for kind in db_metrics.STATEMENT_KINDS}
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO cards (number) VALUES (:number)"), {"number": SECRET})
+        conn.execute(text("SELECT number FROM cards")).all()
+        conn.execute(text("UPDATE cards SET number = :number"), {"number": SECRET})
+        conn.execute(text("DELETE FROM cards"))
+    for kind in db_metrics.STATEMENT_KINDS:
+        assert _count(f"db_{kind}_statement_latency_ms") == before[kind] + 1, kind
+
+
+def test_slow_statements_are_logged_with_redacted_parameters(engine, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "db_slow_query_ms", 0.0)
+    slow_before = _count("db_slow_statements_total")
+    with caplog.at_level(logging.WARNING, logger=db_metrics.logger.name), engine.begin() as conn:
+        conn.execute(text("INSERT INTO cards (number) VALUES (:number)"), {"number": SECRET})
+        conn.execute(text("INSERT INTO cards (number) VALUES (:number)"), [{"number": SECRET}, {"number": SECRET}])
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert _count("db_slow_statements_total") == slow_before + 2
+    assert any("Slow insert statement" in m and "params=['?']" in m for m in messages), messages
+    assert any("params=<2 parameter sets>" in m for m in messages), messages
+    assert not any(SECRET in m for m in messages)
+
+
+def test_failed_statements_do_not_leak_start_times(engine):
+    with engine.connect() as conn:
+        with pytest.raises(exc.OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert conn.info.get("statement_started_at") == []
+
+
+def test_checkout_wait_and_timeouts_are_recorded(engine):
+    checkouts_before = _count("db_pool_checkout_wait_ms")
+    timeouts_before = _count("db_pool_checkout_timeouts_total")
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    assert _count("db_pool_checkout_wait_ms") >= checkouts_before + 2
+    assert _count("db_pool_checkout_timeouts_total") == timeouts_before + 1
@@ -0,0 +1,126 @@
+"""
+Checks the Monte Carlo engines (digital_twin_simulator): block summaries merge to the moments
+and percentiles of the combined paths, a seed gives the same result for any worker count, the
+monthly engine's percentile bands, and the limits on num_simulations and band_interval_months.
+
+    python -m pytest tests/test_monte_carlo.py
+"""
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("JWT_SECRET_KEY", "monte-carlo")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.app.config import settings  # noqa: E402
+from src.domains.insights.simulators import digital_twin_simulator as simulator  # noqa: E402
+
+PROFILE = {
+    "initial_capital": 10000,
+    "monthly_contribution": 500,
+    "years_to_simulate": 5,
+    "expected_annual_return": 0.07,
+    "annual_volatility": 0.15,
+    "num_simulations": 2000,
+    "seed": 42,
+}
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "monte_carlo_engine", "numpy")
+    monkeypatch.setattr(settings, "monte_carlo_chunk_size", 300)
+    yield
+    simulator.shutdown_simulation_pool()
+
+
+def test_merged_summaries_match_the_combined_values():
+    rng = np.random.default_rng(1)
+    blocks = [rng.lognormal(11, 0.4, size) for size in (5000, 5000, 3000, 7)]
+    count, mean, m2, quantiles = simulator._merge_summaries([simulator._summarise(b) for b in blocks])
+    exact = simulator._summarise(np.concatenate(blocks))
+
+    assert count == exact[0]
+    assert mean == pytest.approx(exact[1], rel=1e-12)
+    assert m2 == pytest.approx(exact[2], rel=1e-9)
+    for percentile in (5, 25, 50, 75, 95):
+        index = percentile * 10
+        assert quantiles[index] == pytest.approx(exact[3][index], rel=1e-3)
+
+
+def test_single_summary_is_returned_unchanged():
+    summary = simulator._summarise(np.array([3.0, 1.0, 2.0]))
+    assert simulator._merge_summaries([summary]) is summary
+
+
+def test_seed_gives_the_same_result_for_any_worker_count(small_chunks):
+    serial = simulator.run_monte_carlo_simulation({**PROFILE, "num_workers": 1})
+    parallel = simulator.run_monte_carlo_simulation({**PROFILE, "num_workers": 3})
+    assert parallel == serial
+    assert simulator.run_monte_carlo_simulation(PROFILE) == serial
+    assert simulator.run_monte_carlo_simulation({**PROFILE, "seed": 43}) != serial
+
+
+def test_percentiles_are_ordered(small_chunks):
+    results = simulator.run_monte_carlo_simulation(PROFILE)
+    assert (
+        results["percentile_5"]
+        <= results["percentile_25"]
+        <= results["median_value"]
+        <= results["percentile_75"]
+        <= results["percentile_95"]
+    )
+
+
+@pytest.mark.parametrize("interval, months", [(3, [0, 3, 6, 9, 12]), (5, [0, 5, 10, 12]), (12, [0, 12])])
+def test_monthly_bands_sample_every_interval_and_the_last_month(interval, months):
+    profile = {**PROFILE, "years_to_simulate": 1, "time_step": "monthly", "band_interval_months": interval}
+    bands = simulator.run_monte_carlo_simulation(profile)["bands"]
+    assert bands["months"] == months
+    for percentile in simulator.BAND_PERCENTILES:
+        assert len(bands[f"p{percentile}"]) == len(months)
+        assert bands[f"p{percentile}"][0] == PROFILE["initial_capital"]
+    for low, high in zip(simulator.BAND_PERCENTILES, simulator.BAND_PERCENTILES[1:]):
+        assert all(a <= b for a, b in zip(bands[f"p{low}"], bands[f"p{high}"]))
+
+
+def test_monthly_bands_without_volatility_follow_the_deterministic_path():
+    profile = {
+        **PROFILE,
+        "years_to_simulate": 1,
+        "annual_volatility": 0.0,
+        "num_simulations": 10,
+        "time_step": "monthly",
+        "band_interval_months": 6,
+    }
+    results = simulator.run_monte_carlo_simulation(profile)
+    value = PROFILE["initial_capital"]
+    expected = [value]
+    for month in range(1, 13):
+        value = (value + PROFILE["monthly_contribution"]) * (1 + PROFILE["expected_annual_return"] / 12)
+        if month % 6 == 0:
+            expected.append(round(value, 2))
+    assert results["bands"]["p5"] == pytest.approx(expected)
+    assert results["bands"]["p95"] == pytest.approx(expected)
+    assert results["std_deviation"] == pytest.approx(0.0, abs=1e-6)
+
+
+@pytest.mark.parametrize("interval", [0, -1, 1.5, True, "3"])
+def test_invalid_band_interval_is_rejected(interval):
+    with pytest.raises(ValueError, match="band_interval_months"):
+        simulator.run_monte_carlo_simulation({**PROFILE, "time_step": "monthly", "band_interval_months": interval})
+
+
+@pytest.mark.parametrize("num_simulations", [0, -5, 1.0, True, 11])
+def test_num_simulations_outside_the_limits_is_rejected(monkeypatch, num_simulations):
+    monkeypatch.setattr(settings, "monte_carlo_max_simulations", 10)
+    with pytest.raises(ValueError, match="num_simulations"):
+        simulator.validate_profile({"num_simulations": num_simulations})
+
+
+def test_num_simulations_at_the_limits_runs(monkeypatch):
+    monkeypatch.setattr(settings, "monte_carlo_max_simulations", 10)
+    for num_simulations in (1, 10):
+        results = simulator.run_monte_carlo_simulation({**PROFILE, "num_simulations": num_simulations})
+        assert np.isfinite(results["mean_value"])
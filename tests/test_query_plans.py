@@ -0,0 +1,190 @@
+"""
+EXPLAIN-based checks that the transactions listing is served by its composite indexes: the plan
+must search the (user_id, sort column, id) index and must not add a sort step. Ranked `q` searches
+must go through the search index (transaction_search).
+
+    python -m pytest tests/test_query_plans.py
+
+Runs against an in-memory SQLite database. Set QUERY_PLANS_POSTGRES_URL to a migrated PostgreSQL
+database to check its plans too; sequential scans and sorts are disabled for the session there,
+so on small tables the planner still has to show that the index can serve the query.
+"""
+import datetime
+import importlib.util
+import json
+import os
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+os.environ.setdefault("JWT_SECRET_KEY", "query-plans")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.infra.persistence.database import Base  # noqa: E402
+from src.infra.persistence import models, transaction_search  # noqa: E402,F401
+from src.infra.persistence.repositories import transaction_repository  # noqa: E402
+
+POSTGRES_URL = os.getenv("QUERY_PLANS_POSTGRES_URL")
+# The migration that last created the search DDL; bump it together with that DDL.
+SEARCH_MIGRATION = os.path.join(
+    os.path.dirname(__file__), "..", "src", "infra", "persistence", "migrations", "versions",
+    "d8e2b4c6f1a9_add_transaction_search_index.py",
+)
+
+EXPECTED_INDEXES = {
+    "id": "ix_transactions_user_id_id",
+    "transaction_date": "ix_transactions_user_date_id",
+    "amount": "ix_transactions_user_amount_id",
+    "category": "ix_transactions_user_category_id",
+    "source": "ix_transactions_user_source_id",
+}
+CURSORS = {
+    "id": 100,
+    "transaction_date": datetime.date(2024, 1, 15),
+    "amount": Decimal("10.00"),
+    "category": "Food",
+    "source": "CSV_UPLOAD",
+}
+SEARCH_SORTS = ("relevance", "transaction_date", "amount")
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "sqlite")
+def _explain_sqlite(element, compiler, **kw):
+    return "EXPLAIN QUERY PLAN " + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain, "postgresql")
+def _explain_postgresql(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+def _cases():
+    for sort_by in EXPECTED_INDEXES:
+        for sort_dir in ("asc", "desc"):
+            yield sort_by, sort_dir, None
+            yield sort_by, sort_dir, (CURSORS[sort_by], 100)
+            if sort_by in ("transaction_date", "amount", "category"):
+                yield sort_by, sort_dir, (None, 100)
+    yield "transaction_date", "desc", None, {"q": "market", "category": "food"}
+    yield "amount", "desc", (Decimal("500.00"), 100), {"min_amount": 1, "max_amount": 1000}
+
+
+def _statements(dialect_name: str, sort_by: str, sort_dir: str, after, **filters):
+    statements = transaction_repository.listing_queries(
+        1, dialect_name, sort_by=sort_by, sort_dir=sort_dir, after=after, **filters
+    )
+    return [statement.limit(51) for statement in statements]
+
+
+CASES = [(*case, {}) if len(case) == 3 else case for case in _cases()]
+
+
+@pytest.fixture(scope="module")
+def sqlite_connection():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+@pytest.mark.parametrize("sort_by,sort_dir,after,filters", CASES)
+def test_sqlite_listing_uses_composite_index(sqlite_connection, sort_by, sort_dir, after, filters):
+    for statement in _statements("sqlite", sort_by, sort_dir, after, **filters):
+        plan = " | ".join(row[-1] for row in sqlite_connection.execute(Explain(statement)))
+        assert EXPECTED_INDEXES[sort_by] in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.parametrize("sort_by", SEARCH_SORTS)
+def test_sqlite_search_uses_fts_index(sqlite_connection, sort_by):
+    if not transaction_search.sqlite_supports_fts(sqlite_connection):
+        pytest.skip("SQLite lacks the FTS5 trigram tokenizer")
+    statements = transaction_repository.listing_queries(
+        1, "sqlite", q="market", sort_by=sort_by, search_backend="fts5"
+    )
+    for statement in statements:
+        plan = " | ".join(row[-1] for row in sqlite_connection.execute(Explain(statement.limit(51))))
+        assert f"{transaction_search.FTS_TABLE} VIRTUAL TABLE INDEX" in plan, plan
+
+
+def test_search_migration_matches_create_all_ddl():
+    # create_all and the migration must build the same search index, or plans differ by install.
+    spec = importlib.util.spec_from_file_location("search_migration", SEARCH_MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    assert migration.SQLITE_DDL == transaction_search.SQLITE_DDL
+    assert migration.SEARCH_TEXT == transaction_search.SEARCH_TEXT_SQL.format(t="")
+    assert migration.POSTGRES_INDEX.replace(" CONCURRENTLY", "") == transaction_search.POSTGRES_DDL[1]
+
+
+def test_sqlite_export_uses_date_index(sqlite_connection):
+    statement = transaction_repository.export_query(1)
+    plan = " | ".join(row[-1] for row in sqlite_connection.execute(Explain(statement)))
+    assert EXPECTED_INDEXES["transaction_date"] in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.fixture(scope="module")
+def postgres_connection():
+    if not POSTGRES_URL:
+        pytest.skip("QUERY_PLANS_POSTGRES_URL is not set")
+    try:
+        engine = create_engine(POSTGRES_URL)
+    except ImportError as e:
+        pytest.skip(f"PostgreSQL driver not installed: {e}")
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        connection.execute(text("SET LOCAL enable_sort = off"))
+        yield connection
+        transaction.rollback()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("sort_by,sort_dir,after,filters", CASES)
+def test_postgres_listing_uses_composite_index(postgres_connection, sort_by, sort_dir, after, filters):
+    for statement in _statements("postgresql", sort_by, sort_dir, after, **filters):
+        raw_plan = postgres_connection.execute(Explain(statement)).scalar()
+        plan = (json.loads(raw_plan) if isinstance(raw_plan, str) else raw_plan)[0]["Plan"]
+        nodes = _plan_nodes(plan)
+        assert any(node.get("Index Name") == EXPECTED_INDEXES[sort_by] for node in nodes), plan
+        assert not any(node["Node Type"] in ("Sort", "Seq Scan") for node in nodes), plan
+
+
+@pytest.mark.parametrize("sort_by", SEARCH_SORTS)
+def test_postgres_search_uses_trigram_index(postgres_connection, sort_by):
+    statements = transaction_repository.listing_queries(
+        1, "postgresql", q="market", sort_by=sort_by, search_backend="trigram"
+    )
+    for statement in statements:
+        raw_plan = postgres_connection.execute(Explain(statement.limit(51))).scalar()
+        plan = (json.loads(raw_plan) if isinstance(raw_plan, str) else raw_plan)[0]["Plan"]
+        nodes = _plan_nodes(plan)
+        assert any(node.get("Index Name") == transaction_search.TRGM_INDEX for node in nodes), plan
+
+
+def test_postgres_export_uses_date_index(postgres_connection):
+    raw_plan = postgres_connection.execute(Explain(transaction_repository.export_query(1))).scalar()
+    plan = (json.loads(raw_plan) if isinstance(raw_plan, str) else raw_plan)[0]["Plan"]
+    nodes = _plan_nodes(plan)
+    assert any(node.get("Index Name") == EXPECTED_INDEXES["transaction_date"] for node in nodes), plan
+    assert not any(node["Node Type"] in ("Sort", "Seq Scan") for node in nodes), plan
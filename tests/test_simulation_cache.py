@@ -0,0 +1,77 @@
+"""
+Checks the Monte Carlo result cache key (simulation_cache.cache_key): it ignores key order and
+execution-only settings, and changes with anything that can change the results.
+
+    python -m pytest tests/test_simulation_cache.py
+"""
+import os
+
+import pytest
+
+os.environ.setdefault("JWT_SECRET_KEY", "simulation-cache")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.app.config import settings  # noqa: E402
+from src.domains.insights.services import simulation_cache  # noqa: E402
+from src.domains.insights.services.simulation_cache import cache_key  # noqa: E402
+
+PROFILE = {
+    "initial_capital": 10000,
+    "monthly_contribution": 500,
+    "years_to_simulate": 10,
+    "expected_annual_return": 0.07,
+    "annual_volatility": 0.15,
+    "num_simulations": 1000,
+    "seed": 7,
+}
+
+
+def test_key_ignores_order_and_execution_settings():
+    reordered = dict(reversed(list(PROFILE.items())))
+    assert cache_key(reordered) == cache_key(PROFILE)
+    assert cache_key({**PROFILE, "num_workers": 4}) == cache_key(PROFILE)
+
+
+def test_tuples_and_lists_share_a_key():
+    assert cache_key({**PROFILE, "goals": (1, 2)}) == cache_key({**PROFILE, "goals": [1, 2]})
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"seed": 8},
+        {"seed": None},
+        {"num_simulations": 1001},
+        {"time_step": "monthly"},
+        {"annual_volatility": 0.16},
+    ],
+)
+def test_key_changes_with_the_profile(change):
+    assert cache_key({**PROFILE, **change}) != cache_key(PROFILE)
+
+
+@pytest.mark.parametrize("field, value", [("num_simulations", 1000.0), ("seed", 7.0), ("seed", True)])
+def test_ints_floats_and_bools_get_distinct_keys(field, value):
+    # The simulator rejects 1000.0 simulations or a float seed; they must not hit a cached int run.
+    assert cache_key({**PROFILE, field: value}) != cache_key(PROFILE)
+
+
+@pytest.mark.parametrize(
+    "setting, value",
+    [
+        ("monte_carlo_engine", "python"),
+        ("monte_carlo_chunk_size", 17),
+        ("monte_carlo_simulations", 5),
+        ("monte_carlo_band_interval_months", 3),
+    ],
+)
+def test_key_changes_with_result_shaping_settings(monkeypatch, setting, value):
+    before = cache_key(PROFILE)
+    monkeypatch.setattr(settings, setting, value)
+    assert cache_key(PROFILE) != before
+
+
+def test_key_changes_with_engine_version(monkeypatch):
+    before = cache_key(PROFILE)
+    monkeypatch.setattr(simulation_cache, "ENGINE_VERSION", simulation_cache.ENGINE_VERSION + 1)
+    assert cache_key(PROFILE) != before
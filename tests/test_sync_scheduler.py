@@ -0,0 +1,84 @@
+"""
+Checks which users the batch Open Banking sync (sync_scheduler) picks, against a SQLite file and
+a stubbed provider: connected users that never synced come first, and a sync that finds nothing
+new still moves the user to the back.
+
+    python -m pytest tests/test_sync_scheduler.py
+"""
+import asyncio
+import datetime
+import os
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+os.environ.setdefault("JWT_SECRET_KEY", "sync-scheduler")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.app.config import settings  # noqa: E402
+from src.domains.open_banking.services import sync_scheduler, sync_service  # noqa: E402
+from src.infra.persistence import database, models  # noqa: E402
+from src.infra.persistence.database import Base  # noqa: E402
+from src.infra.persistence.repositories import sync_run_repository  # noqa: E402
+
+pytest.importorskip("aiosqlite")
+
+
+def _provider(request: httpx.Request) -> httpx.Response:
+    # Every user has one account, and there is never anything new on it.
+    if request.url.path == "/accounts":
+        return httpx.Response(200, json=[{"account_id": f"acc-{request.url.params['id_usuario']}"}])
+    return httpx.Response(200, json={"transactions": [], "next_cursor": None})
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'sync.db'}"
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    monkeypatch.setattr(database, "_async_engine", None)
+    monkeypatch.setattr(database, "_async_session_factory", None)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_provider), base_url="http://provider")
+    monkeypatch.setattr(sync_service.http_clients, "get", lambda name: client)
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    now = datetime.datetime.utcnow()
+    session.add_all([
+        models.User(id=user_id, email=f"u{user_id}@example.com", hashed_password="x") for user_id in (1, 2, 3, 4)
+    ])
+    session.flush()
+    session.add_all([
+        models.OpenBankingSyncState(user_id=1, last_attempt_at=now - datetime.timedelta(hours=1)),
+        models.OpenBankingSyncState(user_id=2, last_attempt_at=now - datetime.timedelta(hours=2)),
+        # Connected, but the first sync never completed: no cursor and no attempt.
+        models.OpenBankingSyncState(user_id=3),
+    ])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        asyncio.run(database.dispose_async_engine())
+        engine.dispose()
+
+
+def _run_one() -> dict:
+    return asyncio.run(sync_scheduler.run_batch_sync(new_run=True, limit=1, concurrency=1))
+
+
+def test_users_without_cursors_are_scheduled_first(db):
+    assert sync_run_repository.stale_first_user_ids(db) == [3, 2, 1]
+
+
+def test_sync_without_new_rows_moves_user_to_the_back(db):
+    result = _run_one()
+    assert result["processed_users"] == 1 and result["failed_users"] == 0
+    db.expire_all()
+    assert sync_run_repository.stale_first_user_ids(db) == [2, 1, 3]
+
+    _run_one()
+    db.expire_all()
+    assert sync_run_repository.stale_first_user_ids(db) == [1, 3, 2]
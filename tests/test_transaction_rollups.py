@@ -0,0 +1,141 @@
+"""
+Checks the per-user daily category rollups (rollup_repository) against a SQLite file: after
+bulk inserts and upserts they always equal the totals recomputed from `transactions`, replays
+add nothing, and the lookup fallback used on other databases behaves like ON CONFLICT.
+
+    python -m pytest tests/test_transaction_rollups.py
+"""
+import datetime
+import os
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+os.environ.setdefault("JWT_SECRET_KEY", "transaction-rollups")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from src.infra.persistence import models  # noqa: E402
+from src.infra.persistence.database import Base  # noqa: E402
+from src.infra.persistence.repositories import rollup_repository, transaction_repository  # noqa: E402
+
+DAY = datetime.date(2024, 1, 1)
+NEXT_DAY = DAY + datetime.timedelta(days=1)
+
+
+def _row(amount, category="Food", day=DAY, user_id=1, external_id=None, source="CSV"):
+    return {
+        "user_id": user_id,
+        "transaction_date": day,
+        "category": category,
+        "amount": amount,
+        "source": source,
+        "description": "t",
+        "external_id": external_id,
+    }
+
+
+@pytest.fixture(params=["native", "lookup"])
+def db(request, tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rollups.db'}")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all([models.User(id=user_id, email=f"u{user_id}@example.com", hashed_password="x") for user_id in (1, 2)])
+    session.commit()
+    if request.param == "lookup":
+        # Neither PostgreSQL nor SQLite: exercises the select-then-write fallbacks.
+        monkeypatch.setattr(engine.dialect, "name", "other")
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _cents(*values):
+    return tuple(round(float(value), 2) for value in values)
+
+
+def _recomputed(db):
+    t = models.Transaction
+    category = func.coalesce(t.category, rollup_repository.UNCATEGORIZED)
+    rows = db.execute(
+        select(
+            t.user_id, t.transaction_date, category, func.count(), func.sum(t.amount),
+            func.sum(func.abs(t.amount)), func.min(t.amount), func.max(t.amount),
+        )
+        .where(t.transaction_date.is_not(None))
+        .group_by(t.user_id, t.transaction_date, category)
+    ).all()
+    return {
+        (user_id, day, cat): (count, *_cents(total, abs_total, low, high))
+        for user_id, day, cat, count, total, abs_total, low, high in rows
+    }
+
+
+def _rollups(db):
+    r = models.TransactionDailyRollup
+    return {
+        (row.user_id, row.day, row.category): (
+            row.transaction_count, *_cents(row.amount_sum, row.amount_abs_sum, row.amount_min, row.amount_max)
+        )
+        for row in db.execute(select(r)).scalars()
+    }
+
+
+def test_bulk_inserts_keep_rollups_equal_to_the_transactions(db):
+    transaction_repository.bulk_insert_transactions(
+        db,
+        [_row(10.005), _row(-5, category=None), _row(7, day=None), _row(2.5, user_id=2), _row(-1.25)],
+        batch_size=2,
+    )
+    transaction_repository.bulk_insert_transactions_returning_ids(db, [_row(-3.5), _row(4, day=NEXT_DAY)])
+    db.commit()
+
+    rollups = _rollups(db)
+    assert rollups == _recomputed(db)
+    # Rounded like Numeric(10, 2); undated rows are left out; no category rolls up under "".
+    assert rollups[(1, DAY, "Food")] == (3, 5.26, 14.76, -3.5, 10.01)
+    assert rollups[(1, DAY, "")] == (1, -5.0, 5.0, -5.0, -5.0)
+    assert all(day is not None for _, day, _ in rollups)
+
+
+def test_upsert_replays_add_nothing(db):
+    rows = [
+        _row(Decimal("100"), day=NEXT_DAY, external_id="x1", source="SYNC"),
+        _row(Decimal("50"), external_id="x2", source="SYNC"),
+    ]
+    assert transaction_repository.upsert_transactions(db, rows) == 2
+    assert transaction_repository.upsert_transactions(db, rows) == 0
+    db.commit()
+    assert _rollups(db) == _recomputed(db)
+    assert _rollups(db)[(1, NEXT_DAY, "Food")][0] == 1
+
+
+def test_upsert_only_dedupes_rows_with_an_external_id(db):
+    rows = [_row(1) for _ in range(3)] + [_row(2, external_id="k")] * 2
+    # The unkeyed rows never conflict; the keyed pair collapses to one row.
+    assert transaction_repository.upsert_transactions(db, rows) == 4
+    assert transaction_repository.upsert_transactions(db, rows) == 3
+    db.commit()
+    assert db.scalar(select(func.count()).select_from(models.Transaction)) == 7
+    assert _rollups(db) == _recomputed(db)
+
+
+def test_totals_group_and_filter(db):
+    transaction_repository.bulk_insert_transactions(
+        db, [_row(10), _row(-4, category="Rent"), _row(6, day=NEXT_DAY), _row(99, user_id=2)]
+    )
+    db.commit()
+
+    by_category = rollup_repository.get_totals(db, 1, "category")
+    assert [(row["key"], row["transaction_count"], float(row["amount_sum"])) for row in by_category] == [
+        ("Food", 2, 16.0),
+        ("Rent", 1, -4.0),
+    ]
+    by_day = rollup_repository.get_totals(db, 1, "day", start_date=DAY, end_date=DAY)
+    assert len(by_day) == 1
+    assert by_day[0]["transaction_count"] == 2
+    assert float(by_day[0]["amount_min"]) == -4.0 and float(by_day[0]["amount_max"]) == 10.0
+    assert rollup_repository.get_totals(db, 1, "day", category="Rent")[0]["transaction_count"] == 1
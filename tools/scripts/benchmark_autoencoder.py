@@ -0,0 +1,60 @@
+"""
+Checks the NumPy autoencoder against Keras and compares their latency across batch sizes.
+
+Usage:
+    python tools/scripts/benchmark_autoencoder.py [max_batch_size]
+
+The parity check and the Keras column need TensorFlow; without it only the NumPy
+backend is timed.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.domains.risk.services.dense_autoencoder import DenseAutoencoder  # noqa: E402
+
+model_dir = "src/domains/risk/models"
+max_batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+batch_sizes = [size for size in (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000) if size <= max_batch_size]
+
+
+def _time_ms(predict, X: np.ndarray) -> float:
+    repeats = max(1, min(100, 100_000 // len(X)))
+    predict(X)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        predict(X)
+    return (time.perf_counter() - started) * 1000 / repeats
+
+
+if __name__ == "__main__":
+    numpy_model = DenseAutoencoder.from_npz(os.path.join(model_dir, "autoencoder_v1.npz"))
+    try:
+        import tensorflow as tf
+
+        keras_model = tf.keras.models.load_model(os.path.join(model_dir, "autoencoder_v1.keras"))
+    except ImportError:
+        keras_model = None
+        print("TensorFlow not installed: skipping parity check and Keras timings.")
+
+    rng = np.random.default_rng(42)
+    if keras_model is not None:
+        X = rng.normal(size=(10_000, 2))
+        np.testing.assert_allclose(
+            numpy_model.predict(X), keras_model.predict(X, verbose=0), rtol=1e-5, atol=1e-6
+        )
+        print("Parity check passed: NumPy output matches Keras (rtol=1e-5, atol=1e-6).")
+
+    print(f"{'batch':>10} {'numpy ms':>12} {'keras ms':>12} {'speedup':>10}")
+    for size in batch_sizes:
+        X = rng.normal(size=(size, 2))
+        numpy_ms = _time_ms(numpy_model.predict, X)
+        if keras_model is None:
+            print(f"{size:>10} {numpy_ms:>12.3f} {'-':>12} {'-':>10}")
+            continue
+        keras_ms = _time_ms(lambda batch: keras_model.predict(batch, verbose=0), X)
+        print(f"{size:>10} {numpy_ms:>12.3f} {keras_ms:>12.3f} {keras_ms / numpy_ms:>9.1f}x")
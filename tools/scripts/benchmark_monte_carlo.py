@@ -0,0 +1,54 @@
+"""
+Compares the legacy per-draw Monte Carlo loop against the vectorized NumPy engine, and the
+NumPy engine across worker processes.
+
+Usage:
+    python tools/scripts/benchmark_monte_carlo.py [num_simulations] [years] [max_workers]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from src.app.config import settings  # noqa: E402
+from src.domains.insights.simulators import digital_twin_simulator  # noqa: E402
+
+num_simulations = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+years = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+
+profile = {
+    "initial_capital": 100_000,
+    "monthly_contribution": 2_000,
+    "years_to_simulate": years,
+    "expected_annual_return": 0.07,
+    "annual_volatility": 0.15,
+    "num_simulations": num_simulations,
+    "seed": 42,
+}
+
+
+def _run(engine: str, num_workers: int = 1) -> float:
+    settings.monte_carlo_engine = engine
+    started = time.perf_counter()
+    results = digital_twin_simulator.run_monte_carlo_simulation({**profile, "num_workers": num_workers})
+    elapsed = time.perf_counter() - started
+    label = f"{engine} x{num_workers}"
+    print(f"{label:<10} {elapsed:9.3f}s  mean={results['mean_value']:,.0f}  median={results['median_value']:,.0f}")
+    return elapsed
+
+
+if __name__ == "__main__":
+    print(f"{num_simulations} simulations x {years} years")
+    python_elapsed = _run("python")
+    numpy_elapsed = _run("numpy")
+    print(f"speedup: {python_elapsed / numpy_elapsed:.1f}x")
+
+    settings.monte_carlo_max_workers = max_workers
+    workers = 2
+    while workers <= max_workers:
+        _run("numpy", workers)
+        workers *= 2
+    digital_twin_simulator.shutdown_simulation_pool()
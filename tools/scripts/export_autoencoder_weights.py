@@ -0,0 +1,65 @@
+"""
+Exports a Keras Dense autoencoder (.keras) to the .npz format read by DenseAutoencoder.
+
+Usage:
+    python tools/scripts/export_autoencoder_weights.py [source.keras] [target.npz]
+
+Uses Keras when TensorFlow is installed; otherwise reads the layer config and weights
+straight from the .keras archive with h5py.
+"""
+import io
+import json
+import os
+import sys
+import zipfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from src.domains.risk.services.dense_autoencoder import DenseAutoencoder  # noqa: E402
+
+model_dir = "src/domains/risk/models"
+source_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(model_dir, "autoencoder_v1.keras")
+target_path = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source_path)[0] + ".npz"
+
+
+def _layers_from_keras(path: str):
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(path)
+    layers = []
+    for layer in model.layers:
+        if not isinstance(layer, tf.keras.layers.Dense):
+            raise ValueError(f"Only Dense layers can be exported, found {layer.__class__.__name__}")
+        kernel, bias = layer.get_weights()
+        layers.append((kernel, bias, layer.get_config()["activation"]))
+    return layers
+
+
+def _layers_from_archive(path: str):
+    import h5py
+
+    with zipfile.ZipFile(path) as archive:
+        config = json.loads(archive.read("config.json"))
+        weights = h5py.File(io.BytesIO(archive.read("model.weights.h5")), "r")
+
+    layers = []
+    for layer in config["config"]["layers"]:
+        if layer["class_name"] == "InputLayer":
+            continue
+        if layer["class_name"] != "Dense":
+            raise ValueError(f"Only Dense layers can be exported, found {layer['class_name']}")
+        variables = weights[f"layers/{layer['config']['name']}/vars"]
+        layers.append((np.array(variables["0"]), np.array(variables["1"]), layer["config"]["activation"]))
+    return layers
+
+
+if __name__ == "__main__":
+    try:
+        layers = _layers_from_keras(source_path)
+    except ImportError:
+        layers = _layers_from_archive(source_path)
+
+    DenseAutoencoder(layers).save_npz(target_path)
+    print(f"Exported {len(layers)} Dense layers from {source_path} to {target_path}")
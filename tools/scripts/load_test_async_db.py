@@ -0,0 +1,79 @@
+"""
+Fires concurrent requests at a running backend and reports throughput and latency, to compare
+the async-session routes against the sync ones (or a build before the async port).
+
+Usage:
+    python tools/scripts/load_test_async_db.py [--path /api/v1/analysis/] [--requests 500] [--concurrency 50]
+
+Each path is hit with the same load; `--path` may be repeated. The defaults mix an async-session
+route (analysis history) with a sync-session route served from the threadpool (UI settings).
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List
+
+import httpx
+import numpy as np
+
+BASE_URL = os.getenv("E2E_BASE_URL", "http://127.0.0.1:8000")
+USERNAME = os.getenv("E2E_USERNAME", "admin")
+PASSWORD = os.getenv("E2E_PASSWORD", "admin")
+DEFAULT_PATHS = ["/api/v1/analysis/", "/api/v1/banking/analysis/history", "/api/v1/ui/settings"]
+
+
+async def _login(client: httpx.AsyncClient) -> Dict[str, str]:
+    response = await client.post(
+        "/api/v1/token",
+        data={"username": USERNAME, "password": PASSWORD},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _load(client: httpx.AsyncClient, path: str, headers: Dict[str, str], requests: int, concurrency: int) -> None:
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with slots:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, headers=headers)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(
+        f"{path:<40} {requests / elapsed:8.1f} req/s  p50={p50:7.1f}ms  p95={p95:7.1f}ms  "
+        f"p99={p99:7.1f}ms  errors={errors}"
+    )
+
+
+async def main(paths: List[str], requests: int, concurrency: int) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=60, limits=limits) as client:
+        headers = await _login(client)
+        print(f"{BASE_URL}: {requests} requests per path, {concurrency} concurrent")
+        for path in paths:
+            await _load(client, path, headers, requests, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent GET load test against a running backend.")
+    parser.add_argument("--path", action="append", dest="paths", help="Path to load; repeatable.")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per path.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once.")
+    args = parser.parse_args()
+    asyncio.run(main(args.paths or DEFAULT_PATHS, args.requests, args.concurrency))